@@ -0,0 +1,106 @@
+"""Compare `put_facts` uploads without compression, with gzip and with zstd.
+
+The requests go to a local stand-in for the facts service that decodes the
+body according to its `Content-Encoding`. The server reads the body at
+`--uplink` MiB/s to mimic the upload bandwidth of a client on a real network,
+which is what compression saves time on.
+
+Usage::
+
+    python -m benchmarks.bench_compression --rows 500000 --uplink 10
+"""
+
+import argparse
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.bench_put_facts import make_data
+from eco_connect import FactsService
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FactsHandler(BaseHTTPRequestHandler):
+    uplink = None
+
+    def do_PUT(self):
+        length = int(self.headers["Content-Length"])
+        body = bytearray()
+        while len(body) < length:
+            chunk = self.rfile.read(min(CHUNK_SIZE, length - len(body)))
+            body += chunk
+            if self.uplink:
+                time.sleep(len(chunk) / (self.uplink * 2 ** 20))
+
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "zstd":
+            import zstandard
+
+            body = zstandard.ZstdDecompressor().decompress(body)
+        records = json.loads(body)
+
+        response = json.dumps(
+            {
+                "records_stored": len(records),
+                "field_errors": [],
+                "process_start_time": "2017-01-01 00:00:00",
+                "process_end_time": "2017-01-01 00:00:01",
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument(
+        "--uplink", type=float, default=10, help="MiB/s, 0 for unlimited"
+    )
+    args = parser.parse_args()
+
+    FactsHandler.uplink = args.uplink
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FactsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    data = make_data(args.rows)
+    uncompressed = None
+    print(f"{args.rows:,} rows, uplink {args.uplink or 'unlimited'} MiB/s")
+
+    for compression in (None, "gzip", "zstd"):
+        facts_service = FactsService(compression=compression)
+        facts_service.hostname = f"http://127.0.0.1:{server.server_port}/api/v1/"
+        sent = []
+        facts_service.session.hooks["response"].append(
+            lambda response, *args, **kwargs: sent.append(len(response.request.body))
+        )
+
+        start = time.perf_counter()
+        response = facts_service.put_facts(building_id=26, data=data)
+        elapsed = time.perf_counter() - start
+        facts_service.close()
+
+        assert response["records_stored"] == args.rows
+        uncompressed = uncompressed or sent[0]
+        print(
+            f"{str(compression):>5}: {elapsed:8.3f} s  "
+            f"body {sent[0] / 2 ** 20:8.1f} MiB  "
+            f"saved {1 - sent[0] / uncompressed:6.1%}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
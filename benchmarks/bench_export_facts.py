@@ -0,0 +1,125 @@
+"""Compare peak memory of archiving a building history with `get_facts` and
+`DataFrame.to_parquet` and with `export_facts`.
+
+The facts service is replaced by a stand-in that builds each window's
+response on request. Each path runs in its own process and reports its peak
+resident memory, which also covers the buffers of pyarrow that tracemalloc
+does not see. Both processes import the same modules first.
+
+Usage::
+
+    python -m benchmarks.bench_export_facts --points 200 --days 120
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from eco_connect import FactsService
+from eco_connect.src.json_response import JsonResponse
+
+CHUNK_SIZE = "7D"
+
+
+def make_post(points):
+    def post(url, data, stream=False):
+        fact_times = [
+            str(fact_time)[:16]
+            for fact_time in pd.date_range(
+                data["start_date"], data["end_date"], freq="5min"
+            )
+        ]
+        return JsonResponse(
+            {
+                "data": {
+                    str(eco_point_id): {
+                        "data": {
+                            fact_time: float(i % 100)
+                            for i, fact_time in enumerate(fact_times)
+                        },
+                        "meta": {
+                            "display_name": f"SpaceTemp-{eco_point_id % 20}",
+                            "eco_point_id": eco_point_id,
+                            "equipment_name": f"VAV_{eco_point_id // 4}",
+                            "point_class": "SpaceAirTemperature",
+                        },
+                    }
+                    for eco_point_id in range(1, points + 1)
+                }
+            }
+        )
+
+    return post
+
+
+def get_facts_path(facts_service, start_date, end_date, path):
+    facts_service.get_facts(
+        26, start_date, end_date, chunk_size=CHUNK_SIZE, use_cache=False
+    ).to_parquet(path)
+
+
+def export_facts_path(facts_service, start_date, end_date, path):
+    facts_service.export_facts(26, start_date, end_date, path, chunk_size=CHUNK_SIZE)
+
+
+def run(name, points, days, path):
+    facts_service = FactsService()
+    facts_service.post = make_post(points)
+    start_date = pd.Timestamp("2017-01-01")
+    end_date = start_date + pd.Timedelta(days=days)
+    func = {"get_facts": get_facts_path, "export_facts": export_facts_path}[name]
+
+    start = time.perf_counter()
+    func(facts_service, str(start_date), str(end_date), path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux.
+    print(f"{elapsed} {peak * 1024}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, args.points, args.days, args.path)
+        return
+
+    rows = args.points * (args.days * 288 + 1)
+    print(f"{rows:,} rows ({args.points} points x {args.days} days)")
+    with tempfile.TemporaryDirectory() as directory:
+        tables = {}
+        for name in ("get_facts", "export_facts"):
+            path = os.path.join(directory, f"{name}.parquet")
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_export_facts"]
+                + ["--points", str(args.points), "--days", str(args.days)]
+                + ["--run", name, "--path", path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            elapsed, peak = map(float, output.split())
+            print(
+                f"{name:>12}: {elapsed:8.3f} s  peak {peak / 2 ** 20:8.1f} MiB  "
+                f"file {os.path.getsize(path) / 2 ** 20:6.1f} MiB"
+            )
+            tables[name] = pq.read_table(path)
+
+    assert tables["get_facts"].num_rows == tables["export_facts"].num_rows == rows
+    print("row counts are identical")
+
+
+if __name__ == "__main__":
+    main()
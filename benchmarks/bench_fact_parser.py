@@ -0,0 +1,103 @@
+"""Compare the namedtuple and columnar paths used to build fact DataFrames,
+and the structured arrays of `result_format="numpy"`.
+
+Usage::
+
+    python -m benchmarks.bench_fact_parser --points 500 --samples 2000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from eco_connect import FactsService
+from eco_connect.src.json_response import JsonResponse
+
+
+def make_response(points, samples):
+    fact_times = [
+        str(fact_time)[:16]
+        for fact_time in pd.date_range("2017-01-01", periods=samples, freq="5min")
+    ]
+    data = {}
+    for eco_point_id in range(points, 0, -1):
+        data[str(eco_point_id)] = {
+            "data": {
+                fact_time: float(i % 100) for i, fact_time in enumerate(fact_times)
+            },
+            "meta": {
+                "display_name": f"SpaceTemp-{eco_point_id % 20}",
+                "eco_point_id": eco_point_id,
+                "native_name": f"UCSB/275/VAV_{eco_point_id}/NAE11/ZN-T",
+                "equipment_name": f"VAV_{eco_point_id // 4}",
+                "equipment_type": "VAV",
+                "point_class": "SpaceAirTemperature",
+            },
+        }
+    return JsonResponse({"data": data})
+
+
+def tuple_path(facts_service, response):
+    return pd.DataFrame(facts_service._tuple_fact_parser(response))
+
+
+def columnar_path(facts_service, response):
+    return facts_service._pandas_fact_parser(response)
+
+
+def numpy_path(facts_service, response):
+    return facts_service._numpy_fact_parser(response)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    # Memory is traced in a separate run, tracemalloc skews the timings.
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+
+    facts_service = FactsService()
+    response = make_response(args.points, args.samples)
+    rows = args.points * args.samples
+    print(f"{rows:,} rows ({args.points} points x {args.samples} samples)")
+
+    results = {}
+    for name, func in (
+        ("tuple", tuple_path),
+        ("columnar", columnar_path),
+        ("numpy", numpy_path),
+    ):
+        results[name], elapsed, peak = measure(func, facts_service, response)
+        print(
+            f"{name:>9}: {elapsed:8.3f} s  {rows / elapsed:14,.0f} rows/s  "
+            f"peak {peak / 2 ** 20:8.1f} MiB"
+        )
+
+    # Meta columns of large results are Categoricals, compare their values.
+    pd.testing.assert_frame_equal(
+        results["tuple"], results["columnar"].astype(results["tuple"].dtypes)
+    )
+    facts, _ = results["numpy"]
+    np.testing.assert_array_equal(
+        facts["fact_value"], results["columnar"]["fact_value"].to_numpy()
+    )
+    print("results are identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Measure how long `import eco_connect` takes in a fresh interpreter.
+
+Each run starts a new Python process, so nothing is cached in
+`sys.modules`. The baseline is the bare interpreter startup, which is
+subtracted from the reported import time. Exits with an error when the
+median exceeds `--max-ms` or when a module that should load lazily was
+imported.
+
+Usage::
+
+    python -m benchmarks.bench_import --runs 20 --max-ms 150
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+LAZY_MODULES = ("pandas", "numpy", "requests", "asyncio", "httpx", "ijson")
+
+SCRIPT = """
+import json, sys
+{statement}
+print(json.dumps([name for name in {lazy_modules!r} if name in sys.modules]))
+"""
+
+
+def run(statement):
+    script = SCRIPT.format(statement=statement, lazy_modules=LAZY_MODULES)
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return time.perf_counter() - start, json.loads(output)
+
+
+def measure(statement, runs):
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        elapsed, loaded = run(statement)
+        timings.append(elapsed)
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    baseline, _ = measure("pass", args.runs)
+    results = {}
+    for name, statement in (
+        ("import", "import eco_connect"),
+        ("import + FactsService()", "import eco_connect; eco_connect.FactsService()"),
+    ):
+        elapsed, loaded = measure(statement, args.runs)
+        results[name] = (elapsed - baseline) * 1000
+        print(
+            f"{name:>24}: {results[name]:8.1f} ms  "
+            f"loaded {', '.join(loaded) or 'none'} of {', '.join(LAZY_MODULES)}"
+        )
+        if name == "import" and loaded:
+            sys.exit(f"`import eco_connect` loaded {', '.join(loaded)}")
+
+    if results["import"] > args.max_ms:
+        sys.exit(f"`import eco_connect` took more than {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
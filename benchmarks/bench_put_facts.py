@@ -0,0 +1,73 @@
+"""Compare the per-row loop and the columnar serializer used by `put_facts`.
+
+Both paths are measured up to the request body and encode with the same
+JSON backend, so the difference is the serializer alone.
+
+Usage::
+
+    python -m benchmarks.bench_put_facts --rows 1000000 --json-backend json
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from eco_connect import FactsService
+from eco_connect.src.json_backend import JsonBackend
+
+
+def make_data(rows):
+    return pd.DataFrame(
+        {
+            "fact_time": (
+                pd.date_range("2017-01-01", periods=rows, freq="5min")
+                .strftime("%Y-%m-%d %H:%M")
+                .tolist()
+            ),
+            "fact_value": np.random.default_rng(0).normal(70, 5, rows),
+            "native_name": [f"UCSB/275/VAV_{i % 500}/NAE11/ZN-T" for i in range(rows)],
+        }
+    )
+
+
+def loop_path(facts_service, data):
+    col_1 = data.columns[0]
+    col_2 = data.columns[1]
+    col_3 = data.columns[2]
+    input_data = [{col_1: row[0], col_2: row[1], col_3: row[2]} for row in data.values]
+    return facts_service.json_backend.dumps(input_data)
+
+
+def columnar_path(facts_service, data):
+    return facts_service._serialize_facts(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--json-backend", choices=JsonBackend.names)
+    args = parser.parse_args()
+
+    facts_service = FactsService(json_backend=args.json_backend)
+    data = make_data(args.rows)
+    print(f"{args.rows:,} rows, {facts_service.json_backend.name} backend")
+
+    results = {}
+    for name, func in (("loop", loop_path), ("columnar", columnar_path)):
+        start = time.perf_counter()
+        results[name] = func(facts_service, data)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:>9}: {elapsed:8.3f} s  {args.rows / elapsed:14,.0f} rows/s  "
+            f"body {len(results[name]) / 2 ** 20:8.1f} MiB"
+        )
+
+    assert json.loads(results["loop"]) == json.loads(results["columnar"])
+    print("payloads are identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare peak memory of parsing a facts response body at once and of
+streaming it with `get_facts(..., stream=True)`.
+
+Both paths start from the raw response body. The body itself is allocated
+before tracing starts, so the numbers only cover decoding and parsing.
+
+Usage::
+
+    python -m benchmarks.bench_stream_facts --points 500 --samples 2000
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.bench_fact_parser import make_response
+from eco_connect import FactsService
+from eco_connect.src.json_backend import JsonBackend
+from eco_connect.src.json_response import JsonResponse
+
+
+class StreamedResponse:
+    def __init__(self, body):
+        self.raw = io.BytesIO(body)
+
+    def close(self):
+        self.raw.close()
+
+
+def buffered_path(facts_service, body):
+    response = JsonResponse(JsonBackend("json").loads(body))
+    return facts_service._pandas_fact_parser(response)
+
+
+def streaming_path(facts_service, body):
+    return facts_service._streaming_fact_parser(StreamedResponse(body))
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    # Memory is traced in a separate run, tracemalloc skews the timings.
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+
+    facts_service = FactsService()
+    body = make_response(args.points, args.samples).text.encode()
+    rows = args.points * args.samples
+    print(
+        f"{rows:,} rows ({args.points} points x {args.samples} samples), "
+        f"body {len(body) / 2 ** 20:.1f} MiB"
+    )
+
+    results = {}
+    for name, func in (("buffered", buffered_path), ("streaming", streaming_path)):
+        results[name], elapsed, peak = measure(func, facts_service, body)
+        print(
+            f"{name:>9}: {elapsed:8.3f} s  {rows / elapsed:14,.0f} rows/s  "
+            f"peak {peak / 2 ** 20:8.1f} MiB"
+        )
+
+    pd.testing.assert_frame_equal(results["buffered"], results["streaming"])
+    print("results are identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
 import os
-import requests
 from eco_connect.facts_service import FactsService
+from eco_connect.src.lazy_module import LazyModule
+
+requests = LazyModule("requests")
+
+
+def __getattr__(name):
+    # AsyncFactsService pulls in asyncio, import it on first use.
+    if name == "AsyncFactsService":
+        from eco_connect.async_facts_service import AsyncFactsService
+
+        return AsyncFactsService
+    raise AttributeError(f"module 'eco_connect' has no attribute '{name}'")
 
 
 def validate_credentials():
@@ -0,0 +1,597 @@
+import asyncio
+
+from eco_connect.src.async_base_request import AsyncBaseRequest
+from eco_connect.src.errors import RequestTimeout
+from eco_connect.src.facts_mixin import FactsMixin
+from eco_connect.src.lazy_module import LazyModule
+
+httpx = LazyModule("httpx")
+pd = LazyModule("pandas")
+
+
+class AsyncFactsService(FactsMixin, AsyncBaseRequest):
+    """An asyncio connector to Ecorithm's facts-service API
+    (https://facts.prod.ecorithm.com/api/v1/).
+
+    Every endpoint method mirrors the one on `FactsService`, takes the same
+    arguments and returns the same result formats, but must be awaited.
+    Responses are parsed with the same parsers as `FactsService`. The
+    exceptions are `get_facts` and `get_facts_many`, which do not support
+    `stream` and `use_cache`. `iter_facts` and `export_facts` are only
+    available on `FactsService`.
+
+    Requires the optional `httpx` dependency
+    (`pip install eco-connect[async]`).
+
+        **Kwargs**:
+           Same as `FactsService`, without the fact and metadata caches
+           (`cache_dir`, `cache_max_size`, `cache_lag`,
+           `metadata_cache_size` and `metadata_ttl`). `pool_maxsize` caps the
+           number of concurrent connections opened by the client.
+
+    **Example Usage:**
+
+    >>> import asyncio
+    >>> from eco_connect import AsyncFactsService
+    >>> async def main(building_ids):
+    ...     async with AsyncFactsService() as facts_service:
+    ...         return await asyncio.gather(
+    ...             *[
+    ...                 facts_service.get_point_mapping(building_id)
+    ...                 for building_id in building_ids
+    ...             ]
+    ...         )
+    >>> asyncio.run(main([26, 27]))
+    """
+
+    def __init__(
+        self,
+        environment_name="prod",
+        version="v1",
+        pool_connections=10,
+        pool_maxsize=10,
+        keep_alive=True,
+        json_backend=None,
+        retry=None,
+        rate_limits=None,
+        compression=None,
+        compression_threshold=1024,
+        timeout=None,
+        deadline=None,
+    ):
+        super().__init__(
+            environment_name=environment_name,
+            version=version,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            json_backend=json_backend,
+            retry=retry,
+            rate_limits=rate_limits,
+            compression=compression,
+            compression_threshold=compression_threshold,
+            timeout=timeout,
+            deadline=deadline,
+        )
+
+    async def get_facts(
+        self,
+        building_id,
+        start_date,
+        end_date,
+        start_hour="00:00",
+        end_hour="23:55",
+        equipment_names=[],
+        equipment_types=[],
+        excluded_days=[],
+        excluded_dates=[],
+        point_classes=[],
+        eco_point_ids=[],
+        display_names=[],
+        native_names=[],
+        point_class_expression=[],
+        native_name_expression=[],
+        display_name_expression=[],
+        result_format="pandas",
+        chunk_size=None,
+        max_workers=4,
+        categorical=None,
+        meta_columns=[],
+    ):
+        """Awaitable version of `FactsService.get_facts`. The windows of
+        `chunk_size` are requested concurrently, up to `max_workers` at once.
+        `stream` and `use_cache` are not supported."""
+        url = self.hostname + f"building/{building_id}/facts"
+
+        data = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "excluded_dates": excluded_dates,
+            "excluded_days": excluded_days,
+            "eco_point_ids": eco_point_ids,
+            "equipment_names": equipment_names,
+            "equipment_types": equipment_types,
+            "point_classes": point_classes,
+            "display_names": display_names,
+            "native_names": native_names,
+            "point_class_expression": point_class_expression,
+            "display_name_expression": display_name_expression,
+            "native_name_expression": native_name_expression,
+        }
+
+        parser = self._get_fact_parser(
+            result_format, categorical=categorical, meta_columns=meta_columns
+        )
+        # One deadline for every window and retry of the query.
+        with self.time_limit():
+            if chunk_size:
+                response = await self._post_fact_windows(
+                    url, data, chunk_size, max_workers
+                )
+            else:
+                response = await self.post(url, data=data)
+
+        return self._format_response(response, **parser)
+
+    async def get_facts_many(
+        self,
+        building_ids,
+        start_date,
+        end_date,
+        start_hour="00:00",
+        end_hour="23:55",
+        equipment_names=[],
+        equipment_types=[],
+        excluded_days=[],
+        excluded_dates=[],
+        point_classes=[],
+        eco_point_ids=[],
+        display_names=[],
+        native_names=[],
+        point_class_expression=[],
+        native_name_expression=[],
+        display_name_expression=[],
+        result_format="pandas",
+        concat=False,
+        max_buildings=8,
+        chunk_size=None,
+        max_workers=4,
+        categorical=None,
+        meta_columns=[],
+    ):
+        """Awaitable version of `FactsService.get_facts_many`, without
+        `use_cache`."""
+        if concat and result_format != "pandas":
+            raise ValueError("concat is only supported for pandas results!")
+
+        semaphore = asyncio.Semaphore(max_buildings)
+
+        async def get_building_facts(building_id):
+            async with semaphore:
+                return await self.get_facts(
+                    building_id,
+                    start_date,
+                    end_date,
+                    start_hour=start_hour,
+                    end_hour=end_hour,
+                    equipment_names=equipment_names,
+                    equipment_types=equipment_types,
+                    excluded_days=excluded_days,
+                    excluded_dates=excluded_dates,
+                    point_classes=point_classes,
+                    eco_point_ids=eco_point_ids,
+                    display_names=display_names,
+                    native_names=native_names,
+                    point_class_expression=point_class_expression,
+                    native_name_expression=native_name_expression,
+                    display_name_expression=display_name_expression,
+                    result_format=result_format,
+                    chunk_size=chunk_size,
+                    max_workers=max_workers,
+                    categorical=categorical,
+                    meta_columns=meta_columns,
+                )
+
+        building_ids = list(dict.fromkeys(building_ids))
+        with self.time_limit():
+            results = await asyncio.gather(
+                *[get_building_facts(building_id) for building_id in building_ids]
+            )
+        results = dict(zip(building_ids, results))
+        if not concat:
+            return results
+        return self._concat_building_facts(results)
+
+    async def _post_fact_windows(self, url, data, chunk_size, max_workers):
+        windows = self._split_date_range(
+            data["start_date"], data["end_date"], chunk_size
+        )
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def post_window(start_date, end_date):
+            async with semaphore:
+                return await self.post(
+                    url, data=dict(data, start_date=start_date, end_date=end_date)
+                )
+
+        responses = await asyncio.gather(
+            *[post_window(start_date, end_date) for start_date, end_date in windows]
+        )
+        return self._merge_fact_responses(responses)
+
+    async def put_facts(self, building_id, data=None, batch_size=None, max_workers=4):
+        """Awaitable version of `FactsService.put_facts`. The batches of
+        `batch_size` rows are uploaded concurrently, up to `max_workers` at
+        once."""
+        url = f"{self.hostname}building/{building_id}/facts"
+        if data is None:
+            data = pd.DataFrame(columns=["fact_time", "fact_value", "native_name"])
+        with self.time_limit():
+            if batch_size is not None:
+                response = await self._put_fact_batches(
+                    url, data, batch_size, max_workers
+                )
+            else:
+                response = await self._put_fact_batch(url, data)
+        parser = self._get_parser(result_format="json")
+        return self._format_response(response, **parser)
+
+    async def _put_fact_batch(self, url, data):
+        input_data = self._serialize_facts(data)
+        return await self.put(url, data=input_data, encode_type="json")
+
+    async def _put_fact_batches(self, url, data, batch_size, max_workers):
+        row_ranges = self._get_batch_row_ranges(data, batch_size)
+        if not row_ranges:
+            return await self._put_fact_batch(url, data)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def put_batch(row_range):
+            # As in `FactsService`, a batch failing without a response is
+            # listed in `failed_batches` and does not cancel the others.
+            async with semaphore:
+                try:
+                    return await self._put_fact_batch(url, data.iloc[slice(*row_range)])
+                except (httpx.TransportError, RequestTimeout) as error:
+                    return error
+
+        responses = await asyncio.gather(
+            *[put_batch(row_range) for row_range in row_ranges]
+        )
+        return self._merge_put_fact_responses(responses, row_ranges)
+
+    async def get_avg_facts(
+        self,
+        building_id,
+        start_date,
+        end_date,
+        start_hour="00:00",
+        end_hour="23:55",
+        period="day",
+        equipment_names=[],
+        equipment_types=[],
+        excluded_days=[],
+        excluded_dates=[],
+        point_classes=[],
+        eco_point_ids=[],
+        display_names=[],
+        native_names=[],
+        point_class_expression=[],
+        native_name_expression=[],
+        display_name_expression=[],
+        result_format="pandas",
+        categorical=None,
+        meta_columns=[],
+    ):
+        """Awaitable version of `FactsService.get_avg_facts`."""
+        url = f"{self.hostname}building/{building_id}/avg-facts"
+        data = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "excluded_days": excluded_days,
+            "excluded_dates": excluded_dates,
+            "period": period,
+            "eco_point_ids": eco_point_ids,
+            "equipment_names": equipment_names,
+            "equipment_types": equipment_types,
+            "point_classes": point_classes,
+            "display_names": display_names,
+            "native_names": native_names,
+            "point_class_expression": point_class_expression,
+            "display_name_expression": display_name_expression,
+            "native_name_expression": native_name_expression,
+        }
+        parser = self._get_fact_parser(
+            result_format, categorical=categorical, meta_columns=meta_columns
+        )
+        response = await self.post(url, data=data)
+
+        return self._format_response(response, **parser)
+
+    async def get_buildings(
+        self, building_id=None, is_active=True, result_format="pandas"
+    ):
+        """Awaitable version of `FactsService.get_buildings`."""
+        url = f"{self.hostname}buildings"
+        params = {"building_id": building_id, "is_active": is_active}
+        parser = self._get_parser(result_format, data_key="data")
+        response = await self.get(url, data=params)
+
+        return self._format_response(response, **parser)
+
+    async def put_building(self, building, building_id=None, time_zone=None):
+        """Awaitable version of `FactsService.put_building`."""
+        url = f"{self.hostname}buildings"
+        payload = {
+            "building_name": building,
+            "building_id": building_id,
+            "time_zone": time_zone,
+        }
+        response = await self.put(url, data=payload)
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def delete_building(self, building_id):
+        """Awaitable version of `FactsService.delete_building`."""
+        url = f"{self.hostname}buildings"
+        payload = {"building_id": building_id}
+        response = await self.delete(url, data=payload)
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_point_classes(
+        self, point_class=None, is_active=True, result_format="pandas"
+    ):
+        """Awaitable version of `FactsService.get_point_classes`."""
+        url = f"{self.hostname}point-classes"
+        params = {"point_class": point_class, "is_active": is_active}
+        parser = self._get_parser(result_format, data_key="data")
+        response = await self.get(url, data=params)
+
+        return self._format_response(response, **parser)
+
+    async def put_point_class(self, point_class, point_class_id=None):
+        """Awaitable version of `FactsService.put_point_class`."""
+        url = f"{self.hostname}point-classes"
+        payload = {"point_class_id": point_class_id, "point_class": point_class}
+        response = await self.put(url, data=payload)
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def delete_point_class(self, point_class):
+        """Awaitable version of `FactsService.delete_point_class`."""
+        url = f"{self.hostname}point-classes"
+        payload = {"point_class": point_class}
+        response = await self.delete(url, data=payload)
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_point_mapping(
+        self,
+        building_id,
+        equipment_names=[],
+        equipment_types=[],
+        point_classes=[],
+        eco_point_ids=[],
+        display_names=[],
+        native_names=[],
+        point_class_expression=[],
+        native_name_expression=[],
+        display_name_expression=[],
+        is_active=True,
+        result_format="pandas",
+    ):
+        """Awaitable version of `FactsService.get_point_mapping`."""
+        url = f"{self.hostname}building/{building_id}/point-mapping"
+        data = {
+            "is_active": is_active,
+            "eco_point_id": ",".join(map(str, eco_point_ids)) or None,
+            "equipment_name": ",".join(map(str, equipment_names)) or None,
+            "equipment_type": ",".join(map(str, equipment_types)) or None,
+            "point_class": ",".join(map(str, point_classes)) or None,
+            "display_name": ",".join(map(str, display_names)) or None,
+            "native_name": ",".join(map(str, native_names)) or None,
+            "point_class_expression": ",".join(map(str, point_class_expression))
+            or None,
+            "display_name_expression": ",".join(map(str, display_name_expression))
+            or None,
+            "native_name_expression": ",".join(map(str, native_name_expression))
+            or None,
+        }
+        parser = self._get_parser(result_format, data_key="data")
+        response = await self.get(url, data=data)
+
+        return self._format_response(response, **parser)
+
+    async def delete_point_mapping(self, building_id, eco_point_ids=[]):
+        """Awaitable version of `FactsService.delete_point_mapping`."""
+        url = self.hostname + f"building/{building_id}/point-mapping"
+        payload = {"eco_point_id": eco_point_ids}
+        response = await self.delete(url, data=payload, encode_type="form")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def put_point_mapping(self, building_id, point_mapping=None):
+        """Awaitable version of `FactsService.put_point_mapping`."""
+        url = self.hostname + f"building/{building_id}/point-mapping"
+        input_data = self._to_records(point_mapping)
+        response = await self.put(url, data=input_data, encode_type="json")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_equipment_types(
+        self, equipment_type=None, is_active=True, result_format="pandas"
+    ):
+        """Awaitable version of `FactsService.get_equipment_types`."""
+        url = self.hostname + "equipment-types"
+        params = {"equipment_type": equipment_type, "is_active": is_active}
+        parser = self._get_parser(result_format, data_key="data")
+        response = await self.get(url, data=params)
+
+        return self._format_response(response, **parser)
+
+    async def delete_equipment_type(self, equipment_type):
+        """Awaitable version of `FactsService.delete_equipment_type`."""
+        url = self.hostname + "equipment-types"
+        params = {"equipment_type": equipment_type}
+        response = await self.delete(url, data=params, encode_type="form")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def put_equipment_type(self, equipment_type, equipment_type_id=None):
+        """Awaitable version of `FactsService.put_equipment_type`."""
+        url = self.hostname + "equipment-types"
+        payload = {
+            "equipment_type": equipment_type,
+            "equipment_type_id": equipment_type_id,
+        }
+        response = await self.put(url, data=payload, encode_type="form")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_equipment(
+        self,
+        building_id,
+        equipment_name=None,
+        equipment_type=None,
+        is_active=True,
+        result_format="pandas",
+    ):
+        """Awaitable version of `FactsService.get_equipment`."""
+        url = self.hostname + f"building/{building_id}/equipment"
+        params = {
+            "equipment_type": equipment_type,
+            "is_active": is_active,
+            "equipment_name": equipment_name,
+        }
+        parser = self._get_parser(result_format, data_key="data")
+        response = await self.get(url, data=params)
+
+        return self._format_response(response, **parser)
+
+    async def delete_equipment(self, building_id, equipments=[]):
+        """Awaitable version of `FactsService.delete_equipment`."""
+        url = self.hostname + f"building/{building_id}/equipment"
+        payload = {"equipment_name": equipments}
+        response = await self.delete(url, data=payload, encode_type="form")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def put_equipment(self, building_id, equipments=None):
+        """Awaitable version of `FactsService.put_equipment`."""
+        url = self.hostname + f"building/{building_id}/equipment"
+        input_data = self._to_records(equipments)
+        response = await self.put(url, data=input_data, encode_type="json")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_native_names(
+        self, building_id, native_name=None, is_active=True, result_format="pandas"
+    ):
+        """Awaitable version of `FactsService.get_native_names`."""
+        url = self.hostname + f"building/{building_id}/native-names"
+        params = {"native_name": native_name, "is_active": is_active}
+        parser = self._get_parser(result_format, data_key="data")
+        response = await self.get(url, data=params)
+
+        return self._format_response(response, **parser)
+
+    async def put_native_names(self, building_id, native_names=None):
+        """Awaitable version of `FactsService.put_native_names`."""
+        url = self.hostname + f"building/{building_id}/native-names"
+        input_data = self._to_records(native_names)
+        response = await self.put(url, data=input_data, encode_type="json")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def delete_native_names(self, building_id, native_names=[]):
+        """Awaitable version of `FactsService.delete_native_names`."""
+        url = self.hostname + f"building/{building_id}/native-names"
+        payload = {"native_name": native_names}
+        response = await self.delete(url, data=payload, encode_type="form")
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_native_names_history(self, building_id):
+        """Awaitable version of `FactsService.get_native_names_history`."""
+        url = self.hostname + f"building/{building_id}/native-name-history"
+        response = await self.get(url)
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_unmapped_native_names(self, building_id):
+        """Awaitable version of `FactsService.get_unmapped_native_names`."""
+        url = self.hostname + f"building/{building_id}/unmapped-native-names"
+        response = await self.get(url)
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_etl_process_history(self, building_id, return_limit=None):
+        """Awaitable version of `FactsService.get_etl_process_history`."""
+        url = self.hostname + f"building/{building_id}/etl-process-history"
+        response = await self.get(url, data={"return_limit": return_limit})
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_unstored_native_names(self, building_id):
+        """Awaitable version of `FactsService.get_unstored_native_names`."""
+        url = self.hostname + f"building/{building_id}/unstored-native-names"
+        response = await self.get(url)
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_last_native_name_record(
+        self, building_id, native_name, max_time=None
+    ):
+        """Awaitable version of `FactsService.get_last_native_name_record`."""
+        url = self.hostname + f"building/{building_id}/last-native-name-record"
+        response = await self.get(
+            url, data={"native_name": native_name, "max_time": max_time}
+        )
+        parser = self._get_parser("json")
+
+        return self._format_response(response, **parser)
+
+    async def get_building_dqi(
+        self,
+        building_id,
+        start_date,
+        end_date,
+        dqi_aggregate="building_id",
+        period="day",
+        native_name_expression=".*",
+        result_format="pandas",
+    ):
+        """Awaitable version of `FactsService.get_building_dqi`."""
+        url = self.hostname + f"building/{building_id}/dqi"
+        params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "dqi_aggregate": dqi_aggregate,
+            "period": period,
+            "native_name_expression": native_name_expression,
+        }
+        parser = self._get_dqi_parser(result_format)
+        response = await self.get(url, data=params)
+
+        return self._format_response(response, **parser)
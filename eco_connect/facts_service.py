@@ -1,12 +1,23 @@
-import pandas as pd
-from collections import namedtuple
-from operator import attrgetter
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
 from eco_connect.src.base_request import BaseRequest
-from eco_connect.src.request_parser import RequestParser
-from eco_connect.src.errors import RequestParserError
+from eco_connect.src.fact_cache import FactCache
+from eco_connect.src.facts_mixin import FactsMixin
+from eco_connect.src.json_response import JsonResponse
+from eco_connect.src.lazy_module import LazyModule
+from eco_connect.src.request_parser import import_pyarrow
+from eco_connect.src.single_flight import SingleFlight
+from eco_connect.src.ttl_cache import TTLCache
+from eco_connect.src.errors import InvalidRequest, RequestParserError, RequestTimeout
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+requests = LazyModule("requests")
 
 
-class FactsService(BaseRequest):
+class FactsService(FactsMixin, BaseRequest):
     """A class to connect to Ecorithm's facts-service API
     (https://facts.prod.ecorithm.com/api/v1/).
 
@@ -21,15 +32,191 @@ class FactsService(BaseRequest):
            **version** (str): Api version. Supported versions: ('v1')
 
                 *Example*: 'v1'
+
+           **pool_connections** (int): Number of host connection pools to
+           cache in the underlying session.
+
+                *Default*: 10
+
+           **pool_maxsize** (int): Maximum number of connections kept open
+           per host. Should be at least the number of threads sharing the
+           instance.
+
+                *Default*: 10
+
+           **keep_alive** (bool): Reuse connections across calls. When False,
+           every request asks the server to close the connection.
+
+                *Default*: True
+
+           **cache_dir** (str): Directory of a persistent fact cache used by
+           `get_facts`. Repeat queries only request the time ranges missing
+           from the cache. See `eco_connect.src.fact_cache.FactCache`.
+
+                *Example*: '~/.cache/eco_connect'
+
+           **cache_max_size** (int): Maximum size of the fact cache in bytes.
+           Least recently used partitions are evicted first.
+
+                *Example*: 2 * 1024 ** 3
+
+           **cache_lag** (str): How long samples may take to reach the API.
+           The last `cache_lag` of a cached range is fetched again by the
+           next query.
+
+                *Default*: '1h'
+
+           **metadata_cache_size** (int): Maximum number of metadata responses
+           (buildings, point classes, equipment types, equipment, native
+           names and point mappings) kept in memory. 0 disables the cache.
+
+                *Default*: 128
+
+           **metadata_ttl** (dict): Seconds a metadata response is reused
+           for, per endpoint. Overrides the defaults in
+           `FactsService.metadata_ttl`; a TTL of 0 disables caching of that
+           endpoint.
+
+                *Example*: {'point_mapping': 60, 'buildings': 0}
+
+           **json_backend** (str): Library used to decode responses and
+           encode JSON request bodies. One of ('orjson', 'ujson',
+           'simdjson', 'json'). By default the fastest installed one is
+           used. See `eco_connect.src.json_backend.JsonBackend`.
+
+                *Example*: 'orjson'
+
+           **retry** (RetryPolicy): When and how often failed requests are
+           retried. By default up to 3 retries with exponential backoff on
+           connection errors and 429/502/503/504 responses. Retry counts are
+           kept in `facts_service.retry_stats`. See
+           `eco_connect.src.retry.RetryPolicy`.
+
+                *Example*: RetryPolicy(retries=5, budget=600)
+
+           **rate_limits** (dict): Client-side limits per environment,
+           overriding `FactsService.rate_limits`. Each entry holds the kwargs
+           of `eco_connect.src.rate_limiter.RateLimiter`: `rate` (requests
+           per second), `burst`, `max_concurrency` and `path`. With a `path`,
+           the limits are shared by every process on the host using it.
+
+                *Example*: {'prod': {'rate': 20, 'max_concurrency': 8,
+                'path': '/tmp/eco_connect-prod'}}
+
+           **compression** (str): Compress JSON request bodies, e.g. of
+           `put_facts`, with this encoding and send them with a matching
+           `Content-Encoding`. Supported values: ('gzip', 'zstd'). 'zstd'
+           requires `zstandard`.
+
+                *Example*: 'gzip'
+
+           **compression_threshold** (int): Only compress bodies of at least
+           this many bytes.
+
+                *Default*: 1024
+
+           **timeout** (float or tuple): Connect and read timeout in seconds
+           of each request, as accepted by `requests`. A request that times
+           out is retried and raises `RequestTimeout` once out of retries.
+
+                *Default*: (10, 300)
+
+           **deadline** (float): Seconds an operation may take across all of
+           its requests, i.e. every window, batch and retry. Once past it no
+           further request is sent and `RequestTimeout` is raised. None
+           disables it.
+
+                *Example*: 600
+
+    The instance owns a pooled HTTP session that is reused by every endpoint
+    method. Call `close()` when done, or use it as a context manager.
+
+    >>> with FactsService() as facts_service:
+    ...     facts_service.get_buildings()
+
+    Both limits can be changed for a block of calls:
+
+    >>> with facts_service.time_limit(deadline=60, timeout=(3, 30)):
+    ...     facts_service.get_facts(26, '2017-12-01', '2017-12-31')
+
+    Cached facts can be dropped with
+    `facts_service.fact_cache.invalidate(building_id, eco_point_ids)`.
+
+    Metadata responses are cached in memory and dropped by the matching
+    `put_*` and `delete_*` calls of the same instance. Changes made elsewhere
+    show up once the TTL expires, or after
+    `facts_service.metadata_cache.clear()`. Identical metadata calls made
+    concurrently, e.g. by the threads of a server, share a single request.
+
+    Once expired, buildings, point classes, equipment types and point
+    mappings are revalidated with `ETag` / `Last-Modified` validators. When
+    they have not changed, the server sends no body and the results already
+    parsed from the previous response are reused.
     """
 
-    def __init__(self, environment_name="prod", version="v1"):
-        self.env = self._validate_env(environment_name=environment_name)
-        if environment_name == "dev":
-            self.hostname = "http://127.0.0.1:5000/api/v1/"
-        else:
-            self.hostname = f"https://facts.{self.env}.ecorithm.com/api/{version}/"
-        super().__init__()
+    # Default seconds each metadata endpoint is cached for.
+    metadata_ttl = {
+        "buildings": 3600,
+        "point_classes": 3600,
+        "equipment_types": 3600,
+        "equipment": 300,
+        "native_names": 300,
+        "point_mapping": 300,
+    }
+    # Metadata endpoints whose expired responses are revalidated with
+    # conditional requests rather than fetched again.
+    revalidated_metadata = (
+        "buildings",
+        "point_classes",
+        "equipment_types",
+        "point_mapping",
+    )
+
+    def __init__(
+        self,
+        environment_name="prod",
+        version="v1",
+        pool_connections=10,
+        pool_maxsize=10,
+        keep_alive=True,
+        cache_dir=None,
+        cache_max_size=None,
+        cache_lag="1h",
+        metadata_cache_size=128,
+        metadata_ttl=None,
+        json_backend=None,
+        retry=None,
+        rate_limits=None,
+        compression=None,
+        compression_threshold=1024,
+        timeout=None,
+        deadline=None,
+    ):
+        super().__init__(
+            environment_name=environment_name,
+            version=version,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            json_backend=json_backend,
+            retry=retry,
+            rate_limits=rate_limits,
+            compression=compression,
+            compression_threshold=compression_threshold,
+            timeout=timeout,
+            deadline=deadline,
+            revalidation_cache_size=metadata_cache_size,
+        )
+        self.fact_cache = None
+        if cache_dir:
+            self.fact_cache = FactCache(
+                os.path.join(cache_dir, self.env),
+                max_size=cache_max_size,
+                lag=cache_lag,
+            )
+        self.metadata_cache = TTLCache(maxsize=metadata_cache_size)
+        self.single_flight = SingleFlight()
+        self.metadata_ttl = {**self.metadata_ttl, **(metadata_ttl or {})}
 
     def get_facts(
         self,
@@ -50,6 +237,12 @@ class FactsService(BaseRequest):
         native_name_expression=[],
         display_name_expression=[],
         result_format="pandas",
+        chunk_size=None,
+        max_workers=4,
+        categorical=None,
+        meta_columns=[],
+        use_cache=True,
+        stream=False,
     ):
         """Return the sensor facts for a building.
 
@@ -137,16 +330,66 @@ class FactsService(BaseRequest):
 
                 *Example*: ['VAV.* SpaceAirTemperature', 'AHU Space.*']
 
-           **result_format** (str): Output format type. (Pandas, tuple, csv,
-           json)
+           **result_format** (str): Output format type. (Pandas, wide, tuple,
+           csv, json, numpy, arrow, polars). `wide` returns a DataFrame
+           indexed by `fact_time` with one column per `eco_point_id`.
+           `numpy` returns a `(facts, meta)` pair of structured arrays:
+           `facts` has a `fact_time` (datetime64[s]), `fact_value` (float64)
+           and `eco_point_id` (int32) field, `meta` one row per
+           `eco_point_id` with the meta information of the point. `arrow`
+           returns a `pyarrow.Table` with a timestamp `fact_time` and
+           dictionary-encoded meta columns, and requires `pyarrow`.
+           `polars` returns a polars DataFrame with a Datetime `fact_time`
+           and Categorical meta columns, and requires polars >= 0.20, i.e.
+           Python >= 3.8.
 
                 *Example*: 'pandas'
 
+           **meta_columns** (list): Meta fields added as extra column levels
+           below `eco_point_id` when `result_format` is `wide`.
+
+                *Example*: ['equipment_name', 'point_class']
+
+           **use_cache** (bool): Read through the fact cache when the
+           instance has one (see `cache_dir`). Queries filtering on hours,
+           days or dates always bypass the cache.
+
+                *Default*: True
+
+           **stream** (bool): Read a pandas result incrementally from the
+           response body. Each point is turned into arrays as soon as it has
+           been read, so the body and the decoded response are never held
+           in memory as a whole. Requires `ijson`. Cannot be combined with
+           `chunk_size` and does not read through the fact cache.
+
+                *Default*: False
+
+           **chunk_size** (str or timedelta): Split the date range into
+           windows of this length and fetch them concurrently. Samples
+           shared by two windows are only returned once. Any value accepted
+           by `pandas.Timedelta` is supported. By default the whole range is
+           fetched with a single request.
+
+                *Example*: '7D'
+
+           **max_workers** (int): Maximum number of windows fetched at the
+           same time when `chunk_size` is set.
+
+                *Default*: 4
+
+           **categorical** (bool): Return the `display_name`,
+           `native_name`, `point_class`, `equipment_name` and
+           `equipment_type` columns of a pandas result as Categoricals.
+           By default they are only categorical for results of at least
+           `FactsService.categorical_threshold` rows.
+
+                *Example*: True
+
 
 
         **Returns**:
-           (DataFrame or list or csv or json depending on the requested
-           result format).
+           (DataFrame or list or csv or json or numpy arrays depending on
+           the requested result format).
 
         *DataFrame Example*::
 
@@ -156,6 +399,15 @@ class FactsService(BaseRequest):
             1      2017-12-21 00:00       2            304       'CoolingCoil'   'name-2'    'CoolingCoilUnitFeedback'     'AHU-01'        'AHU'
 
 
+        *Wide Example*::
+
+            eco_point_id           192    304
+            fact_time
+            ===================  =====  =====
+            2017-12-20 00:00:00    1.0    NaN
+            2017-12-21 00:00:00    NaN    2.0
+
+
         *Json Example*::
 
             {
@@ -301,60 +553,622 @@ class FactsService(BaseRequest):
             "native_name_expression": native_name_expression,
         }
 
-        if result_format.lower() == "pandas":
-            parser_args = {"data_key": "data"}
-            fact_parser = self._pandas_fact_parser
-        elif result_format.lower() == "json":
-            fact_parser = RequestParser.json_parser
-            parser_args = {}
-        elif result_format.lower() == "tuple":
-            fact_parser = self._tuple_fact_parser
-            parser_args = {"data_key": "data"}
-        elif result_format.lower() == "csv":
-            fact_parser = self._csv_fact_parser
-            parser_args = {"data_key": "data"}
+        if stream:
+            if result_format != "pandas" or chunk_size:
+                raise ValueError(
+                    "stream is only supported for pandas results without chunk_size!"
+                )
+            parser = {
+                "parser": self._streaming_fact_parser,
+                "parser_args": {"categorical": categorical},
+            }
         else:
-            raise ValueError(f"{result_format} is not valid!")
+            parser = self._get_fact_parser(
+                result_format, categorical=categorical, meta_columns=meta_columns
+            )
+
+        # One deadline for every window and retry of the query.
+        with self.time_limit():
+            if stream:
+                response = self.post(url, data=data, stream=True)
+            elif use_cache and self._is_cacheable(data):
+                response = self._post_cached_facts(
+                    building_id, url, data, chunk_size, max_workers
+                )
+            elif chunk_size:
+                response = self._post_fact_windows(url, data, chunk_size, max_workers)
+            else:
+                response = self.post(url, data=data)
+
+        return self._format_response(response, parser["parser"], parser["parser_args"])
+
+    def get_facts_many(
+        self,
+        building_ids,
+        start_date,
+        end_date,
+        start_hour="00:00",
+        end_hour="23:55",
+        equipment_names=[],
+        equipment_types=[],
+        excluded_days=[],
+        excluded_dates=[],
+        point_classes=[],
+        eco_point_ids=[],
+        display_names=[],
+        native_names=[],
+        point_class_expression=[],
+        native_name_expression=[],
+        display_name_expression=[],
+        result_format="pandas",
+        concat=False,
+        max_buildings=8,
+        chunk_size=None,
+        max_workers=4,
+        categorical=None,
+        meta_columns=[],
+        use_cache=True,
+    ):
+        """Return the sensor facts for several buildings, querying up to
+        `max_buildings` of them at once.
 
-        response = self.post(url, data=data)
+        Takes the same filters and result formats as `get_facts`, which are
+        applied to every building. The deadline of the instance covers the
+        whole fan-out.
+
+        **Args**:
+
+           **building_ids** (list): Building ids to get facts for.
+
+                *Example*: [26, 27, 28]
+
+        **Kwargs**:
+
+           **concat** (bool): Return a single DataFrame with the facts of
+           every building and a leading `building_id` column, instead of a
+           dict. Requires the 'pandas' result format. Buildings without data
+           in the date range are left out.
+
+                *Default*: False
+
+           **max_buildings** (int): Number of buildings queried at once.
+           With `chunk_size`, each of them also uses up to `max_workers`
+           threads, so keep `pool_maxsize` at least
+           `max_buildings * max_workers` to reuse every connection.
+
+                *Default*: 8
+
+        .. note::
+           Without `concat`, the result of each building is the one
+           `get_facts` returns, i.e. the raw api response when its query
+           failed. With `concat`, an error other than missing data raises
+           `InvalidRequest` holding that response.
+
+    **Example Usage:**
+
+    >>> from eco_connect import FactsService
+    >>> facts_service = FactsService()
+    >>> facts_service.get_facts_many(building_ids=[26, 27],
+                                     start_date='2017-12-20 00:00',
+                                     end_date='2017-12-21 00:00',
+                                     concat=True)
+          building_id         fact_time  fact_value  ...
+        0          26  2017-12-20 00:00       70.19  ...
+"""
+        if concat and result_format != "pandas":
+            raise ValueError("concat is only supported for pandas results!")
+
+        def get_building_facts(building_id):
+            return self.get_facts(
+                building_id,
+                start_date,
+                end_date,
+                start_hour=start_hour,
+                end_hour=end_hour,
+                equipment_names=equipment_names,
+                equipment_types=equipment_types,
+                excluded_days=excluded_days,
+                excluded_dates=excluded_dates,
+                point_classes=point_classes,
+                eco_point_ids=eco_point_ids,
+                display_names=display_names,
+                native_names=native_names,
+                point_class_expression=point_class_expression,
+                native_name_expression=native_name_expression,
+                display_name_expression=display_name_expression,
+                result_format=result_format,
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+                categorical=categorical,
+                meta_columns=meta_columns,
+                use_cache=use_cache,
+            )
+
+        building_ids = list(dict.fromkeys(building_ids))
+        with self.time_limit():
+            results = self._map_in_threads(
+                get_building_facts, building_ids, max_buildings
+            )
+        results = dict(zip(building_ids, results))
+        if not concat:
+            return results
+        return self._concat_building_facts(results)
+
+    def iter_facts(
+        self,
+        building_id,
+        start_date,
+        end_date,
+        start_hour="00:00",
+        end_hour="23:55",
+        equipment_names=[],
+        equipment_types=[],
+        excluded_days=[],
+        excluded_dates=[],
+        point_classes=[],
+        eco_point_ids=[],
+        display_names=[],
+        native_names=[],
+        point_class_expression=[],
+        native_name_expression=[],
+        display_name_expression=[],
+        chunk_size=None,
+        by="point",
+        categorical=None,
+    ):
+        """Lazily yield the sensor facts for a building.
+
+        Takes the same filters as `get_facts`. Only one window of facts is
+        requested and held in memory at a time, so histories larger than
+        memory can be processed piece by piece.
+
+        **Kwargs**:
+
+           **chunk_size** (str or timedelta): Request the date range in
+           windows of this length, one after the other. Samples shared by two
+           windows are only yielded once. By default the whole range is a
+           single window.
+
+                *Example*: '7D'
+
+           **by** (str): What to yield. Supported values: ('point', 'window')
+
+              - 'point': a `(meta, Series)` pair per point and window, as
+                soon as the point has been read from the response. The
+                Series holds the `fact_value` of the point indexed by
+                `fact_time` and is named after its `eco_point_id`. Requires
+                `ijson`.
+              - 'window': a DataFrame per window, in the format of
+                `get_facts(..., result_format='pandas')`.
+
+                *Default*: 'point'
+
+           **categorical** (bool): See `get_facts`. Only used when `by` is
+           'window'.
+
+        .. note::
+           Windows without data are skipped. Any other error returned by the
+           API raises `InvalidRequest` holding that error.
+
+    **Example Usage:**
+
+    >>> from eco_connect import FactsService
+    >>> facts_service = FactsService()
+    >>> for meta, facts in facts_service.iter_facts(
+    ...     26, '2017-01-01 00:00', '2018-01-01 00:00', chunk_size='30D'
+    ... ):
+    ...     print(meta['eco_point_id'], facts.mean())
+"""
+        if by not in ("point", "window"):
+            raise ValueError(f"{by} is not valid!")
+
+        url = self.hostname + f"building/{building_id}/facts"
+        data = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "excluded_dates": excluded_dates,
+            "excluded_days": excluded_days,
+            "eco_point_ids": eco_point_ids,
+            "equipment_names": equipment_names,
+            "equipment_types": equipment_types,
+            "point_classes": point_classes,
+            "display_names": display_names,
+            "native_names": native_names,
+            "point_class_expression": point_class_expression,
+            "display_name_expression": display_name_expression,
+            "native_name_expression": native_name_expression,
+        }
+        windows = self._iter_fact_windows(url, data, chunk_size, stream=by == "point")
+        for response, shared_fact_time in windows:
+            if by == "window":
+                result_df = self._pandas_fact_parser(response, categorical=categorical)
+                if shared_fact_time is not None:
+                    result_df = result_df[
+                        pd.to_datetime(result_df["fact_time"]) != shared_fact_time
+                    ].reset_index(drop=True)
+                if not result_df.empty:
+                    yield result_df
+                continue
+
+            for point in self._iter_streamed_points(response):
+                facts = pd.Series(
+                    point["data"], dtype="float64", name=point["meta"]["eco_point_id"]
+                )
+                facts.index = pd.to_datetime(facts.index)
+                facts.index.name = "fact_time"
+                if shared_fact_time is not None:
+                    facts = facts[facts.index != shared_fact_time]
+                if facts.empty:
+                    continue
+                yield point["meta"], facts.sort_index()
+
+    def export_facts(
+        self,
+        building_id,
+        start_date,
+        end_date,
+        path,
+        start_hour="00:00",
+        end_hour="23:55",
+        equipment_names=[],
+        equipment_types=[],
+        excluded_days=[],
+        excluded_dates=[],
+        point_classes=[],
+        eco_point_ids=[],
+        display_names=[],
+        native_names=[],
+        point_class_expression=[],
+        native_name_expression=[],
+        display_name_expression=[],
+        chunk_size="7D",
+        compression="snappy",
+    ):
+        """Write the sensor facts for a building to a Parquet file and return
+        the number of facts written.
+
+        Takes the same filters as `get_facts`. The date range is requested
+        in windows of `chunk_size`, and each window is written as a row group
+        as soon as it arrives, so only one window is held in memory at a
+        time. The columns are the ones of `get_facts(...,
+        result_format='arrow')`. Requires `pyarrow`.
+
+        **Args**:
+
+           **path** (str): Path of the Parquet file to write. An existing
+           file is overwritten, and the file is removed if the export fails.
+
+                *Example*: 'building_26.parquet'
+
+        **Kwargs**:
+
+           **chunk_size** (str or timedelta): Length of the windows, i.e. of
+           the row groups. Samples shared by two windows are only written
+           once.
+
+                *Default*: '7D'
+
+           **compression** (str): Parquet compression codec. One of
+           ('snappy', 'gzip', 'brotli', 'zstd', 'lz4', 'none').
+
+                *Default*: 'snappy'
+
+        .. note::
+           Windows without data are skipped. Any other error returned by the
+           API raises `InvalidRequest` holding that error.
+
+    **Example Usage:**
 
-        return self._format_response(response, fact_parser, parser_args)
+    >>> from eco_connect import FactsService
+    >>> facts_service = FactsService()
+    >>> facts_service.export_facts(26,
+                                   start_date='2015-01-01 00:00',
+                                   end_date='2018-01-01 00:00',
+                                   path='building_26.parquet',
+                                   chunk_size='30D')
+        52416000
+"""
+        pa = import_pyarrow()
+        from pyarrow import parquet as pq
+
+        url = self.hostname + f"building/{building_id}/facts"
+        data = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "excluded_dates": excluded_dates,
+            "excluded_days": excluded_days,
+            "eco_point_ids": eco_point_ids,
+            "equipment_names": equipment_names,
+            "equipment_types": equipment_types,
+            "point_classes": point_classes,
+            "display_names": display_names,
+            "native_names": native_names,
+            "point_class_expression": point_class_expression,
+            "display_name_expression": display_name_expression,
+            "native_name_expression": native_name_expression,
+        }
 
-    def _tuple_fact_parser(self, response, data_key="data"):
+        writer = None
+        fact_count = 0
         try:
-            result = response.json()
-        except (ValueError):
-            raise RequestParserError("Unable to parse the response.", response.text)
+            for response, shared_fact_time in self._iter_fact_windows(
+                url, data, chunk_size
+            ):
+                table = self._arrow_fact_parser(response)
+                if shared_fact_time is not None:
+                    table = table.filter(
+                        table["fact_time"].to_numpy()
+                        != np.datetime64(shared_fact_time, "s")
+                    )
+                if not table.num_rows:
+                    continue
+                if writer is None:
+                    schema = self._get_export_schema(table)
+                    writer = pq.ParquetWriter(path, schema, compression=compression)
+                # Dictionaries differ between windows, their type doesn't.
+                table = table.cast(schema)
+                writer.write_table(table, row_group_size=table.num_rows)
+                fact_count += table.num_rows
+
+            if writer is None:
+                # No window had data, write a file without meta columns.
+                writer = pq.ParquetWriter(
+                    path,
+                    pa.schema(
+                        [
+                            ("fact_time", pa.timestamp("s")),
+                            ("fact_value", pa.float64()),
+                            ("eco_point_id", pa.int32()),
+                        ]
+                    ),
+                    compression=compression,
+                )
+            writer.close()
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                os.remove(path)
+            raise
+        return fact_count
+
+    def _get_export_schema(self, table):
+        """Return the schema of the first window of `export_facts`, with
+        meta columns that only hold nulls typed as strings."""
+        pa = import_pyarrow()
+        fields = []
+        for field in table.schema:
+            if pa.types.is_dictionary(field.type) and pa.types.is_null(
+                field.type.value_type
+            ):
+                field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+            fields.append(field)
+        return pa.schema(fields)
+
+    def _iter_fact_windows(self, url, data, chunk_size, stream=False):
+        """Post the facts query of `data` window by window and yield a
+        `(response, shared_fact_time)` pair per window with data.
+
+        `shared_fact_time` is the start of the window as a `Timestamp`,
+        which the previous window already ended with, or None for the first
+        window. Samples are compared to it as times, whatever the format the
+        API returns them in. Any error other than missing data raises
+        `InvalidRequest`.
+        """
+        start_date, end_date = data["start_date"], data["end_date"]
+        if chunk_size:
+            windows = self._split_date_range(start_date, end_date, chunk_size)
+        else:
+            windows = [(start_date, end_date)]
+        # A block can't stay open across yields, so the deadline starts here
+        # and is applied to each window's request.
+        with self.time_limit():
+            time_limits = self._time_limits.get()
+
+        for index, (window_start, window_end) in enumerate(windows):
+            payload = dict(data, start_date=window_start, end_date=window_end)
+            with self._apply_time_limits(time_limits):
+                response = self.post(url, data=payload, stream=stream)
+            if response.status_code not in (200, 201):
+                if self._is_no_data(response):
+                    continue
+                raise InvalidRequest(self._format_response(response))
+            yield response, pd.Timestamp(window_start) if index else None
+
+    def _post_fact_windows(self, url, data, chunk_size, max_workers):
+        windows = self._split_date_range(
+            data["start_date"], data["end_date"], chunk_size
+        )
+        responses = self._post_windows(url, data, windows, max_workers)
+        return self._merge_fact_responses(responses)
 
-        result = result[data_key]
+    def _post_windows(self, url, data, windows, max_workers):
+        payloads = [
+            dict(data, start_date=start_date, end_date=end_date)
+            for start_date, end_date in windows
+        ]
+        return self._map_in_threads(
+            lambda payload: self.post(url, data=payload), payloads, max_workers
+        )
 
-        tuple_names = ["fact_time", "fact_value"] + list(
-            list(result.values())[0]["meta"].keys()
+    def _map_in_threads(self, func, items, max_workers):
+        """`func` applied to each of `items` by a pool of threads, in order.
+        The threads share the time limits of the caller."""
+        time_limits = self._time_limits.get()
+
+        def call(item):
+            with self._apply_time_limits(time_limits):
+                return func(item)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(call, items))
+
+    def _is_cacheable(self, data):
+        # Cached facts are stored per point, so only queries returning every
+        # sample of the selected points in the date range can use them.
+        return (
+            self.fact_cache is not None
+            and data["start_hour"] == "00:00"
+            and data["end_hour"] == "23:55"
+            and not data["excluded_days"]
+            and not data["excluded_dates"]
         )
 
-        response_tuple = namedtuple("response_tuple", tuple_names)
-        parsed_result = []
-        for dpoint_id, data in result.items():
-            meta = data["meta"]
-            fact_data = data["data"]
-            for fact_time, fact_value in fact_data.items():
-                row = {"fact_time": fact_time, "fact_value": fact_value}
-                row.update(meta)
-                parsed_result.append(response_tuple(**row))
-        return sorted(parsed_result, key=attrgetter("eco_point_id"))
-
-    def _pandas_fact_parser(self, response, data_key="data"):
-        tuple_response = self._tuple_fact_parser(response, data_key)
-        return pd.DataFrame(tuple_response)
-
-    def _csv_fact_parser(self, response, data_key="data"):
-        result_df = self._pandas_fact_parser(response, data_key)
-        return result_df.to_csv()
+    def _post_cached_facts(self, building_id, url, data, chunk_size, max_workers):
+        filters = {
+            key: value
+            for key, value in data.items()
+            if key not in ("start_date", "end_date")
+        }
+        windows = []
+        for start_date, end_date in self.fact_cache.missing(
+            building_id, filters, data["start_date"], data["end_date"]
+        ):
+            if chunk_size:
+                windows.extend(self._split_date_range(start_date, end_date, chunk_size))
+            else:
+                windows.append((start_date, end_date))
+
+        responses = self._post_windows(url, data, windows, max_workers)
+        for (start_date, end_date), response in zip(windows, responses):
+            if response.status_code in (200, 201):
+                self.fact_cache.store(
+                    building_id, filters, start_date, end_date, response.json()["data"]
+                )
+            elif not self._is_no_data(response):
+                return response
+
+        points = self.fact_cache.load(
+            building_id, filters, data["start_date"], data["end_date"]
+        )
+        if points:
+            return JsonResponse({"data": points})
+        elif responses:
+            return responses[0]
+        return self.post(url, data=data)
+
+    def _invalidate_fact_cache(self, building_id):
+        if self.fact_cache is not None:
+            self.fact_cache.invalidate(building_id)
+
+    def _get_metadata(self, endpoint, building_id, url, params):
+        key = (endpoint, building_id, url, json.dumps(params, sort_keys=True))
+        response = self.metadata_cache.get(key)
+        if response is None:
+            # Concurrent identical calls share one request, each of them
+            # parses the response into its own result.
+            response = self.single_flight.do(
+                key, self._get_uncached_metadata, key, url, params
+            )
+        return response
+
+    def _get_uncached_metadata(self, key, url, params):
+        revalidate = key[0] in self.revalidated_metadata
+        response = self.get(url, data=params, revalidate=revalidate)
+        if response.status_code == 200:
+            self.metadata_cache.set(key, response, self.metadata_ttl[key[0]])
+        return response
+
+    def _invalidate_metadata_cache(self, *endpoints, building_id=None):
+        for endpoint in endpoints:
+            if building_id is None:
+                self.metadata_cache.invalidate(endpoint)
+            else:
+                self.metadata_cache.invalidate(endpoint, str(building_id))
+
+    def _streaming_fact_parser(self, response, data_key="data", categorical=None):
+        """Return the same DataFrame as `_pandas_fact_parser`, reading the
+        response body incrementally.
+
+        Each point's `data` block is turned into a time and a value array as
+        soon as it has been read and is then discarded, so peak memory stays
+        close to the size of the result.
+        """
+        points = []
+        # Points mostly share their fact times, keep a single copy of each.
+        known_fact_times = {}
+        for point in self._iter_streamed_points(response, data_key):
+            fact_data = point["data"]
+            # np.fromiter only builds object arrays from numpy 1.23.
+            fact_times = np.array(
+                list(map(known_fact_times.setdefault, fact_data, fact_data)),
+                dtype=object,
+            )
+            fact_values = np.array(list(fact_data.values()))
+            if fact_values.dtype == object:
+                # Missing values, cast them to NaN as pandas would.
+                fact_values = fact_values.astype("float64")
+            points.append((point["meta"], fact_times, fact_values))
+        if not points:
+            raise RequestParserError("Unable to parse the response.")
+
+        meta_names = list(points[0][0].keys())
+        points.sort(key=lambda point: point[0]["eco_point_id"])
+        point_sizes = [len(fact_times) for _, fact_times, _ in points]
+        if categorical is None:
+            categorical = sum(point_sizes) >= self.categorical_threshold
+
+        # Empty points carry no dtype, pandas infers it from the others.
+        fact_values = np.concatenate(
+            [fact_values for _, _, fact_values in points if len(fact_values)]
+            or [np.array([])]
+        )
+        if (
+            len(fact_values)
+            and fact_values.dtype == "float64"
+            and np.isnan(fact_values).all()
+        ):
+            # Only missing values, which pandas keeps as None.
+            fact_values = np.full(len(fact_values), None, dtype=object)
+        columns = {
+            "fact_time": pd.Series(
+                np.concatenate([fact_times for _, fact_times, _ in points])
+            ),
+            "fact_value": fact_values,
+        }
+        for name in meta_names:
+            point_values = [meta[name] for meta, _, _ in points]
+            if categorical and name in self.categorical_columns:
+                point_values = pd.Categorical(point_values)
+                columns[name] = pd.Categorical.from_codes(
+                    np.repeat(point_values.codes, point_sizes),
+                    dtype=point_values.dtype,
+                )
+            else:
+                columns[name] = (
+                    pd.Series(point_values).repeat(point_sizes).reset_index(drop=True)
+                )
+        return pd.DataFrame(columns)
+
+    def _iter_streamed_points(self, response, data_key="data"):
+        """Yield the points of a streamed facts response one at a time, each
+        as soon as it has been read from the body."""
+        try:
+            import ijson
+        except ImportError:
+            raise ImportError(
+                "Streaming facts requires ijson. "
+                "Install it with `pip install eco-connect[stream]`."
+            )
+
+        response.raw.decode_content = True
+        try:
+            for _, point in ijson.kvitems(response.raw, data_key, use_float=True):
+                yield point
+        except ijson.JSONError:
+            raise RequestParserError("Unable to parse the response.")
+        finally:
+            response.close()
 
     def put_facts(
         self,
         building_id,
-        data=pd.DataFrame(columns=["fact_time", "fact_value", "native_name"]),
+        data=None,
+        batch_size=None,
+        max_workers=4,
     ):
         """Insert facts for a building.
 
@@ -375,6 +1189,37 @@ class FactsService(BaseRequest):
                     0      2017-12-20 00:00       1       native-name-1
                     1      2017-12-21 00:00       2       native-name-2
 
+        **Kwargs**:
+
+           **batch_size** (int): Upload the rows in batches of this size,
+           concurrently. The per-batch results are merged into a single
+           result of the same shape. By default all rows are uploaded with a
+           single request.
+
+                *Example*: 100000
+
+           **max_workers** (int): Maximum number of batches uploaded at the
+           same time when `batch_size` is set. Only the batches in flight
+           are serialized in memory.
+
+                *Default*: 4
+
+        .. note::
+           When some batches fail, the others are still uploaded. The result
+           holds the merged `data` of the stored batches, and its `message`
+           lists the failed ones in `failed_batches`, each with the
+           `[start, stop)` positions of its rows, so that
+           `data.iloc[start:stop]` can be uploaded again. Batches that got no
+           response, e.g. after connection errors or past the `deadline`,
+           are listed with a `None` status code.
+
+           *Example*:
+            {
+            'failed_batches': [{'rows': [100000, 200000],
+                                'status_code': 503,
+                                'error': {'message': 'Service Unavailable'}}]
+            }
+
 
         .. note::
            If errors are present, a `message` key
@@ -403,18 +1248,37 @@ class FactsService(BaseRequest):
 """
 
         url = f"{self.hostname}building/{building_id}/facts"
-        col_1 = data.columns[0]
-        col_2 = data.columns[1]
-        col_3 = data.columns[2]
-        input_data = [
-            {col_1: row[0], col_2: row[1], col_3: row[2]} for row in data.values
-        ]
-
-        response = self.put(url, data=input_data, encode_type="json")
+        if data is None:
+            data = pd.DataFrame(columns=["fact_time", "fact_value", "native_name"])
+        with self.time_limit():
+            if batch_size is not None:
+                response = self._put_fact_batches(url, data, batch_size, max_workers)
+            else:
+                response = self._put_fact_batch(url, data)
+        self._invalidate_fact_cache(building_id)
         parser = self._get_parser(result_format="json")
         parsed_result = self._format_response(response, **parser)
         return parsed_result
 
+    def _put_fact_batch(self, url, data):
+        input_data = self._serialize_facts(data)
+        return self.put(url, data=input_data, encode_type="json")
+
+    def _put_fact_batches(self, url, data, batch_size, max_workers):
+        row_ranges = self._get_batch_row_ranges(data, batch_size)
+        if not row_ranges:
+            return self._put_fact_batch(url, data)
+        def put_batch(row_range):
+            # A batch failing without a response (connection errors after
+            # the retries, the deadline) must not cancel the other batches.
+            try:
+                return self._put_fact_batch(url, data.iloc[slice(*row_range)])
+            except (requests.RequestException, RequestTimeout) as error:
+                return error
+
+        responses = self._map_in_threads(put_batch, row_ranges, max_workers)
+        return self._merge_put_fact_responses(responses, row_ranges)
+
     def get_avg_facts(
         self,
         building_id,
@@ -435,6 +1299,8 @@ class FactsService(BaseRequest):
         native_name_expression=[],
         display_name_expression=[],
         result_format="pandas",
+        categorical=None,
+        meta_columns=[],
     ):
         """Return the average sensor facts for a building.
 
@@ -529,16 +1395,39 @@ class FactsService(BaseRequest):
 
                 *Default*: 'day'
 
-           **result_format** (str): Output format type. (Pandas, tuple, csv,
-           json)
+           **result_format** (str): Output format type. (Pandas, wide, tuple,
+           csv, json, numpy, arrow, polars). `wide` returns a DataFrame
+           indexed by `fact_time` with one column per `eco_point_id`.
+           `numpy` returns a `(facts, meta)` pair of structured arrays:
+           `facts` has a `fact_time` (datetime64[s]), `fact_value` (float64)
+           and `eco_point_id` (int32) field, `meta` one row per
+           `eco_point_id` with the meta information of the point. `arrow`
+           returns a `pyarrow.Table` with a timestamp `fact_time` and
+           dictionary-encoded meta columns, and requires `pyarrow`.
+           `polars` returns a polars DataFrame with a Datetime `fact_time`
+           and Categorical meta columns, and requires polars >= 0.20, i.e.
+           Python >= 3.8.
 
                 *Example*: 'pandas'
 
+           **meta_columns** (list): Meta fields added as extra column levels
+           below `eco_point_id` when `result_format` is `wide`.
+
+                *Example*: ['equipment_name', 'point_class']
+
+           **categorical** (bool): Return the `display_name`,
+           `native_name`, `point_class`, `equipment_name` and
+           `equipment_type` columns of a pandas result as Categoricals.
+           By default they are only categorical for results of at least
+           `FactsService.categorical_threshold` rows.
+
+                *Example*: True
+
 
 
         **Returns**:
-           (DataFrame or list or csv or json depending on the requested
-           result format).
+           (DataFrame or list or csv or json or numpy arrays depending on
+           the requested result format).
 
         *DataFrame Example*::
 
@@ -548,6 +1437,15 @@ class FactsService(BaseRequest):
             1      2017-12-21 00:00       2            304       'CoolingCoil'   'name-2'    'CoolingCoilUnitFeedback'     'AHU-01'        'AHU'
 
 
+        *Wide Example*::
+
+            eco_point_id           192    304
+            fact_time
+            ===================  =====  =====
+            2017-12-20 00:00:00    1.0    NaN
+            2017-12-21 00:00:00    NaN    2.0
+
+
         *Json Example*::
 
             {
@@ -694,31 +1592,18 @@ class FactsService(BaseRequest):
             "native_name_expression": native_name_expression,
         }
         response = self.post(url, data=data)
-        if result_format.lower() == "pandas":
-            parser_args = {"data_key": "data"}
-            fact_avg_parser = self._pandas_fact_parser
-        elif result_format.lower() == "json":
-            fact_avg_parser = RequestParser.json_parser
-            parser_args = {}
-        elif result_format.lower() == "tuple":
-            fact_avg_parser = self._tuple_fact_parser
-            parser_args = {"data_key": "data"}
-        elif result_format.lower() == "csv":
-            fact_avg_parser = self._csv_fact_parser
-            parser_args = {"data_key": "data"}
-        else:
-            raise ValueError(f"{result_format} is not valid!")
-
-        parsed_result = self._format_response(
-            response, parser=fact_avg_parser, parser_args=parser_args
+        parser = self._get_fact_parser(
+            result_format, categorical=categorical, meta_columns=meta_columns
         )
+
+        parsed_result = self._format_response(response, **parser)
         return parsed_result
 
     def get_buildings(self, building_id=None, is_active=True, result_format="pandas"):
         """Return the meta information for buildings."""
         url = f"{self.hostname}buildings"
         params = {"building_id": building_id, "is_active": is_active}
-        response = self.get(url, data=params)
+        response = self._get_metadata("buildings", None, url, params)
         parser = self._get_parser(result_format, data_key="data")
 
         parsed_result = self._format_response(response, **parser)
@@ -733,6 +1618,7 @@ class FactsService(BaseRequest):
             "time_zone": time_zone,
         }
         response = self.put(url, data=payload)
+        self._invalidate_metadata_cache("buildings")
         parser = self._get_parser(result_format)
         parsed_result = self._format_response(response, **parser)
         return parsed_result
@@ -742,6 +1628,7 @@ class FactsService(BaseRequest):
         url = f"{self.hostname}buildings"
         payload = {"building_id": building_id}
         response = self.delete(url, data=payload)
+        self._invalidate_metadata_cache("buildings")
         parser = self._get_parser(result_format)
         parsed_result = self._format_response(response, **parser)
         return parsed_result
@@ -751,7 +1638,7 @@ class FactsService(BaseRequest):
     ):
         url = f"{self.hostname}point-classes"
         params = {"point_class": point_class, "is_active": is_active}
-        response = self.get(url, data=params)
+        response = self._get_metadata("point_classes", None, url, params)
         parser = self._get_parser(result_format, data_key="data")
 
         parsed_result = self._format_response(response, **parser)
@@ -762,6 +1649,7 @@ class FactsService(BaseRequest):
         url = f"{self.hostname}point-classes"
         payload = {"point_class_id": point_class_id, "point_class": point_class}
         response = self.put(url, data=payload)
+        self._invalidate_metadata_cache("point_classes")
         parser = self._get_parser(result_format)
         parsed_result = self._format_response(response, **parser)
         return parsed_result
@@ -771,6 +1659,7 @@ class FactsService(BaseRequest):
         url = f"{self.hostname}point-classes"
         payload = {"point_class": point_class}
         response = self.delete(url, data=payload)
+        self._invalidate_metadata_cache("point_classes")
         parser = self._get_parser(result_format)
         parsed_result = self._format_response(response, **parser)
         return parsed_result
@@ -857,7 +1746,10 @@ class FactsService(BaseRequest):
                 *Example*: True
 
            **result_format** (str): Output format type. (Pandas, tuple, csv,
-           json)
+           json, arrow, polars). `arrow` returns a `pyarrow.Table` with
+           dictionary-encoded string columns and requires `pyarrow`.
+           `polars` returns a polars DataFrame with Categorical string
+           columns and requires polars >= 0.20, i.e. Python >= 3.8.
 
                 *Example*: 'pandas'
 
@@ -988,7 +1880,7 @@ class FactsService(BaseRequest):
             "native_name_expression": ",".join(map(str, native_name_expression))
             or None,
         }
-        response = self.get(url, data=data)
+        response = self._get_metadata("point_mapping", str(building_id), url, data)
         parser = self._get_parser(result_format, data_key="data")
 
         parsed_result = self._format_response(response, **parser)
@@ -999,14 +1891,18 @@ class FactsService(BaseRequest):
         payload = {"eco_point_id": eco_point_ids}
         result_format = "json"
         response = self.delete(url, data=payload, encode_type="form")
+        self._invalidate_fact_cache(building_id)
+        self._invalidate_metadata_cache("point_mapping", building_id=building_id)
         parser = self._get_parser(result_format)
         parsed_result = self._format_response(response, **parser)
         return parsed_result
 
-    def put_point_mapping(self, building_id, point_mapping=pd.DataFrame()):
+    def put_point_mapping(self, building_id, point_mapping=None):
         url = self.hostname + f"building/{building_id}/point-mapping"
-        input_data = list(point_mapping.T.to_dict().values())
+        input_data = self._to_records(point_mapping)
         response = self.put(url, data=input_data, encode_type="json")
+        self._invalidate_fact_cache(building_id)
+        self._invalidate_metadata_cache("point_mapping", building_id=building_id)
         parser = self._get_parser(result_format="json")
         parsed_result = self._format_response(response, **parser)
         return parsed_result
@@ -1016,7 +1912,7 @@ class FactsService(BaseRequest):
     ):
         url = self.hostname + "equipment-types"
         params = {"equipment_type": equipment_type, "is_active": is_active}
-        response = self.get(url, data=params)
+        response = self._get_metadata("equipment_types", None, url, params)
         parser = self._get_parser(result_format, data_key="data")
 
         parsed_result = self._format_response(response, **parser)
@@ -1027,6 +1923,7 @@ class FactsService(BaseRequest):
         result_format = "json"
         params = {"equipment_type": equipment_type}
         response = self.delete(url, data=params, encode_type="form")
+        self._invalidate_metadata_cache("equipment_types")
         parser = self._get_parser(result_format)
 
         parsed_result = self._format_response(response, **parser)
@@ -1040,6 +1937,7 @@ class FactsService(BaseRequest):
             "equipment_type_id": equipment_type_id,
         }
         response = self.put(url, data=payload, encode_type="form")
+        self._invalidate_metadata_cache("equipment_types")
         parser = self._get_parser(result_format)
 
         parsed_result = self._format_response(response, **parser)
@@ -1080,7 +1978,10 @@ class FactsService(BaseRequest):
 
 
            **result_format** (str): Output format type. (Pandas, tuple, csv,
-           json)
+           json, arrow, polars). `arrow` returns a `pyarrow.Table` with
+           dictionary-encoded string columns and requires `pyarrow`.
+           `polars` returns a polars DataFrame with Categorical string
+           columns and requires polars >= 0.20, i.e. Python >= 3.8.
 
                 *Example*: 'pandas'
 
@@ -1159,7 +2060,7 @@ class FactsService(BaseRequest):
             "is_active": is_active,
             "equipment_name": equipment_name,
         }
-        response = self.get(url, data=params)
+        response = self._get_metadata("equipment", str(building_id), url, params)
         parser = self._get_parser(result_format, data_key="data")
 
         parsed_result = self._format_response(response, **parser)
@@ -1170,16 +2071,22 @@ class FactsService(BaseRequest):
         result_format = "json"
         payload = {"equipment_name": equipments}
         response = self.delete(url, data=payload, encode_type="form")
+        self._invalidate_metadata_cache(
+            "equipment", "point_mapping", building_id=building_id
+        )
         parser = self._get_parser(result_format)
 
         parsed_result = self._format_response(response, **parser)
         return parsed_result
 
-    def put_equipment(self, building_id, equipments=pd.DataFrame()):
+    def put_equipment(self, building_id, equipments=None):
         url = self.hostname + f"building/{building_id}/equipment"
         result_format = "json"
-        input_data = list(equipments.T.to_dict().values())
+        input_data = self._to_records(equipments)
         response = self.put(url, data=input_data, encode_type="json")
+        self._invalidate_metadata_cache(
+            "equipment", "point_mapping", building_id=building_id
+        )
         parser = self._get_parser(result_format)
 
         parsed_result = self._format_response(response, **parser)
@@ -1210,7 +2117,10 @@ class FactsService(BaseRequest):
                 *Example*: True
 
            **result_format** (str): Output format type. (Pandas, tuple, csv,
-           json)
+           json, arrow, polars). `arrow` returns a `pyarrow.Table` with
+           dictionary-encoded string columns and requires `pyarrow`.
+           `polars` returns a polars DataFrame with Categorical string
+           columns and requires polars >= 0.20, i.e. Python >= 3.8.
 
                 *Example*: 'pandas'
 
@@ -1307,17 +2217,20 @@ class FactsService(BaseRequest):
         """
         url = self.hostname + f"building/{building_id}/native-names"
         params = {"native_name": native_name, "is_active": is_active}
-        response = self.get(url, data=params)
+        response = self._get_metadata("native_names", str(building_id), url, params)
         parser = self._get_parser(result_format, data_key="data")
 
         parsed_result = self._format_response(response, **parser)
         return parsed_result
 
-    def put_native_names(self, building_id, native_names=pd.DataFrame()):
+    def put_native_names(self, building_id, native_names=None):
         url = self.hostname + f"building/{building_id}/native-names"
         result_format = "json"
-        input_data = list(native_names.T.to_dict().values())
+        input_data = self._to_records(native_names)
         response = self.put(url, data=input_data, encode_type="json")
+        self._invalidate_metadata_cache(
+            "native_names", "point_mapping", building_id=building_id
+        )
         parser = self._get_parser(result_format)
 
         parsed_result = self._format_response(response, **parser)
@@ -1328,6 +2241,9 @@ class FactsService(BaseRequest):
         result_format = "json"
         payload = {"native_name": native_names}
         response = self.delete(url, data=payload, encode_type="form")
+        self._invalidate_metadata_cache(
+            "native_names", "point_mapping", building_id=building_id
+        )
         parser = self._get_parser(result_format)
 
         parsed_result = self._format_response(response, **parser)
@@ -1390,6 +2306,17 @@ class FactsService(BaseRequest):
         native_name_expression=".*",
         result_format="pandas",
     ):
+        """Return the data quality index (DQI) of a building.
+
+        `result_format` is one of (pandas, tuple, csv, json, numpy, arrow,
+        polars). `numpy` returns a `(dqi, aggregates)` pair: a structured
+        array with an `aggregate` (int32), `timestamp` (datetime64[s]) and
+        `dqi` (float64) field, where `aggregate` indexes the array of
+        aggregate names. `arrow` returns a `pyarrow.Table` with the same
+        columns and a dictionary-encoded `aggregate`, `polars` a polars
+        DataFrame with a Categorical `aggregate`. `polars` requires
+        polars >= 0.20, i.e. Python >= 3.8.
+        """
         url = self.hostname + f"building/{building_id}/dqi"
         params = {
             "start_date": start_date,
@@ -1399,48 +2326,7 @@ class FactsService(BaseRequest):
             "native_name_expression": native_name_expression,
         }
         response = self.get(url, data=params)
-        if result_format.lower() == "pandas":
-            parser_args = {"data_key": "data"}
-            dqi_parser = self._pandas_dqi_parser
-        elif result_format.lower() == "json":
-            dqi_parser = RequestParser.json_parser
-            parser_args = {}
-        elif result_format.lower() == "tuple":
-            dqi_parser = self._tuple_dqi_parser
-            parser_args = {"data_key": "data"}
-        elif result_format.lower() == "csv":
-            dqi_parser = self._csv_dqi_parser
-            parser_args = {"data_key": "data"}
-        else:
-            raise ValueError(f"{result_format} is not valid!")
+        parser = self._get_dqi_parser(result_format)
 
-        parsed_result = self._format_response(
-            response, parser=dqi_parser, parser_args=parser_args
-        )
+        parsed_result = self._format_response(response, **parser)
         return parsed_result
-
-    def _tuple_dqi_parser(self, response, data_key="data"):
-        try:
-            result = response.json()
-        except (ValueError):
-            raise RequestParserError("Unable to parse the response.", response.text)
-
-        result = result[data_key]
-
-        tuple_names = ["aggregate", "timestamp", "dqi"]
-
-        response_tuple = namedtuple("response_tuple", tuple_names)
-        parsed_result = []
-        for aggregate, data in result.items():
-            for timestamp, dqi in data.items():
-                row = {"timestamp": timestamp, "dqi": dqi, "aggregate": aggregate}
-                parsed_result.append(response_tuple(**row))
-        return sorted(parsed_result, key=attrgetter("aggregate"))
-
-    def _pandas_dqi_parser(self, response, data_key="data"):
-        parsed_tuples = self._tuple_dqi_parser(response, data_key)
-        return pd.DataFrame(parsed_tuples)
-
-    def _csv_dqi_parser(self, response, data_key="data"):
-        parsed_df = self._pandas_dqi_parser(response, data_key)
-        return parsed_df.to_csv(index=None)
@@ -0,0 +1,143 @@
+import asyncio
+
+from eco_connect.src.base_request import BaseRequest
+from eco_connect.src.errors import RequestTimeout
+
+
+class AsyncBaseRequest(BaseRequest):
+    """Asyncio flavour of `BaseRequest` backed by an `httpx.AsyncClient`.
+
+    Responses returned by httpx are fully read, so the same parsers used by
+    `BaseRequest._format_response` can be applied to them unchanged.
+    """
+
+    def __enter__(self):
+        # `close` is a coroutine here, a plain `with` could not await it.
+        raise TypeError(f"Use `async with` with {type(self).__name__}.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying client and release its pooled connections."""
+        await self.session.aclose()
+
+    def _create_session(self):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "Async support requires httpx. "
+                "Install it with `pip install eco-connect[async]`."
+            )
+
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+        )
+        return httpx.AsyncClient(
+            limits=limits, event_hooks={"response": [self._async_use_json_backend]}
+        )
+
+    async def _async_use_json_backend(self, response):
+        self._use_json_backend(response)
+
+    async def get(self, url, data={}):
+        kwargs = self._format_kwargs(data=data, encode_type="querystring")
+        return await self._request("GET", url, kwargs)
+
+    async def put(self, url, data={}, encode_type="form"):
+        kwargs = self._format_kwargs(data=data, encode_type=encode_type)
+        return await self._request("PUT", url, kwargs)
+
+    async def post(self, url, data={}, files={}, encode_type="form"):
+        kwargs = self._format_kwargs(data=data, files=files, encode_type=encode_type)
+        return await self._request("POST", url, kwargs)
+
+    async def delete(self, url, data={}, encode_type="form"):
+        kwargs = self._format_kwargs(data=data, encode_type=encode_type)
+        return await self._request("DELETE", url, kwargs)
+
+    async def _request(self, method, url, kwargs):
+        for key in ("params", "data"):
+            if isinstance(kwargs.get(key), dict):
+                kwargs[key] = self._encode_like_requests(kwargs[key])
+        if isinstance(kwargs.get("data"), (str, bytes)):
+            kwargs["content"] = kwargs.pop("data")
+
+        with self.time_limit():
+            return await self._request_with_retries(method, url, kwargs)
+
+    def _encode_like_requests(self, values):
+        """Return query string or form `values` as `requests` would send
+        them. requests drops None values and sends booleans as
+        `True` / `False`, while httpx sends None as an empty string and
+        booleans as `true` / `false`."""
+        encoded = {}
+        for key, value in values.items():
+            if isinstance(value, (list, tuple)):
+                encoded[key] = [
+                    self._encode_value(item) for item in value if item is not None
+                ]
+            elif value is not None:
+                encoded[key] = self._encode_value(value)
+        return encoded
+
+    def _encode_value(self, value):
+        # Other values already encode the same in both.
+        return str(value) if isinstance(value, bool) else value
+
+    async def _request_with_retries(self, method, url, kwargs):
+        import httpx
+
+        attempt = 0
+        waited = 0.0
+        while True:
+            self._count_retry_stats("attempts")
+            timeout = self._get_timeout(method, url)
+            if isinstance(timeout, tuple):
+                connect_timeout, read_timeout = timeout
+                timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+            try:
+                response = await self._request_once(method, url, kwargs, timeout)
+            except httpx.TransportError as error:
+                delay = None
+                if self.retry.is_retryable(method):
+                    delay = self.retry.get_delay(attempt, waited)
+                    if delay is None or self._is_past_deadline(delay):
+                        self._count_retry_stats("exhausted")
+                        delay = None
+                if delay is None:
+                    if isinstance(error, httpx.TimeoutException):
+                        raise RequestTimeout(f"{method} {url} timed out") from error
+                    raise
+                reason = type(error).__name__
+            else:
+                if not self.retry.is_retryable(method, response):
+                    return response
+                delay = self.retry.get_delay(attempt, waited, response)
+                if delay is None or self._is_past_deadline(delay):
+                    self._count_retry_stats("exhausted")
+                    return response
+                reason = f"status_{response.status_code}"
+
+            self._count_retry_stats("retries", reason)
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    async def _request_once(self, method, url, kwargs, timeout=None):
+        if timeout is not None:
+            kwargs = dict(kwargs, timeout=timeout)
+        slot = None
+        if self.rate_limiter.enabled:
+            # The limiter blocks, wait for it off the event loop.
+            loop = asyncio.get_running_loop()
+            slot = await loop.run_in_executor(None, self.rate_limiter.acquire)
+        try:
+            return await self.session.request(method, url, **kwargs)
+        finally:
+            self.rate_limiter.release(slot)
@@ -1,13 +1,91 @@
-import requests
+import contextvars
+import copy
+import gzip
+import json
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 
-from eco_connect.src.errors import InvalidRequest
+from eco_connect.src.errors import InvalidRequest, RequestTimeout
+from eco_connect.src.json_backend import JsonBackend
+from eco_connect.src.lazy_module import LazyModule
+from eco_connect.src.rate_limiter import RateLimiter
 from eco_connect.src.request_parser import RequestParser
+from eco_connect.src.retry import RetryPolicy
+from eco_connect.src.ttl_cache import TTLCache
 from eco_connect.src.credentials_factory import CredentialsFactory
 
+requests = LazyModule("requests")
+
 
 class BaseRequest:
-    def __init__(self):
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        keep_alive=True,
+        json_backend=None,
+        retry=None,
+        rate_limiter=None,
+        compression=None,
+        compression_threshold=1024,
+        timeout=None,
+        deadline=None,
+        revalidation_cache_size=128,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.json_backend = JsonBackend(json_backend)
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        if compression not in (None, "gzip", "zstd"):
+            raise ValueError(f"{compression} is not a valid compression!")
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.timeout = timeout
+        self.deadline = deadline
+        # (expires_at, timeout) of the innermost `time_limit` block.
+        self._time_limits = contextvars.ContextVar("time_limits", default=None)
+        # Responses of `get(..., revalidate=True)` carrying validators, kept
+        # until evicted to send conditional requests for them.
+        self.revalidation_cache = TTLCache(maxsize=revalidation_cache_size)
+        # Number of attempts, retries (in total and per reason) and requests
+        # that ran out of retries.
+        self.retry_stats = Counter()
+        self._retry_stats_lock = threading.Lock()
         self._set_credentials()
+        self.session = self._create_session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying session and release its pooled connections."""
+        self.session.close()
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        session.hooks["response"].append(self._use_json_backend)
+        return session
+
+    def _use_json_backend(self, response, *args, **kwargs):
+        # Every parser goes through `response.json()`, so decoding it with
+        # the configured backend speeds all of them up.
+        response.json = lambda **kwargs: self.json_backend.decode(response)
+        return response
 
     def _validate_env(self, environment_name):
         environment_name = environment_name.lower()
@@ -22,21 +100,178 @@ class BaseRequest:
     def _set_credentials(self):
         self.credentials = CredentialsFactory.get_eco_credentials()
 
-    def get(self, url, data={}):
+    def get(self, url, data={}, revalidate=False):
+        """Send a GET request.
+
+        With `revalidate`, a response with an `ETag` or `Last-Modified`
+        header is kept, and the next identical request is sent with
+        `If-None-Match` / `If-Modified-Since`. When the server answers 304
+        Not Modified, the kept response is returned instead, along with the
+        results already parsed from it.
+        """
         kwargs = self._format_kwargs(data=data, encode_type="querystring")
-        return requests.get(url, **kwargs)
+        if not revalidate:
+            return self._send("GET", url, kwargs)
+
+        key = (url, json.dumps(data, sort_keys=True, default=str))
+        cached_response = self.revalidation_cache.get(key)
+        if cached_response is not None:
+            kwargs["headers"] = self._get_conditional_headers(cached_response)
+        response = self._send("GET", url, kwargs)
+        if response.status_code == 304 and cached_response is not None:
+            return cached_response
+        if response.status_code == 200 and self._get_conditional_headers(response):
+            response.parsed_results = {}
+            self.revalidation_cache.set(key, response, math.inf)
+        return response
+
+    def _get_conditional_headers(self, response):
+        headers = {}
+        if response.headers.get("ETag"):
+            headers["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = response.headers["Last-Modified"]
+        return headers
 
     def put(self, url, data={}, encode_type="form"):
         kwargs = self._format_kwargs(data=data, encode_type=encode_type)
-        return requests.put(url, **kwargs)
+        return self._send("PUT", url, kwargs)
 
-    def post(self, url, data={}, files={}, encode_type="form"):
+    def post(self, url, data={}, files={}, encode_type="form", stream=False):
         kwargs = self._format_kwargs(data=data, files=files, encode_type=encode_type)
-        return requests.post(url, **kwargs)
+        if stream:
+            kwargs["stream"] = True
+        return self._send("POST", url, kwargs)
 
     def delete(self, url, data={}, encode_type="form"):
         kwargs = self._format_kwargs(data=data, encode_type=encode_type)
-        return requests.delete(url, **kwargs)
+        return self._send("DELETE", url, kwargs)
+
+    @contextmanager
+    def time_limit(self, deadline=None, timeout=None):
+        """Limit the requests made inside the block.
+
+        Every request, including retries and the pieces of chunked or batched
+        operations, is sent with `timeout` and none is sent or retried once
+        `deadline` seconds have passed since entering the block. Nested
+        blocks keep the earliest deadline.
+
+            **Kwargs**:
+               **deadline** (float): Seconds the whole block may take.
+
+                    *Default*: `self.deadline`
+
+               **timeout** (float or tuple): Connect and read timeout of each
+               request, as accepted by `requests`.
+
+                    *Default*: The timeout of the enclosing block, or
+                    `self.timeout`
+
+        >>> with facts_service.time_limit(deadline=60, timeout=(3, 30)):
+        ...     facts_service.get_facts(26, '2017-12-01', '2017-12-31')
+        """
+        outer = self._time_limits.get()
+        if deadline is None:
+            deadline = self.deadline
+        expires_at = time.monotonic() + deadline if deadline is not None else None
+        if outer is not None:
+            outer_expires_at, outer_timeout = outer
+            if expires_at is None or (
+                outer_expires_at is not None and outer_expires_at < expires_at
+            ):
+                expires_at = outer_expires_at
+            if timeout is None:
+                timeout = outer_timeout
+        elif timeout is None:
+            timeout = self.timeout
+
+        with self._apply_time_limits((expires_at, timeout)):
+            yield
+
+    @contextmanager
+    def _apply_time_limits(self, time_limits):
+        # Also used to carry the limits of a block over to worker threads
+        # and generators, which do not share its context.
+        token = self._time_limits.set(time_limits)
+        try:
+            yield
+        finally:
+            self._time_limits.reset(token)
+
+    def _get_timeout(self, method, url):
+        """Return the timeout of the next attempt, capped to what is left of
+        the deadline, or raise `RequestTimeout` once it has passed."""
+        expires_at, timeout = self._time_limits.get()
+        if expires_at is None:
+            return timeout
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            raise RequestTimeout(f"Deadline exceeded before {method} {url}")
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
+
+    def _is_past_deadline(self, delay):
+        expires_at = self._time_limits.get()[0]
+        return expires_at is not None and time.monotonic() + delay >= expires_at
+
+    def _send(self, method, url, kwargs):
+        """Send a request, retrying it according to `self.retry`. Each piece
+        of a chunked operation goes through here on its own, so only the
+        failed piece is retried."""
+        with self.time_limit():
+            return self._send_with_retries(method, url, kwargs)
+
+    def _send_with_retries(self, method, url, kwargs):
+        send = getattr(self.session, method.lower())
+        attempt = 0
+        waited = 0.0
+        while True:
+            self._count_retry_stats("attempts")
+            timeout = self._get_timeout(method, url)
+            try:
+                response = self._send_once(send, url, kwargs, timeout)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                delay = None
+                if self.retry.is_retryable(method):
+                    delay = self.retry.get_delay(attempt, waited)
+                    if delay is None or self._is_past_deadline(delay):
+                        self._count_retry_stats("exhausted")
+                        delay = None
+                if delay is None:
+                    if isinstance(error, requests.Timeout):
+                        raise RequestTimeout(f"{method} {url} timed out") from error
+                    raise
+                reason = type(error).__name__
+            else:
+                if not self.retry.is_retryable(method, response):
+                    return response
+                delay = self.retry.get_delay(attempt, waited, response)
+                if delay is None or self._is_past_deadline(delay):
+                    self._count_retry_stats("exhausted")
+                    return response
+                reason = f"status_{response.status_code}"
+                response.close()
+
+            self._count_retry_stats("retries", reason)
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    def _send_once(self, send, url, kwargs, timeout=None):
+        if timeout is not None:
+            kwargs = dict(kwargs, timeout=timeout)
+        slot = self.rate_limiter.acquire()
+        try:
+            return send(url, **kwargs)
+        finally:
+            self.rate_limiter.release(slot)
+
+    def _count_retry_stats(self, *keys):
+        with self._retry_stats_lock:
+            self.retry_stats.update(keys)
 
     def _format_kwargs(self, data, encode_type, files={}):
         if encode_type.lower() == "querystring":
@@ -50,17 +285,40 @@ class BaseRequest:
             return kw_dict
 
         elif encode_type.lower() == "json":
-            kw_dict = {"auth": self.credentials, "json": data}
+            # str or bytes bodies are already serialized, e.g. straight from
+            # a DataFrame.
+            if not isinstance(data, (str, bytes)):
+                data = self.json_backend.dumps(data)
+            headers = {"Content-Type": "application/json"}
+            if self.compression and len(data) >= self.compression_threshold:
+                data = self._compress(data)
+                headers["Content-Encoding"] = self.compression
+            kw_dict = {"auth": self.credentials, "data": data, "headers": headers}
             return kw_dict
 
         else:
             raise ValueError(f"({encode_type}) is not valid!")
 
+    def _compress(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        if self.compression == "gzip":
+            return gzip.compress(data, compresslevel=6)
+
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "zstd compression requires zstandard. "
+                "Install it with `pip install eco-connect[zstd]`."
+            )
+        return zstandard.ZstdCompressor().compress(data)
+
     def _format_response(
         self, response, parser=RequestParser.json_parser, parser_args={}
     ):
         if response.status_code == 200 or response.status_code == 201:
-            return parser(response, **parser_args)
+            return self._parse(response, parser, parser_args)
 
         elif response.status_code == 401:
             print(
@@ -77,6 +335,18 @@ class BaseRequest:
             except ValueError:
                 return response.text
 
+    def _parse(self, response, parser, parser_args):
+        # Responses kept for revalidation are parsed once per parser, every
+        # caller gets its own copy of the result.
+        parsed_results = getattr(response, "__dict__", {}).get("parsed_results")
+        if parsed_results is None:
+            return parser(response, **parser_args)
+        key = (parser, json.dumps(parser_args, sort_keys=True, default=str))
+        if key not in parsed_results:
+            parsed_results[key] = parser(response, **parser_args)
+        result = parsed_results[key]
+        return result if isinstance(result, str) else copy.deepcopy(result)
+
     def _get_parser(self, result_format, data_key="data"):
         parser = {"parser": None, "parser_args": {}}
         if result_format.lower() == "pandas":
@@ -91,10 +361,16 @@ class BaseRequest:
         elif result_format.lower() == "csv":
             parser["parser"] = RequestParser.csv_parser
             parser["parser_args"] = {"data_key": data_key}
+        elif result_format.lower() == "arrow":
+            parser["parser"] = RequestParser.arrow_parser
+            parser["parser_args"] = {"data_key": data_key}
+        elif result_format.lower() == "polars":
+            parser["parser"] = RequestParser.polars_parser
+            parser["parser_args"] = {"data_key": data_key}
         else:
             raise ValueError(
                 f"{result_format} is not valid!."
-                " Valid formats are (pandas, json, tuple, csv)"
+                " Valid formats are (pandas, json, tuple, csv, arrow, polars)"
             )
 
         return parser
@@ -4,3 +4,7 @@ class InvalidRequest(Exception):
 
 class RequestParserError(Exception):
     pass
+
+
+class RequestTimeout(Exception):
+    pass
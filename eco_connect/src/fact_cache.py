@@ -0,0 +1,330 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from eco_connect.src.lazy_module import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+
+class FactCache:
+    """A persistent, read-through cache of facts on local disk.
+
+    Facts are stored per `(building_id, eco_point_id)` as monthly `.npz`
+    partitions holding a `fact_time` and a `fact_value` column, and which
+    values were integers, so they are loaded with the types of the response.
+    Next to them, every distinct set of query filters of a building keeps a
+    record of the time ranges it has fetched and the points those requests
+    returned, so a repeat query only has to request the ranges that are
+    still missing.
+
+    A range is only marked as fetched up to `lag` before its end, or before
+    its latest sample if that is earlier (e.g. for a query ending in the
+    future). The trailing `lag` of a range is therefore fetched again by the
+    next query and picks up the samples that arrived in the meantime,
+    including those of points reporting up to `lag` later than others.
+    Samples arriving later than that are only fetched once the cache is
+    invalidated.
+
+        **Args**:
+           **path** (str): Directory the cache is stored in.
+
+        **Kwargs**:
+           **max_size** (int): Maximum size of the cached partitions in
+           bytes. Least recently used partitions are evicted first.
+
+           **lag** (str): How long samples may take to arrive after their
+           fact time.
+
+                *Default*: '1h'
+    """
+
+    TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+    def __init__(self, path, max_size=None, lag="1h"):
+        self.path = path
+        self.max_size = max_size
+        self.lag = pd.Timedelta(lag)
+        self._lock = threading.RLock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def missing(self, building_id, filters, start_date, end_date):
+        """Return the (start_date, end_date) windows of the requested range
+        that are not cached yet for these filters."""
+        start_date = pd.Timestamp(start_date)
+        end_date = pd.Timestamp(end_date)
+        with self._lock:
+            covered = self._read_query(building_id, filters)["covered"]
+
+        windows = []
+        window_start = start_date
+        start_covered = False
+        for covered_start, covered_end in self._parse_intervals(covered):
+            if covered_end < window_start:
+                continue
+            if covered_start > end_date:
+                break
+            if covered_start > window_start:
+                windows.append((window_start, covered_start))
+            window_start = max(window_start, covered_end)
+            start_covered = True
+        if window_start < end_date or not start_covered:
+            windows.append((window_start, end_date))
+
+        return [
+            (start.strftime(self.TIME_FORMAT), end.strftime(self.TIME_FORMAT))
+            for start, end in windows
+        ]
+
+    def store(self, building_id, filters, start_date, end_date, points):
+        """Store the `points` returned by a facts request for the
+        (start_date, end_date) window and mark the window as fetched up to
+        `lag` before its end or its latest sample."""
+        latest_fact_time = None
+        with self._lock:
+            query = self._read_query(building_id, filters)
+            for point in points.values():
+                eco_point_id = point["meta"]["eco_point_id"]
+                self._write_point(building_id, eco_point_id, point)
+                if eco_point_id not in query["eco_point_ids"]:
+                    query["eco_point_ids"].append(eco_point_id)
+                if point["data"]:
+                    point_latest = pd.to_datetime(list(point["data"].keys())).max()
+                    if latest_fact_time is None or point_latest > latest_fact_time:
+                        latest_fact_time = point_latest
+
+            if latest_fact_time is not None:
+                start_date = pd.Timestamp(start_date)
+                covered_end = min(pd.Timestamp(end_date), latest_fact_time) - self.lag
+                if covered_end >= start_date:
+                    query["covered"] = self._format_intervals(
+                        self._add_interval(
+                            self._parse_intervals(query["covered"]),
+                            (start_date, covered_end),
+                        )
+                    )
+            self._write_query(building_id, filters, query)
+            self._evict()
+
+    def load(self, building_id, filters, start_date, end_date):
+        """Return the cached points for these filters in the shape of the
+        `data` block of a facts response."""
+        start_date = pd.Timestamp(start_date)
+        end_date = pd.Timestamp(end_date)
+        points = {}
+        with self._lock:
+            query = self._read_query(building_id, filters)
+            for eco_point_id in query["eco_point_ids"]:
+                point = self._read_point(
+                    building_id, eco_point_id, start_date, end_date
+                )
+                if point is not None and point["data"]:
+                    points[str(eco_point_id)] = point
+        return points
+
+    def invalidate(self, building_id=None, eco_point_ids=None):
+        """Remove cached facts.
+
+        Without arguments the whole cache is cleared. With a `building_id`,
+        only that building is cleared, or only the given `eco_point_ids` of
+        it. Query records referencing removed points are dropped as well.
+        """
+        with self._lock:
+            if building_id is None:
+                for entry in os.listdir(self.path):
+                    shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
+            elif not eco_point_ids:
+                shutil.rmtree(self._building_path(building_id), ignore_errors=True)
+            else:
+                for eco_point_id in eco_point_ids:
+                    shutil.rmtree(
+                        self._point_path(building_id, eco_point_id), ignore_errors=True
+                    )
+                for query_file in self._query_files(building_id):
+                    with open(query_file) as f:
+                        query = json.load(f)
+                    if set(query["eco_point_ids"]) & set(eco_point_ids):
+                        os.remove(query_file)
+
+    def size(self):
+        """Return the size of the cached partitions in bytes."""
+        return sum(os.path.getsize(path) for path in self._partition_files())
+
+    def _building_path(self, building_id):
+        return os.path.join(self.path, str(building_id))
+
+    def _point_path(self, building_id, eco_point_id):
+        return os.path.join(
+            self._building_path(building_id), "points", str(eco_point_id)
+        )
+
+    def _query_path(self, building_id, filters):
+        key = json.dumps(filters, sort_keys=True, default=str).encode()
+        return os.path.join(
+            self._building_path(building_id),
+            "queries",
+            hashlib.sha1(key).hexdigest() + ".json",
+        )
+
+    def _query_files(self, building_id):
+        return glob.glob(
+            os.path.join(self._building_path(building_id), "queries", "*.json")
+        )
+
+    def _partition_files(self):
+        return glob.glob(os.path.join(self.path, "*", "points", "*", "*.npz"))
+
+    def _read_query(self, building_id, filters):
+        try:
+            with open(self._query_path(building_id, filters)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"eco_point_ids": [], "covered": []}
+
+    def _write_query(self, building_id, filters, query):
+        self._atomic_write(
+            self._query_path(building_id, filters),
+            lambda f: f.write(json.dumps(query).encode()),
+        )
+
+    def _write_point(self, building_id, eco_point_id, point):
+        point_path = self._point_path(building_id, eco_point_id)
+        self._atomic_write(
+            os.path.join(point_path, "meta.json"),
+            lambda f: f.write(json.dumps(point["meta"]).encode()),
+        )
+        if not point["data"]:
+            return
+
+        fact_times = np.array(list(point["data"].keys()))
+        fact_values = np.array(list(point["data"].values()), dtype=object)
+        months = pd.to_datetime(fact_times).values.astype("datetime64[M]")
+        for month in np.unique(months):
+            in_month = months == month
+            partition = os.path.join(point_path, f"{month}.npz")
+            merged = dict(zip(*self._read_partition(partition)))
+            merged.update(zip(fact_times[in_month], fact_values[in_month]))
+            merged_times = np.array(list(merged.keys()))
+            merged_values = list(merged.values())
+            # Values are stored as float64 with None as NaN, the ones that
+            # were integers are flagged to be loaded as integers again.
+            is_int = np.array([type(value) is int for value in merged_values])
+            merged_values = np.array(merged_values, dtype="float64")
+            order = np.argsort(pd.to_datetime(merged_times).values, kind="stable")
+            self._atomic_write(
+                partition,
+                lambda f: np.savez(
+                    f,
+                    fact_time=merged_times[order],
+                    fact_value=merged_values[order],
+                    is_int=is_int[order],
+                ),
+            )
+
+    def _read_point(self, building_id, eco_point_id, start_date, end_date):
+        point_path = self._point_path(building_id, eco_point_id)
+        try:
+            with open(os.path.join(point_path, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        data = {}
+        first_month = start_date.to_datetime64().astype("datetime64[M]")
+        last_month = end_date.to_datetime64().astype("datetime64[M]")
+        for month in np.arange(first_month, last_month + 1):
+            partition = os.path.join(point_path, f"{month}.npz")
+            if not os.path.exists(partition):
+                continue
+            fact_times, fact_values = self._read_partition(partition)
+            timestamps = pd.to_datetime(fact_times)
+            in_range = (timestamps >= start_date) & (timestamps <= end_date)
+            data.update(zip(fact_times[in_range].tolist(), fact_values[in_range]))
+            os.utime(partition)
+        return {"data": data, "meta": meta}
+
+    def _read_partition(self, partition):
+        """Return the fact times and the values of a partition, the values
+        as an object array of floats, integers and None."""
+        try:
+            with np.load(partition) as npz:
+                fact_times = npz["fact_time"]
+                fact_values = npz["fact_value"]
+                is_int = npz["is_int"] if "is_int" in npz.files else None
+        except (OSError, ValueError, KeyError):
+            return np.array([]), np.array([], dtype=object)
+
+        values = np.array(fact_values.tolist(), dtype=object)
+        values[np.isnan(fact_values)] = None
+        if is_int is not None:
+            values[is_int] = fact_values[is_int].astype("int64").tolist()
+        return fact_times, values
+
+    def _evict(self):
+        if self.max_size is None:
+            return
+
+        partitions = sorted(self._partition_files(), key=os.path.getmtime)
+        total_size = sum(os.path.getsize(path) for path in partitions)
+        for partition in partitions:
+            if total_size <= self.max_size:
+                break
+            total_size -= os.path.getsize(partition)
+            os.remove(partition)
+            self._uncover_partition(partition)
+
+    def _uncover_partition(self, partition):
+        point_path, file_name = os.path.split(partition)
+        eco_point_id = os.path.basename(point_path)
+        building_path = os.path.dirname(os.path.dirname(point_path))
+        month_start = pd.Timestamp(file_name[: -len(".npz")])
+        month_end = month_start + pd.offsets.MonthBegin(1)
+        before_month = month_start - pd.Timedelta(seconds=1)
+
+        for query_file in glob.glob(os.path.join(building_path, "queries", "*.json")):
+            with open(query_file) as f:
+                query = json.load(f)
+            if eco_point_id not in map(str, query["eco_point_ids"]):
+                continue
+            covered = []
+            for covered_start, covered_end in self._parse_intervals(query["covered"]):
+                if covered_start <= before_month:
+                    covered.append((covered_start, min(covered_end, before_month)))
+                if covered_end >= month_end:
+                    covered.append((max(covered_start, month_end), covered_end))
+            query["covered"] = self._format_intervals(covered)
+            self._atomic_write(
+                query_file, lambda f: f.write(json.dumps(query).encode())
+            )
+
+    def _atomic_write(self, path, write):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _parse_intervals(self, intervals):
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in intervals]
+
+    def _format_intervals(self, intervals):
+        return [[str(start), str(end)] for start, end in intervals]
+
+    def _add_interval(self, intervals, interval):
+        merged = []
+        for start, end in sorted(intervals + [interval]):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
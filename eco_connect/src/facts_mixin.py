@@ -0,0 +1,673 @@
+from collections import namedtuple
+from itertools import repeat
+from operator import attrgetter
+
+from eco_connect.src.json_response import JsonResponse
+from eco_connect.src.lazy_module import LazyModule
+from eco_connect.src.rate_limiter import RateLimiter
+from eco_connect.src.request_parser import (
+    RequestParser,
+    import_polars,
+    import_pyarrow,
+)
+from eco_connect.src.retry import RetryPolicy
+from eco_connect.src.errors import InvalidRequest, RequestParserError
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+
+class FactsMixin:
+    """The configuration, parsers and payload builders shared by
+    `FactsService` and `AsyncFactsService`, to be combined with
+    `BaseRequest` or `AsyncBaseRequest`.
+
+    Only the common kwargs are handled here, the remaining `request_kwargs`
+    are passed on to the request class.
+    """
+
+    # Meta columns of fact results that are emitted as pandas Categoricals
+    # once a result has at least `categorical_threshold` rows.
+    categorical_columns = (
+        "display_name",
+        "native_name",
+        "point_class",
+        "equipment",
+        "equipment_name",
+        "equipment_type",
+    )
+    categorical_threshold = 100000
+
+    # Default connect and read timeout of each request, and seconds a whole
+    # operation may take, see the `timeout` and `deadline` kwargs.
+    timeout = (10, 300)
+    deadline = None
+
+    # Default client-side limits per environment, see the `rate_limits` kwarg.
+    rate_limits = {"prod": {}, "qa": {}, "dev": {}}
+
+    def __init__(
+        self,
+        environment_name="prod",
+        version="v1",
+        pool_connections=10,
+        pool_maxsize=10,
+        keep_alive=True,
+        json_backend=None,
+        retry=None,
+        rate_limits=None,
+        compression=None,
+        compression_threshold=1024,
+        timeout=None,
+        deadline=None,
+        **request_kwargs,
+    ):
+        self.env = self._validate_env(environment_name=environment_name)
+        if environment_name == "dev":
+            self.hostname = "http://127.0.0.1:5000/api/v1/"
+        else:
+            self.hostname = f"https://facts.{self.env}.ecorithm.com/api/{version}/"
+        if retry is None:
+            # The API only uses POST for fact queries, which are safe to repeat.
+            retry = RetryPolicy(methods=("GET", "POST", "PUT", "DELETE"))
+        env_rate_limits = {
+            **self.rate_limits.get(self.env, {}),
+            **(rate_limits or {}).get(self.env, {}),
+        }
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            json_backend=json_backend,
+            retry=retry,
+            rate_limiter=RateLimiter(**env_rate_limits),
+            compression=compression,
+            compression_threshold=compression_threshold,
+            timeout=timeout if timeout is not None else self.timeout,
+            deadline=deadline if deadline is not None else self.deadline,
+            **request_kwargs,
+        )
+
+    def _concat_building_facts(self, results):
+        frames = []
+        for building_id, result in results.items():
+            if not isinstance(result, pd.DataFrame):
+                message = result.get("message") if isinstance(result, dict) else None
+                if isinstance(message, dict) and "NoData" in message:
+                    continue
+                raise InvalidRequest(result)
+            result.insert(0, "building_id", building_id)
+            frames.append(result)
+        if not frames:
+            return pd.DataFrame(columns=["building_id", "fact_time", "fact_value"])
+
+        merged = pd.concat(frames, ignore_index=True)
+        # concat falls back to plain values for Categoricals whose categories
+        # differ, which they do between buildings.
+        for name in merged.columns:
+            dtypes = [frame[name].dtype for frame in frames if name in frame]
+            if len(dtypes) == len(frames) and all(
+                isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes
+            ):
+                merged[name] = pd.api.types.union_categoricals(
+                    [frame[name] for frame in frames]
+                )
+        return merged
+
+    def _split_date_range(self, start_date, end_date, chunk_size):
+        start_date = pd.Timestamp(start_date)
+        end_date = pd.Timestamp(end_date)
+        chunk_size = pd.Timedelta(chunk_size)
+        if chunk_size <= pd.Timedelta(0):
+            raise ValueError(f"chunk_size ({chunk_size}) must be positive!")
+
+        windows = []
+        window_start = start_date
+        while True:
+            window_end = min(window_start + chunk_size, end_date)
+            windows.append(
+                (
+                    window_start.strftime("%Y-%m-%d %H:%M"),
+                    window_end.strftime("%Y-%m-%d %H:%M"),
+                )
+            )
+            if window_end >= end_date:
+                return windows
+            window_start = window_end
+
+    def _merge_fact_responses(self, responses, data_key="data"):
+        """Merge per-window fact responses into a single response.
+
+        Windows are merged in order, so each point keeps its samples sorted by
+        time and a sample on a window boundary is kept once. Windows without
+        data are skipped; any other error response is returned as is.
+        """
+        merged = {}
+        no_data_response = None
+        for response in responses:
+            if response.status_code not in (200, 201):
+                if not self._is_no_data(response):
+                    return response
+                no_data_response = no_data_response or response
+                continue
+
+            for point_id, point in response.json()[data_key].items():
+                if point_id in merged:
+                    merged[point_id]["data"].update(point["data"])
+                else:
+                    merged[point_id] = point
+
+        if not merged and no_data_response is not None:
+            return no_data_response
+        return JsonResponse({data_key: merged})
+
+    def _is_no_data(self, response):
+        try:
+            message = response.json().get("message", {})
+        except (ValueError, AttributeError):
+            return False
+        return isinstance(message, dict) and "NoData" in message
+
+    def _get_fact_parser(self, result_format, categorical=None, meta_columns=[]):
+        parser = {"parser": None, "parser_args": {"data_key": "data"}}
+        if result_format.lower() == "pandas":
+            parser["parser"] = self._pandas_fact_parser
+            if categorical is not None:
+                parser["parser_args"]["categorical"] = categorical
+        elif result_format.lower() == "wide":
+            parser["parser"] = self._wide_fact_parser
+            parser["parser_args"]["meta_columns"] = meta_columns
+        elif result_format.lower() == "json":
+            parser["parser"] = RequestParser.json_parser
+            parser["parser_args"] = {}
+        elif result_format.lower() == "tuple":
+            parser["parser"] = self._tuple_fact_parser
+        elif result_format.lower() == "csv":
+            parser["parser"] = self._csv_fact_parser
+        elif result_format.lower() == "numpy":
+            parser["parser"] = self._numpy_fact_parser
+        elif result_format.lower() == "arrow":
+            parser["parser"] = self._arrow_fact_parser
+        elif result_format.lower() == "polars":
+            parser["parser"] = self._polars_fact_parser
+        else:
+            raise ValueError(f"{result_format} is not valid!")
+
+        return parser
+
+    def _tuple_fact_parser(self, response, data_key="data"):
+        try:
+            result = response.json()
+        except (ValueError):
+            raise RequestParserError("Unable to parse the response.", response.text)
+
+        result = result[data_key]
+
+        tuple_names = ["fact_time", "fact_value"] + list(
+            list(result.values())[0]["meta"].keys()
+        )
+
+        response_tuple = namedtuple("response_tuple", tuple_names)
+        parsed_result = []
+        for dpoint_id, data in result.items():
+            meta = data["meta"]
+            fact_data = data["data"]
+            for fact_time, fact_value in fact_data.items():
+                row = {"fact_time": fact_time, "fact_value": fact_value}
+                row.update(meta)
+                parsed_result.append(response_tuple(**row))
+        return sorted(parsed_result, key=attrgetter("eco_point_id"))
+
+    def _columnar_fact_parser(self, response, data_key="data", categorical=False):
+        """Return the facts as a dict of columns.
+
+        Columns are built per point straight from its `data` / `meta` blocks,
+        in the same column and row order as `_tuple_fact_parser`. With
+        `categorical`, the `categorical_columns` meta columns are returned as
+        pandas Categoricals whose codes are computed once per point. When
+        `categorical` is None, they are only categorical for results of at
+        least `categorical_threshold` rows.
+        """
+        try:
+            result = response.json()
+        except (ValueError):
+            raise RequestParserError("Unable to parse the response.", response.text)
+
+        result = result[data_key]
+
+        points = sorted(
+            result.values(), key=lambda point: point["meta"]["eco_point_id"]
+        )
+        if categorical is None:
+            categorical = (
+                sum(len(point["data"]) for point in points)
+                >= self.categorical_threshold
+            )
+
+        meta_names = list(list(result.values())[0]["meta"].keys())
+        categorical_names = [
+            name
+            for name in meta_names
+            if categorical and name in self.categorical_columns
+        ]
+        columns = {"fact_time": [], "fact_value": []}
+        columns.update({name: [] for name in meta_names})
+
+        point_sizes = []
+        for point in points:
+            meta = point["meta"]
+            fact_data = point["data"]
+            point_sizes.append(len(fact_data))
+            columns["fact_time"].extend(fact_data.keys())
+            columns["fact_value"].extend(fact_data.values())
+            for name in meta_names:
+                if name in categorical_names:
+                    columns[name].append(meta[name])
+                else:
+                    columns[name].extend(repeat(meta[name], len(fact_data)))
+
+        for name in categorical_names:
+            point_values = pd.Categorical(columns[name])
+            columns[name] = pd.Categorical.from_codes(
+                np.repeat(point_values.codes, point_sizes), dtype=point_values.dtype
+            )
+        return columns
+
+    def _pandas_fact_parser(self, response, data_key="data", categorical=None):
+        columns = self._columnar_fact_parser(response, data_key, categorical)
+        return pd.DataFrame(columns)
+
+    def _numpy_fact_parser(self, response, data_key="data"):
+        """Return the facts as a `(facts, meta)` pair of structured arrays.
+
+        `facts` holds a `fact_time` (datetime64[s]), `fact_value` (float64)
+        and `eco_point_id` (int32) row per sample, in the row order of
+        `_tuple_fact_parser`. `meta` holds one row per point, sorted by
+        `eco_point_id`, with its meta information.
+        """
+        try:
+            result = response.json()
+        except (ValueError):
+            raise RequestParserError("Unable to parse the response.", response.text)
+
+        points = sorted(
+            result[data_key].values(), key=lambda point: point["meta"]["eco_point_id"]
+        )
+        point_sizes = [len(point["data"]) for point in points]
+        facts = np.empty(
+            sum(point_sizes),
+            dtype=[
+                ("fact_time", "datetime64[s]"),
+                ("fact_value", "float64"),
+                ("eco_point_id", "int32"),
+            ],
+        )
+        # Points mostly share their fact times, only convert each one once.
+        known_fact_times = {}
+        fact_time_codes = []
+        fact_values = []
+        for point in points:
+            fact_data = point["data"]
+            fact_time_codes.extend(
+                known_fact_times.setdefault(fact_time, len(known_fact_times))
+                for fact_time in fact_data
+            )
+            fact_values.extend(fact_data.values())
+        fact_times = np.array(list(known_fact_times), dtype="datetime64[s]")
+        facts["fact_time"] = fact_times[np.array(fact_time_codes, dtype="intp")]
+        facts["fact_value"] = np.array(fact_values, dtype="float64")
+
+        meta_names = [
+            name
+            for name in (points[0]["meta"] if points else {})
+            if name != "eco_point_id"
+        ]
+        meta = np.empty(
+            len(points),
+            dtype=[("eco_point_id", "int32")] + [(name, "O") for name in meta_names],
+        )
+        meta["eco_point_id"] = [point["meta"]["eco_point_id"] for point in points]
+        for name in meta_names:
+            meta[name] = [point["meta"][name] for point in points]
+        facts["eco_point_id"] = np.repeat(meta["eco_point_id"], point_sizes)
+        return facts, meta
+
+    def _arrow_fact_parser(self, response, data_key="data"):
+        """Return the facts as a `pyarrow.Table` with the rows of
+        `_pandas_fact_parser`. `fact_time` is a timestamp column, followed by
+        `fact_value`, `eco_point_id` and the other meta columns, which are
+        dictionary-encoded with one dictionary entry per distinct value."""
+        pa = import_pyarrow()
+        facts, meta = self._numpy_fact_parser(response, data_key)
+        # Row of `meta` each fact belongs to, both are sorted by eco_point_id.
+        point_index = np.searchsorted(meta["eco_point_id"], facts["eco_point_id"])
+
+        columns = {
+            "fact_time": pa.array(np.ascontiguousarray(facts["fact_time"])),
+            "fact_value": pa.array(np.ascontiguousarray(facts["fact_value"])),
+        }
+        for name in meta.dtype.names:
+            if name == "eco_point_id":
+                columns[name] = pa.array(np.ascontiguousarray(facts[name]))
+                continue
+            codes = {}
+            point_codes = np.array(
+                [
+                    -1 if value is None else codes.setdefault(value, len(codes))
+                    for value in meta[name]
+                ],
+                dtype="int32",
+            )
+            indices = point_codes[point_index]
+            columns[name] = pa.DictionaryArray.from_arrays(
+                pa.array(indices, mask=indices < 0), pa.array(list(codes))
+            )
+        return pa.table(columns)
+
+    def _polars_fact_parser(self, response, data_key="data"):
+        """Return the facts as a polars DataFrame with the columns of
+        `_arrow_fact_parser`: a Datetime `fact_time`, `fact_value`,
+        `eco_point_id` and the other meta columns, string ones as
+        Categoricals."""
+        pl = import_polars()
+        facts, meta = self._numpy_fact_parser(response, data_key)
+        # Row of `meta` each fact belongs to, both are sorted by eco_point_id.
+        point_index = np.searchsorted(meta["eco_point_id"], facts["eco_point_id"])
+
+        columns = [
+            # polars has no second resolution.
+            pl.Series("fact_time", facts["fact_time"].astype("datetime64[ms]")),
+            pl.Series("fact_value", np.ascontiguousarray(facts["fact_value"])),
+        ]
+        for name in meta.dtype.names:
+            if name == "eco_point_id":
+                columns.append(pl.Series(name, np.ascontiguousarray(facts[name])))
+                continue
+            # Encode the values of each point once, then gather them per fact.
+            point_values = pl.Series(name, meta[name].tolist())
+            if point_values.dtype in (pl.Utf8, pl.Null):
+                point_values = point_values.cast(pl.Categorical)
+            columns.append(point_values.gather(point_index))
+        return pl.DataFrame(columns)
+
+    def _wide_fact_parser(self, response, data_key="data", meta_columns=[]):
+        """Return the facts as a DataFrame indexed by `fact_time` with one
+        column per `eco_point_id`, built straight from each point's `data`.
+
+        Each name in `meta_columns` adds a column level holding that meta
+        field of the point.
+        """
+        try:
+            result = response.json()
+        except (ValueError):
+            raise RequestParserError("Unable to parse the response.", response.text)
+
+        points = sorted(
+            result[data_key].values(), key=lambda point: point["meta"]["eco_point_id"]
+        )
+        result_df = pd.DataFrame(
+            {index: point["data"] for index, point in enumerate(points)},
+            columns=range(len(points)),
+            dtype="float64",
+        )
+        result_df.index = pd.to_datetime(result_df.index)
+        result_df = result_df.sort_index()
+        result_df.index.name = "fact_time"
+
+        level_names = ["eco_point_id"] + list(meta_columns)
+        labels = [
+            tuple(point["meta"][name] for name in level_names) for point in points
+        ]
+        if meta_columns:
+            result_df.columns = pd.MultiIndex.from_tuples(labels, names=level_names)
+        else:
+            result_df.columns = pd.Index(
+                [label[0] for label in labels], name=level_names[0]
+            )
+        return result_df
+
+    def _csv_fact_parser(self, response, data_key="data"):
+        result_df = self._pandas_fact_parser(response, data_key)
+        return result_df.to_csv()
+
+    def _serialize_facts(self, data):
+        """Serialize the first three columns of `data` to a JSON array of
+        records. The JSON backend encodes each column once and its items are
+        joined into the records, without a dict per row.
+
+        Values are sent round-trip exact and missing values as `null`.
+        Datetime columns are sent in the API's `%Y-%m-%d %H:%M` format, so
+        they must not have seconds.
+        """
+        name_1, name_2, name_3 = (
+            self.json_backend.dumps(str(name)).replace(b"%", b"%%")
+            for name in data.columns[:3]
+        )
+        record = b"{%s:%%s,%s:%%s,%s:%%s}" % (name_1, name_2, name_3)
+        columns = [
+            self.json_backend.dumps_items(self._get_fact_values(data[name]))
+            for name in data.columns[:3]
+        ]
+        return b"[%s]" % b",".join([record % values for values in zip(*columns)])
+
+    def _get_fact_values(self, column):
+        if pd.api.types.is_datetime64_any_dtype(column.dtype):
+            fact_times = column.dropna()
+            if (fact_times != fact_times.dt.floor("min")).any():
+                raise ValueError(
+                    f"{column.name} has times with seconds, which the API drops!"
+                )
+            column = column.dt.strftime("%Y-%m-%d %H:%M")
+        if column.isna().any():
+            column = column.astype(object).where(column.notna(), None)
+        return column.tolist()
+
+    def _get_batch_row_ranges(self, data, batch_size):
+        """Return the `(start, stop)` positions of the rows of each batch of
+        `batch_size` rows of `data`."""
+        if batch_size <= 0:
+            raise ValueError(f"batch_size ({batch_size}) must be positive!")
+        return [
+            (start, min(start + batch_size, len(data)))
+            for start in range(0, len(data), batch_size)
+        ]
+
+    def _merge_put_fact_responses(self, responses, row_ranges):
+        """Merge per-batch `put_facts` responses into a single response.
+
+        `records_stored` is summed, the process timestamps span every batch
+        and `field_errors` are combined. When batches fail, the result keeps
+        the merged `data` of the stored batches, has the status code of the
+        first failed response and lists every failed batch in `failed_batches` of
+        its `message`, with the `[start, stop)` positions of its rows in the
+        uploaded data, its status code and its error. Batches that raised
+        instead of returning a response are given as the exception, and
+        listed with a `None` status code and the exception as error.
+        """
+        merged = None
+        field_errors = []
+        failed_batches = []
+        for response, (start, stop) in zip(responses, row_ranges):
+            if isinstance(response, Exception):
+                failed_batches.append(
+                    {
+                        "rows": [start, stop],
+                        "status_code": None,
+                        "error": f"{type(response).__name__}: {response}",
+                    }
+                )
+                continue
+            if response.status_code not in (200, 201):
+                try:
+                    error = response.json()
+                except ValueError:
+                    error = response.text
+                failed_batches.append(
+                    {
+                        "rows": [start, stop],
+                        "status_code": response.status_code,
+                        "error": error,
+                    }
+                )
+                continue
+
+            result = response.json()
+            data = result["data"]
+            if merged is None:
+                merged = dict(data)
+            else:
+                merged["records_stored"] += data["records_stored"]
+                for key, pick in (
+                    ("min_process_timestamp", min),
+                    ("max_process_timestamp", max),
+                ):
+                    timestamps = [t for t in (merged[key], data[key]) if t is not None]
+                    merged[key] = pick(timestamps) if timestamps else None
+
+            message = result.get("message") or {}
+            for field_error in message.get("field_errors", []):
+                if field_error not in field_errors:
+                    field_errors.append(field_error)
+
+        result = {"data": merged}
+        if field_errors:
+            result["message"] = {"field_errors": field_errors}
+        if not failed_batches:
+            return JsonResponse(result, status_code=responses[0].status_code)
+
+        if merged is None:
+            result["data"] = {
+                "records_stored": 0,
+                "min_process_timestamp": None,
+                "max_process_timestamp": None,
+            }
+        result.setdefault("message", {})["failed_batches"] = failed_batches
+        status_code = next(
+            (
+                batch["status_code"]
+                for batch in failed_batches
+                if batch["status_code"] is not None
+            ),
+            None,
+        )
+        return JsonResponse(result, status_code=status_code)
+
+    def _to_records(self, data):
+        if data is None:
+            return []
+        return list(data.T.to_dict().values())
+
+    def _get_dqi_parser(self, result_format):
+        parser = {"parser": None, "parser_args": {"data_key": "data"}}
+        if result_format.lower() == "pandas":
+            parser["parser"] = self._pandas_dqi_parser
+        elif result_format.lower() == "json":
+            parser["parser"] = RequestParser.json_parser
+            parser["parser_args"] = {}
+        elif result_format.lower() == "tuple":
+            parser["parser"] = self._tuple_dqi_parser
+        elif result_format.lower() == "csv":
+            parser["parser"] = self._csv_dqi_parser
+        elif result_format.lower() == "numpy":
+            parser["parser"] = self._numpy_dqi_parser
+        elif result_format.lower() == "arrow":
+            parser["parser"] = self._arrow_dqi_parser
+        elif result_format.lower() == "polars":
+            parser["parser"] = self._polars_dqi_parser
+        else:
+            raise ValueError(f"{result_format} is not valid!")
+
+        return parser
+
+    def _tuple_dqi_parser(self, response, data_key="data"):
+        try:
+            result = response.json()
+        except (ValueError):
+            raise RequestParserError("Unable to parse the response.", response.text)
+
+        result = result[data_key]
+
+        tuple_names = ["aggregate", "timestamp", "dqi"]
+
+        response_tuple = namedtuple("response_tuple", tuple_names)
+        parsed_result = []
+        for aggregate, data in result.items():
+            for timestamp, dqi in data.items():
+                row = {"timestamp": timestamp, "dqi": dqi, "aggregate": aggregate}
+                parsed_result.append(response_tuple(**row))
+        return sorted(parsed_result, key=attrgetter("aggregate"))
+
+    def _pandas_dqi_parser(self, response, data_key="data"):
+        parsed_tuples = self._tuple_dqi_parser(response, data_key)
+        return pd.DataFrame(parsed_tuples)
+
+    def _numpy_dqi_parser(self, response, data_key="data"):
+        """Return the DQI as a `(dqi, aggregates)` pair.
+
+        `dqi` is a structured array with an `aggregate` (int32), `timestamp`
+        (datetime64[s]) and `dqi` (float64) row per value, in the row order
+        of `_tuple_dqi_parser`. `aggregate` indexes `aggregates`, the sorted
+        array of aggregate names.
+        """
+        try:
+            result = response.json()
+        except (ValueError):
+            raise RequestParserError("Unable to parse the response.", response.text)
+
+        result = result[data_key]
+        aggregates = sorted(result)
+        sizes = [len(result[aggregate]) for aggregate in aggregates]
+        dqi = np.empty(
+            sum(sizes),
+            dtype=[
+                ("aggregate", "int32"),
+                ("timestamp", "datetime64[s]"),
+                ("dqi", "float64"),
+            ],
+        )
+        dqi["aggregate"] = np.repeat(np.arange(len(aggregates)), sizes)
+        dqi["timestamp"] = np.array(
+            [timestamp for aggregate in aggregates for timestamp in result[aggregate]],
+            dtype="datetime64[s]",
+        )
+        dqi["dqi"] = np.array(
+            [value for aggregate in aggregates for value in result[aggregate].values()],
+            dtype="float64",
+        )
+        return dqi, np.array(aggregates, dtype="O")
+
+    def _arrow_dqi_parser(self, response, data_key="data"):
+        """Return the DQI as a `pyarrow.Table` with a dictionary-encoded
+        `aggregate`, a `timestamp` and a `dqi` column."""
+        pa = import_pyarrow()
+        dqi, aggregates = self._numpy_dqi_parser(response, data_key)
+        return pa.table(
+            {
+                "aggregate": pa.DictionaryArray.from_arrays(
+                    pa.array(np.ascontiguousarray(dqi["aggregate"])),
+                    pa.array(aggregates.tolist(), type=pa.string()),
+                ),
+                "timestamp": pa.array(np.ascontiguousarray(dqi["timestamp"])),
+                "dqi": pa.array(np.ascontiguousarray(dqi["dqi"])),
+            }
+        )
+
+    def _polars_dqi_parser(self, response, data_key="data"):
+        """Return the DQI as a polars DataFrame with a Categorical
+        `aggregate`, a Datetime `timestamp` and a `dqi` column."""
+        pl = import_polars()
+        dqi, aggregates = self._numpy_dqi_parser(response, data_key)
+        return pl.DataFrame(
+            [
+                pl.Series(
+                    "aggregate", aggregates.tolist(), dtype=pl.Categorical
+                ).gather(np.ascontiguousarray(dqi["aggregate"])),
+                # polars has no second resolution.
+                pl.Series("timestamp", dqi["timestamp"].astype("datetime64[ms]")),
+                pl.Series("dqi", np.ascontiguousarray(dqi["dqi"])),
+            ]
+        )
+
+    def _csv_dqi_parser(self, response, data_key="data"):
+        parsed_df = self._pandas_dqi_parser(response, data_key)
+        return parsed_df.to_csv(index=None)
@@ -0,0 +1,89 @@
+import importlib
+import json
+
+
+class JsonBackend:
+    """JSON decoder and encoder used for API responses and request bodies.
+
+    Uses the fastest of orjson, ujson and simdjson that is installed, and
+    falls back to the standard library otherwise.
+
+        **Kwargs**:
+           **name** (str): Force a backend. One of ('orjson', 'ujson',
+           'simdjson', 'json').
+
+                *Example*: 'orjson'
+    """
+
+    names = ("orjson", "ujson", "simdjson", "json")
+
+    def __init__(self, name=None):
+        if name is None:
+            for name in self.names:
+                try:
+                    self._load(name)
+                    break
+                except ImportError:
+                    continue
+        elif name in self.names:
+            self._load(name)
+        else:
+            raise ValueError(f"{name} is not a valid JSON backend!")
+        self.name = name
+
+    def decode(self, response):
+        """Decode the body of a `requests` or `httpx` response."""
+        return self.loads(response.content)
+
+    def dumps_items(self, values):
+        """Encode a list of scalars in one call and return the JSON of each
+        item, e.g. to assemble a body from columns without a dict per row.
+        """
+        if not len(values):
+            return []
+        # Every item is encoded on its own line, which is safe to split on
+        # as the newlines of strings are escaped.
+        encoded = self._dumps_lines(values)
+        start, stop, separator = self._lines_format
+        return encoded[start:stop].split(separator)
+
+    def _load(self, name):
+        module = importlib.import_module(name)
+        if name == "orjson":
+            self.loads = module.loads
+            self.dumps = lambda obj: module.dumps(
+                obj, option=module.OPT_SERIALIZE_NUMPY
+            )
+            self._dumps_lines = lambda obj: module.dumps(
+                obj, option=module.OPT_SERIALIZE_NUMPY | module.OPT_INDENT_2
+            )
+            self._lines_format = (4, -2, b",\n  ")
+        elif name == "ujson":
+            self.loads = module.loads
+            self.dumps = lambda obj: module.dumps(
+                obj, ensure_ascii=False, escape_forward_slashes=False
+            ).encode()
+            self._dumps_lines = lambda obj: module.dumps(
+                obj, ensure_ascii=False, escape_forward_slashes=False, indent=1
+            ).encode()
+            self._lines_format = (3, -2, b",\n ")
+        elif name == "simdjson":
+            # simdjson only decodes.
+            self.loads = module.loads
+            self.dumps = self._stdlib_dumps
+            self._dumps_lines = self._stdlib_dumps_lines
+            self._lines_format = (1, -1, b",\n")
+        else:
+            self.loads = json.loads
+            self.dumps = self._stdlib_dumps
+            self._dumps_lines = self._stdlib_dumps_lines
+            self._lines_format = (1, -1, b",\n")
+
+    def _stdlib_dumps(self, obj):
+        # Same settings requests uses for `json=` bodies.
+        return json.dumps(obj, allow_nan=False).encode()
+
+    def _stdlib_dumps_lines(self, obj):
+        # `indent` would switch to the pure Python encoder, a separator
+        # keeps the C one.
+        return json.dumps(obj, allow_nan=False, separators=(",\n", ":")).encode()
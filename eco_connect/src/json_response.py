@@ -0,0 +1,18 @@
+import json
+
+
+class JsonResponse:
+    """A minimal stand-in for `requests.Response` wrapping an already decoded
+    payload, so results assembled from several responses can go through the
+    regular parsers."""
+
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+    @property
+    def text(self):
+        return json.dumps(self.payload)
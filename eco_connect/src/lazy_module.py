@@ -0,0 +1,26 @@
+import importlib
+
+
+class LazyModule:
+    """A stand-in for a module that is only imported on first use.
+
+    Used for pandas and numpy, which take most of the import time of
+    `eco_connect` but are only needed for DataFrame inputs and results.
+
+        **Args**:
+           **name** (str): Name of the module to import.
+
+                *Example*: 'pandas'
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}'>"
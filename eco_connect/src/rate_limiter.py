@@ -0,0 +1,154 @@
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, only needed to share limits across processes.
+    fcntl = None
+
+
+class RateLimiter:
+    """A token bucket rate limiter with a cap on concurrent requests.
+
+    Without a `path`, the limits apply to the threads of the process using
+    the limiter. With a `path`, the bucket and the concurrency slots are kept
+    in lock files next to it, so every process on the host using the same
+    path shares them. Slots are held with `flock`, which the OS releases when
+    a process dies, so a crashed worker never leaks a slot.
+
+        **Kwargs**:
+           **rate** (float): Requests per second. None disables rate
+           limiting.
+
+                *Example*: 20
+
+           **burst** (int): Requests that can be made at once after an idle
+           period, i.e. the size of the bucket.
+
+                *Default*: max(1, rate)
+
+           **max_concurrency** (int): Maximum number of requests in flight.
+           None disables the cap.
+
+                *Example*: 8
+
+           **path** (str): Base path of the lock files shared across
+           processes. Requires a POSIX system.
+
+                *Example*: '/tmp/eco_connect-prod'
+    """
+
+    # Seconds between attempts to grab a shared concurrency slot.
+    poll_interval = 0.01
+
+    def __init__(self, rate=None, burst=None, max_concurrency=None, path=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate or 1)
+        self.max_concurrency = max_concurrency
+        self.path = path
+        if path is not None and fcntl is None:
+            raise ValueError("Sharing limits across processes requires flock!")
+        self._lock = threading.Lock()
+        self._semaphore = None
+        if max_concurrency and path is None:
+            self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._tokens = self.burst
+        self._updated = self._now()
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @property
+    def enabled(self):
+        return bool(self.rate or self.max_concurrency)
+
+    def acquire(self):
+        """Block until a request may be sent and return the slot to pass to
+        `release` once it is done."""
+        slot = self._acquire_slot()
+        try:
+            self._take_token()
+        except BaseException:
+            self.release(slot)
+            raise
+        return slot
+
+    def release(self, slot):
+        if self._semaphore is not None:
+            self._semaphore.release()
+        elif slot is not None:
+            fcntl.flock(slot, fcntl.LOCK_UN)
+            os.close(slot)
+
+    def _acquire_slot(self):
+        if not self.max_concurrency:
+            return None
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+            return None
+
+        while True:
+            for index in range(self.max_concurrency):
+                fd = os.open(f"{self.path}.{index}.lock", os.O_RDWR | os.O_CREAT, 0o666)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except BlockingIOError:
+                    os.close(fd)
+            time.sleep(self.poll_interval)
+
+    def _take_token(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                if self.path is None:
+                    wait = self._refill_and_take()
+                else:
+                    wait = self._take_shared_token()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def _refill_and_take(self):
+        """Take a token and return 0, or return the seconds until one is
+        available."""
+        now = self._now()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def _take_shared_token(self):
+        # Opened for every token like the slots: flock locks belong to the
+        # open file, which processes forked after the limiter was built would
+        # otherwise share, and so never exclude each other.
+        fd = os.open(f"{self.path}.bucket", os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            self._read_state(fd)
+            wait = self._refill_and_take()
+            self._write_state(fd)
+            return wait
+        finally:
+            # Closing the file releases the lock.
+            os.close(fd)
+
+    def _read_state(self, fd):
+        state = os.pread(fd, 16, 0)
+        if len(state) == 16:
+            self._tokens, self._updated = struct.unpack("dd", state)
+        else:
+            self._tokens, self._updated = self.burst, self._now()
+
+    def _write_state(self, fd):
+        os.pwrite(fd, struct.pack("dd", self._tokens, self._updated), 0)
+
+    def _now(self):
+        # Wall clock time when shared, monotonic clocks differ between
+        # processes.
+        return time.time() if self.path is not None else time.monotonic()
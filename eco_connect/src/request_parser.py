@@ -1,9 +1,37 @@
-import pandas as pd
 from collections import namedtuple
 from eco_connect.src.errors import RequestParserError
+from eco_connect.src.lazy_module import LazyModule
+
+pd = LazyModule("pandas")
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Arrow results require pyarrow. "
+            "Install it with `pip install eco-connect[arrow]`."
+        )
+    return pyarrow
+
+
+def import_polars():
+    try:
+        import polars
+    except ImportError:
+        raise ImportError(
+            "Polars results require polars >= 0.20 (Python >= 3.8). "
+            "Install it with `pip install eco-connect[polars]`."
+        )
+    return polars
 
 
 class RequestParser:
+    # Columns of records returned as timestamps by `arrow_parser` and
+    # `polars_parser`.
+    timestamp_columns = ("last_updated",)
+
     @classmethod
     def json_parser(cls, response):
         try:
@@ -48,3 +76,61 @@ class RequestParser:
     def csv_parser(cls, response, data_key=None):
         result_df = cls.pandas_parser(response, data_key=data_key)
         return result_df.to_csv()
+
+    @classmethod
+    def arrow_parser(cls, response, data_key=None):
+        """Return the records of the response as a `pyarrow.Table`. String
+        columns are dictionary-encoded and `timestamp_columns` are parsed
+        into timestamps."""
+        pa = import_pyarrow()
+        table = pa.Table.from_pylist(cls._get_records(response, data_key))
+        columns = []
+        for name, column in zip(table.column_names, table.columns):
+            if pa.types.is_string(column.type) and name in cls.timestamp_columns:
+                try:
+                    column = column.cast(pa.timestamp("s", tz="UTC"))
+                except pa.ArrowInvalid:
+                    column = column.cast(pa.timestamp("s"))
+            elif pa.types.is_string(column.type):
+                column = column.dictionary_encode()
+            columns.append(column)
+        return pa.table(columns, names=table.column_names)
+
+    @classmethod
+    def polars_parser(cls, response, data_key=None):
+        """Return the records of the response as a polars DataFrame. String
+        columns are Categorical and `timestamp_columns` are parsed into
+        Datetimes."""
+        pl = import_polars()
+        result_df = pl.DataFrame(
+            cls._get_records(response, data_key), infer_schema_length=None
+        )
+        columns = []
+        for column in result_df.get_columns():
+            if column.dtype == pl.Utf8 and column.name in cls.timestamp_columns:
+                try:
+                    column = column.str.to_datetime(time_unit="ms")
+                except pl.exceptions.PolarsError:
+                    column = column.cast(pl.Categorical)
+            elif column.dtype == pl.Utf8:
+                column = column.cast(pl.Categorical)
+            columns.append(column)
+        return pl.DataFrame(columns)
+
+    @classmethod
+    def _get_records(cls, response, data_key=None):
+        try:
+            result = response.json()
+        except ValueError:
+            raise RequestParserError("Unable to parse the response.", response.text)
+
+        try:
+            if data_key:
+                result = result[data_key]
+        except KeyError:
+            raise RequestParserError("Unable to parse the response.", result)
+        if isinstance(result, dict):
+            result = [result]
+        if not isinstance(result, list):
+            raise RequestParserError("Unable to parse the response.")
+        return result
@@ -0,0 +1,100 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Requests failing with one of `statuses` or a connection error are retried
+    with exponential backoff and full jitter. A `Retry-After` header sent
+    with the response is honored instead of the backoff.
+
+        **Kwargs**:
+           **retries** (int): Maximum number of retries per request. 0
+           disables retrying.
+
+                *Default*: 3
+
+           **backoff_factor** (float): The n-th retry waits a random time
+           between 0 and `backoff_factor * 2 ** n` seconds.
+
+                *Default*: 0.5
+
+           **max_backoff** (float): Upper bound of a single backoff in
+           seconds.
+
+                *Default*: 30
+
+           **budget** (float): Maximum total seconds a request may spend
+           waiting between its attempts. A retry that would exceed it is not
+           made, e.g. for a long `Retry-After`.
+
+                *Default*: 120
+
+           **statuses** (tuple): Response status codes that are retried.
+
+                *Default*: (429, 502, 503, 504)
+
+           **methods** (tuple): HTTP methods that are idempotent and can be
+           retried safely.
+
+                *Default*: ('GET', 'PUT', 'DELETE')
+    """
+
+    def __init__(
+        self,
+        retries=3,
+        backoff_factor=0.5,
+        max_backoff=30,
+        budget=120,
+        statuses=(429, 502, 503, 504),
+        methods=("GET", "PUT", "DELETE"),
+    ):
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.statuses = tuple(statuses)
+        self.methods = tuple(method.upper() for method in methods)
+
+    def is_retryable(self, method, response=None):
+        """Whether a `method` request that ended with `response`, or with a
+        connection error when `response` is None, may be retried."""
+        if self.retries <= 0 or method.upper() not in self.methods:
+            return False
+        return response is None or response.status_code in self.statuses
+
+    def get_delay(self, attempt, waited, response=None):
+        """Return the seconds to wait before retrying a request for the
+        `attempt`-th time, or None when no retry is left.
+
+        `waited` is the time already spent waiting for this request.
+        """
+        if attempt >= self.retries:
+            return None
+
+        delay = self._get_retry_after(response)
+        if delay is None:
+            delay = random.uniform(
+                0, min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+            )
+        if waited + delay > self.budget:
+            return None
+        return delay
+
+    def _get_retry_after(self, response):
+        if response is None:
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
@@ -29,5 +29,14 @@ setup(
         "Documentation": "http://eco-connect.readthedocs.io/en/latest/",
         "Source Code": "https://github.com/ecorithm/eco_connect",
     },
-    extras_require={"docs": ["sphinx", "sphinx_rtd_theme"]},
+    extras_require={
+        "docs": ["sphinx", "sphinx_rtd_theme"],
+        "async": ["httpx"],
+        "fast-json": ["orjson"],
+        "stream": ["ijson"],
+        "zstd": ["zstandard"],
+        "arrow": ["pyarrow"],
+        # Series.gather needs polars >= 0.20, which needs Python >= 3.8.
+        "polars": ["polars>=0.20"],
+    },
 )
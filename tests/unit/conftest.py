@@ -0,0 +1,73 @@
+import hashlib
+import json
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+
+class FactsServer(ThreadingHTTPServer):
+    """A local stand-in for the facts service answering GET requests with
+    the JSON payload set for their path. Responses carry an `ETag` and a
+    `Last-Modified` header and conditional requests are answered with 304
+    while the payload is unchanged."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FactsRequestHandler)
+        self.payloads = {}
+        self.requests = []
+
+    @property
+    def hostname(self):
+        return f"http://127.0.0.1:{self.server_port}/api/v1/"
+
+    def set_payload(self, path, payload, last_modified=0):
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.payloads["/api/v1/" + path] = (
+            body,
+            etag,
+            formatdate(last_modified, usegmt=True),
+        )
+
+
+class FactsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        body, etag, last_modified = self.server.payloads[path]
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_none_match is not None:
+            not_modified = if_none_match == etag
+        else:
+            not_modified = if_modified_since == last_modified
+
+        status = 304 if not_modified else 200
+        self.server.requests.append((path, dict(self.headers), status))
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def facts_server():
+    server = FactsServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,160 @@
+import asyncio
+
+import httpx
+import pytest
+
+from eco_connect.src.async_base_request import AsyncBaseRequest
+from eco_connect.src.errors import RequestTimeout
+from eco_connect.src.retry import RetryPolicy
+
+
+class TestAsyncBaseRequest:
+    MODULE_PATH = "eco_connect.src.async_base_request"
+    CLASS_PATH = MODULE_PATH + ".AsyncBaseRequest"
+
+    @pytest.fixture
+    def base_request(self, mocker):
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        base_request = AsyncBaseRequest()
+        base_request.credentials = ("username", "password")
+        return base_request
+
+    def test__create_session(self, base_request):
+        assert isinstance(base_request.session, httpx.AsyncClient)
+
+    def test__create_session_missing_httpx(self, mocker, base_request):
+        mocker.patch.dict("sys.modules", {"httpx": None})
+        with pytest.raises(ImportError):
+            base_request._create_session()
+
+    def test__create_session_json_backend(self, mocker, base_request):
+        def handler(request):
+            return httpx.Response(200, content=b'{"data": [1, 2]}')
+
+        async def get():
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler),
+                event_hooks=base_request.session.event_hooks,
+            ) as client:
+                return await client.get("https://facts.prod.ecorithm.com/")
+
+        mock_decode = mocker.patch.object(
+            base_request.json_backend, "decode", return_value="decoded"
+        )
+        response = asyncio.run(get())
+        assert response.json() == "decoded"
+        mock_decode.assert_called_once_with(response)
+
+    def test_retry(self, mocker, base_request):
+        mock_sleep = mocker.patch(
+            "eco_connect.src.async_base_request.asyncio.sleep", mocker.AsyncMock()
+        )
+        mocker.patch("eco_connect.src.retry.random.uniform", return_value=0.25)
+        ok = mocker.Mock(status_code=200)
+        mock_request = mocker.patch.object(
+            base_request.session,
+            "request",
+            mocker.AsyncMock(side_effect=[httpx.ConnectError("reset"), ok]),
+        )
+
+        assert asyncio.run(base_request.get("mock-url")) == ok
+        assert mock_request.call_count == 2
+        mock_sleep.assert_called_once_with(0.25)
+        assert base_request.retry_stats["ConnectError"] == 1
+
+    def test_timeout(self, mocker, base_request):
+        base_request.timeout = (3, 10)
+        mock_request = mocker.patch.object(
+            base_request.session,
+            "request",
+            mocker.AsyncMock(return_value=mocker.Mock(status_code=200)),
+        )
+
+        asyncio.run(base_request.get("mock-url"))
+        assert mock_request.call_args[1]["timeout"] == httpx.Timeout(10, connect=3)
+
+    def test_timeout_exhausted(self, mocker, base_request):
+        base_request.retry = RetryPolicy(retries=0)
+        mocker.patch.object(
+            base_request.session,
+            "request",
+            mocker.AsyncMock(side_effect=httpx.ReadTimeout("slow")),
+        )
+
+        with pytest.raises(RequestTimeout):
+            asyncio.run(base_request.get("mock-url"))
+
+    def test_get(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
+        mock_request = mocker.patch.object(
+            base_request.session,
+            "request",
+            mocker.AsyncMock(return_value=mock_response),
+        )
+        data = {"param1": 1, "param2": None}
+
+        result = asyncio.run(base_request.get("mock-url", data))
+        mock_request.assert_called_once_with(
+            "GET", "mock-url", auth=("username", "password"), params={"param1": 1}
+        )
+        assert result == mock_response
+
+    def test_put(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
+        mock_request = mocker.patch.object(
+            base_request.session,
+            "request",
+            mocker.AsyncMock(return_value=mock_response),
+        )
+        data = [{"param1": 1}]
+
+        result = asyncio.run(base_request.put("mock-url", data, encode_type="json"))
+        mock_request.assert_called_once_with(
+            "PUT",
+            "mock-url",
+            auth=("username", "password"),
+            headers={"Content-Type": "application/json"},
+            content=base_request.json_backend.dumps(data),
+        )
+        assert result == mock_response
+
+    def test_post(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
+        mock_request = mocker.patch.object(
+            base_request.session,
+            "request",
+            mocker.AsyncMock(return_value=mock_response),
+        )
+        data = {"param1": [1, 2], "param2": None}
+
+        result = asyncio.run(base_request.post("mock-url", data))
+        mock_request.assert_called_once_with(
+            "POST", "mock-url", auth=("username", "password"), data={"param1": [1, 2]}
+        )
+        assert result == mock_response
+
+    def test_delete(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
+        mock_request = mocker.patch.object(
+            base_request.session,
+            "request",
+            mocker.AsyncMock(return_value=mock_response),
+        )
+        data = {"param1": 1}
+
+        result = asyncio.run(base_request.delete("mock-url", data))
+        mock_request.assert_called_once_with(
+            "DELETE", "mock-url", auth=("username", "password"), data=data
+        )
+        assert result == mock_response
+
+    def test_context_manager(self, mocker, base_request):
+        mock_close = mocker.patch.object(base_request.session, "aclose")
+
+        async def run():
+            async with base_request as br:
+                assert br is base_request
+                mock_close.assert_not_called()
+
+        asyncio.run(run())
+        mock_close.assert_called_once()
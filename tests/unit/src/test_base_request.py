@@ -1,9 +1,14 @@
+import gzip
+import json
+
 import pytest
+import requests
 import tempfile
 
 from eco_connect.src.base_request import BaseRequest
-from eco_connect.src.errors import InvalidRequest
+from eco_connect.src.errors import InvalidRequest, RequestTimeout
 from eco_connect.src.request_parser import RequestParser
+from eco_connect.src.retry import RetryPolicy
 
 
 class TestBaseRequest:
@@ -18,10 +23,11 @@ class TestBaseRequest:
         return base_request
 
     def test_get(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
         mock_format_kwargs = mocker.patch(self.CLASS_PATH + "._format_kwargs")
         mock_format_kwargs.return_value = {"arg1": 1, "arg2": 2}
-        mock_request_get = mocker.patch(
-            self.MODULE_PATH + ".requests.get", return_value="response"
+        mock_request_get = mocker.patch.object(
+            base_request.session, "get", return_value=mock_response
         )
 
         mock_url = "mock-get-url"
@@ -30,13 +36,14 @@ class TestBaseRequest:
         result = base_request.get(mock_url, data)
         mock_format_kwargs.assert_called_once_with(data=data, encode_type="querystring")
         mock_request_get.assert_called_once_with(mock_url, arg1=1, arg2=2)
-        assert result == "response"
+        assert result == mock_response
 
     def test_put(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
         mock_format_kwargs = mocker.patch(self.CLASS_PATH + "._format_kwargs")
         mock_format_kwargs.return_value = {"arg1": 1, "arg2": 2}
-        mock_request_put = mocker.patch(
-            self.MODULE_PATH + ".requests.put", return_value="response"
+        mock_request_put = mocker.patch.object(
+            base_request.session, "put", return_value=mock_response
         )
 
         mock_url = "mock-get-url"
@@ -45,13 +52,14 @@ class TestBaseRequest:
         result = base_request.put(url=mock_url, data=data, encode_type="querystring")
         mock_format_kwargs.assert_called_once_with(data=data, encode_type="querystring")
         mock_request_put.assert_called_once_with(mock_url, arg1=1, arg2=2)
-        assert result == "response"
+        assert result == mock_response
 
     def test_post(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
         mock_format_kwargs = mocker.patch(self.CLASS_PATH + "._format_kwargs")
         mock_format_kwargs.return_value = {"arg1": 1, "arg2": 2}
-        mock_request_post = mocker.patch(
-            self.MODULE_PATH + ".requests.post", return_value="response"
+        mock_request_post = mocker.patch.object(
+            base_request.session, "post", return_value=mock_response
         )
 
         mock_url = "mock-get-url"
@@ -62,13 +70,26 @@ class TestBaseRequest:
             data=data, files={}, encode_type="querystring"
         )
         mock_request_post.assert_called_once_with(mock_url, arg1=1, arg2=2)
-        assert result == "response"
+        assert result == mock_response
+
+    def test_post_stream(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
+        mock_format_kwargs = mocker.patch(self.CLASS_PATH + "._format_kwargs")
+        mock_format_kwargs.return_value = {"arg1": 1}
+        mock_request_post = mocker.patch.object(
+            base_request.session, "post", return_value=mock_response
+        )
+
+        result = base_request.post(url="mock-url", data={}, stream=True)
+        mock_request_post.assert_called_once_with("mock-url", arg1=1, stream=True)
+        assert result == mock_response
 
     def test_delete(self, mocker, base_request):
+        mock_response = mocker.Mock(status_code=200)
         mock_format_kwargs = mocker.patch(self.CLASS_PATH + "._format_kwargs")
         mock_format_kwargs.return_value = {"arg1": 1, "arg2": 2}
-        mock_request_delete = mocker.patch(
-            self.MODULE_PATH + ".requests.delete", return_value="response"
+        mock_request_delete = mocker.patch.object(
+            base_request.session, "delete", return_value=mock_response
         )
 
         mock_url = "mock-get-url"
@@ -77,7 +98,183 @@ class TestBaseRequest:
         result = base_request.delete(url=mock_url, data=data, encode_type="querystring")
         mock_format_kwargs.assert_called_once_with(data=data, encode_type="querystring")
         mock_request_delete.assert_called_once_with(mock_url, arg1=1, arg2=2)
-        assert result == "response"
+        assert result == mock_response
+
+    def test__create_session(self, base_request):
+        adapter = base_request.session.get_adapter("https://facts.prod.ecorithm.com")
+        assert adapter._pool_connections == 10
+        assert adapter._pool_maxsize == 10
+        assert base_request.session.headers["Connection"] == "keep-alive"
+
+    def test__create_session_json_backend(self, mocker, base_request):
+        response = requests.Response()
+        response._content = b'{"data": [1, 2]}'
+        mock_decode = mocker.patch.object(
+            base_request.json_backend, "decode", return_value="decoded"
+        )
+        for hook in base_request.session.hooks["response"]:
+            response = hook(response)
+        assert response.json() == "decoded"
+        mock_decode.assert_called_once_with(response)
+
+    def test_json_backend(self, mocker):
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        base_request = BaseRequest(json_backend="json")
+        assert base_request.json_backend.name == "json"
+
+    def test__create_session_pool_size(self, mocker):
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        base_request = BaseRequest(pool_connections=2, pool_maxsize=32)
+        adapter = base_request.session.get_adapter("http://127.0.0.1:5000")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 32
+
+    def test__create_session_no_keep_alive(self, mocker):
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        base_request = BaseRequest(keep_alive=False)
+        assert base_request.session.headers["Connection"] == "close"
+
+    def test_session_reused(self, mocker, base_request):
+        mock_request = mocker.patch.object(base_request.session, "request")
+        base_request.get("mock-url")
+        base_request.post("mock-url")
+        assert mock_request.call_count == 2
+
+    def test_close(self, mocker, base_request):
+        mock_close = mocker.patch.object(base_request.session, "close")
+        base_request.close()
+        mock_close.assert_called_once()
+
+    def test_context_manager(self, mocker, base_request):
+        mock_close = mocker.patch.object(base_request, "close")
+        with base_request as br:
+            assert br is base_request
+            mock_close.assert_not_called()
+        mock_close.assert_called_once()
+
+    def test_retry(self, mocker, base_request):
+        mock_sleep = mocker.patch(self.MODULE_PATH + ".time.sleep")
+        unavailable = mocker.Mock(status_code=503, headers={"Retry-After": "2"})
+        ok = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(
+            base_request.session, "get", side_effect=[unavailable, ok]
+        )
+
+        assert base_request.get("mock-url") == ok
+        assert mock_get.call_count == 2
+        mock_sleep.assert_called_once_with(2)
+        unavailable.close.assert_called_once_with()
+        assert base_request.retry_stats == {
+            "attempts": 2,
+            "retries": 1,
+            "status_503": 1,
+        }
+
+    def test_retry_exhausted(self, mocker, base_request):
+        mocker.patch(self.MODULE_PATH + ".time.sleep")
+        base_request.retry = RetryPolicy(retries=2)
+        unavailable = mocker.Mock(status_code=502, headers={})
+        mock_put = mocker.patch.object(
+            base_request.session, "put", return_value=unavailable
+        )
+
+        assert base_request.put("mock-url") == unavailable
+        assert mock_put.call_count == 3
+        assert base_request.retry_stats["exhausted"] == 1
+
+    def test_retry_connection_error(self, mocker, base_request):
+        mocker.patch(self.MODULE_PATH + ".time.sleep")
+        base_request.retry = RetryPolicy(retries=1)
+        mock_delete = mocker.patch.object(
+            base_request.session, "delete", side_effect=requests.ConnectionError
+        )
+
+        with pytest.raises(requests.ConnectionError):
+            base_request.delete("mock-url")
+        assert mock_delete.call_count == 2
+        assert base_request.retry_stats["ConnectionError"] == 1
+
+    def test_retry_not_idempotent(self, mocker, base_request):
+        mock_sleep = mocker.patch(self.MODULE_PATH + ".time.sleep")
+        unavailable = mocker.Mock(status_code=503, headers={})
+        mock_post = mocker.patch.object(
+            base_request.session, "post", return_value=unavailable
+        )
+
+        assert base_request.post("mock-url") == unavailable
+        assert mock_post.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_rate_limiter(self, mocker, base_request):
+        mock_acquire = mocker.patch.object(
+            base_request.rate_limiter, "acquire", return_value="slot"
+        )
+        mock_release = mocker.patch.object(base_request.rate_limiter, "release")
+        mock_get = mocker.patch.object(
+            base_request.session, "get", side_effect=requests.ConnectionError
+        )
+        base_request.retry = RetryPolicy(retries=0)
+
+        with pytest.raises(requests.ConnectionError):
+            base_request.get("mock-url")
+        mock_acquire.assert_called_once_with()
+        mock_get.assert_called_once()
+        mock_release.assert_called_once_with("slot")
+
+    def test_timeout(self, mocker, base_request):
+        base_request.timeout = (3, 10)
+        mock_get = mocker.patch.object(
+            base_request.session, "get", return_value=mocker.Mock(status_code=200)
+        )
+
+        base_request.get("mock-url")
+        assert mock_get.call_args[1]["timeout"] == (3, 10)
+
+    def test_timeout_exhausted(self, mocker, base_request):
+        mocker.patch(self.MODULE_PATH + ".time.sleep")
+        base_request.retry = RetryPolicy(retries=1)
+        mock_get = mocker.patch.object(
+            base_request.session, "get", side_effect=requests.ReadTimeout
+        )
+
+        with pytest.raises(RequestTimeout):
+            base_request.get("mock-url")
+        assert mock_get.call_count == 2
+
+    def test_time_limit(self, mocker, base_request):
+        mocker.patch(self.MODULE_PATH + ".time.monotonic", side_effect=[0, 1, 3])
+        mock_get = mocker.patch.object(
+            base_request.session, "get", return_value=mocker.Mock(status_code=200)
+        )
+
+        with base_request.time_limit(deadline=5, timeout=(3, 10)):
+            # Nested blocks keep the earliest deadline and the outer timeout.
+            with base_request.time_limit(deadline=60):
+                base_request.get("mock-url")
+        assert mock_get.call_args[1]["timeout"] == (2, 2)
+        assert base_request._time_limits.get() is None
+
+    def test_time_limit_exceeded(self, mocker, base_request):
+        mocker.patch(self.MODULE_PATH + ".time.monotonic", side_effect=[0, 6])
+        mock_get = mocker.patch.object(base_request.session, "get")
+
+        with pytest.raises(RequestTimeout):
+            with base_request.time_limit(deadline=5):
+                base_request.get("mock-url")
+        mock_get.assert_not_called()
+
+    def test_time_limit_stops_retries(self, mocker, base_request):
+        mock_sleep = mocker.patch(self.MODULE_PATH + ".time.sleep")
+        unavailable = mocker.Mock(status_code=503, headers={"Retry-After": "30"})
+        mock_get = mocker.patch.object(
+            base_request.session, "get", return_value=unavailable
+        )
+
+        with base_request.time_limit(deadline=10):
+            assert base_request.get("mock-url") == unavailable
+        assert mock_get.call_count == 1
+        mock_sleep.assert_not_called()
+        assert base_request.retry_stats["exhausted"] == 1
 
     def test__format_kwargs_querystring(self, mocker, base_request):
         mock_data = {"item1": 1, "item2": 2}
@@ -101,7 +298,49 @@ class TestBaseRequest:
         auth = ("username", "password")
         encode_type = "json"
         result = base_request._format_kwargs(mock_data, encode_type, files)
-        assert result == {"auth": auth, "json": mock_data}
+        assert result == {
+            "auth": auth,
+            "data": base_request.json_backend.dumps(mock_data),
+            "headers": {"Content-Type": "application/json"},
+        }
+        assert json.loads(result["data"]) == mock_data
+
+    def test__format_kwargs_json_serialized(self, mocker, base_request):
+        mock_data = b'[{"item1": 1}]'
+        auth = ("username", "password")
+        result = base_request._format_kwargs(mock_data, "json")
+        assert result == {
+            "auth": auth,
+            "data": mock_data,
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test__format_kwargs_json_compressed(self, mocker, base_request, compression):
+        if compression == "zstd":
+            zstandard = pytest.importorskip("zstandard")
+            decompress = zstandard.ZstdDecompressor().decompress
+        else:
+            decompress = gzip.decompress
+        base_request.compression = compression
+        base_request.compression_threshold = 10
+        mock_data = [{"item1": 1, "item2": 2}]
+
+        result = base_request._format_kwargs(mock_data, "json")
+        assert result["headers"] == {
+            "Content-Type": "application/json",
+            "Content-Encoding": compression,
+        }
+        assert json.loads(decompress(result["data"])) == mock_data
+
+        result = base_request._format_kwargs([], "json")
+        assert result["data"] == b"[]"
+        assert "Content-Encoding" not in result["headers"]
+
+    def test_compression_invalid(self, mocker):
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        with pytest.raises(ValueError):
+            BaseRequest(compression="brotli")
 
     def test__format_kwargs_file(self, mocker, base_request):
         mock_data = {"item1": 1, "item2": 2}
@@ -224,6 +463,6 @@ class TestBaseRequest:
         assert parser["parser_args"] == {}
 
     def test_get_parser_value_error(self, base_request):
-        result_format = "arrow"
+        result_format = "xml"
         with pytest.raises(ValueError):
             base_request._get_parser(result_format)
@@ -0,0 +1,198 @@
+import os
+
+import numpy as np
+import pytest
+
+from eco_connect.src.fact_cache import FactCache
+
+
+def make_point(eco_point_id, data):
+    return {
+        "data": data,
+        "meta": {"eco_point_id": eco_point_id, "point_class": "SpaceAirTemperature"},
+    }
+
+
+class TestFactCache:
+    FILTERS = {"point_classes": ["SpaceAirTemperature"], "eco_point_ids": []}
+
+    @pytest.fixture
+    def fact_cache(self, tmp_path):
+        return FactCache(str(tmp_path))
+
+    def test_missing_empty(self, fact_cache):
+        result = fact_cache.missing(1, self.FILTERS, "2017-12-01", "2017-12-10")
+        assert result == [("2017-12-01 00:00", "2017-12-10 00:00")]
+
+    def test_missing_single_instant(self, fact_cache):
+        result = fact_cache.missing(
+            1, self.FILTERS, "2017-12-01 00:00", "2017-12-01 00:00"
+        )
+        assert result == [("2017-12-01 00:00", "2017-12-01 00:00")]
+
+    def test_store_and_load(self, fact_cache):
+        points = {
+            "1": make_point(1, {"2017-11-30 23:55": 1, "2017-12-01 00:00": None}),
+            "2": make_point(2, {"2017-12-01 00:00": 3.5}),
+        }
+        fact_cache.store(
+            1, self.FILTERS, "2017-11-30 00:00", "2017-12-01 00:00", points
+        )
+
+        result = fact_cache.load(
+            1, self.FILTERS, "2017-11-30 00:00", "2017-12-01 00:00"
+        )
+        assert result == {
+            "1": make_point(1, {"2017-11-30 23:55": 1, "2017-12-01 00:00": None}),
+            "2": make_point(2, {"2017-12-01 00:00": 3.5}),
+        }
+        assert type(result["1"]["data"]["2017-11-30 23:55"]) is int
+        assert fact_cache.missing(
+            1, self.FILTERS, "2017-11-30 00:00", "2017-12-01 00:00"
+        ) == [("2017-11-30 23:00", "2017-12-01 00:00")]
+
+        result = fact_cache.load(
+            1, self.FILTERS, "2017-12-01 00:00", "2017-12-02 00:00"
+        )
+        assert list(result) == ["1", "2"]
+        assert result["1"]["data"] == {"2017-12-01 00:00": None}
+
+    def test_store_merges_samples(self, fact_cache):
+        fact_cache.store(
+            1,
+            self.FILTERS,
+            "2017-12-01 00:05",
+            "2017-12-01 00:10",
+            {"1": make_point(1, {"2017-12-01 00:10": 2, "2017-12-01 00:05": 1})},
+        )
+        fact_cache.store(
+            1,
+            self.FILTERS,
+            "2017-12-01 00:00",
+            "2017-12-01 00:05",
+            {"1": make_point(1, {"2017-12-01 00:00": 0.5, "2017-12-01 00:05": 1})},
+        )
+        result = fact_cache.load(1, self.FILTERS, "2017-12-01", "2017-12-02")
+        assert list(result["1"]["data"].items()) == [
+            ("2017-12-01 00:00", 0.5),
+            ("2017-12-01 00:05", 1),
+            ("2017-12-01 00:10", 2),
+        ]
+        assert [type(value) for value in result["1"]["data"].values()] == [
+            float,
+            int,
+            int,
+        ]
+
+    def test_missing_only_gaps(self, fact_cache):
+        fact_cache.store(
+            1,
+            self.FILTERS,
+            "2017-12-05 00:00",
+            "2017-12-10 00:00",
+            {"1": make_point(1, {"2017-12-05 00:00": 1, "2017-12-08 00:00": 2})},
+        )
+        result = fact_cache.missing(1, self.FILTERS, "2017-12-01", "2017-12-20")
+        assert result == [
+            ("2017-12-01 00:00", "2017-12-05 00:00"),
+            ("2017-12-07 23:00", "2017-12-20 00:00"),
+        ]
+        assert fact_cache.missing(
+            1, {"other": "filters"}, "2017-12-06", "2017-12-07"
+        ) == [("2017-12-06 00:00", "2017-12-07 00:00")]
+
+    def test_store_no_data_not_covered(self, fact_cache):
+        fact_cache.store(1, self.FILTERS, "2017-12-01", "2017-12-02", {})
+        assert fact_cache.missing(1, self.FILTERS, "2017-12-01", "2017-12-02") == [
+            ("2017-12-01 00:00", "2017-12-02 00:00")
+        ]
+
+    def test_store_covers_up_to_lag(self, tmp_path):
+        fact_cache = FactCache(str(tmp_path), lag="2h")
+        # Point 2 stopped reporting early, it does not hold back the others.
+        points = {
+            "1": make_point(1, {"2017-12-01 00:00": 1, "2017-12-01 10:00": 2}),
+            "2": make_point(2, {"2017-12-01 00:00": 3, "2017-12-01 01:00": 4}),
+            "3": make_point(3, {}),
+        }
+        fact_cache.store(1, self.FILTERS, "2017-12-01", "2017-12-02", points)
+        assert fact_cache.missing(1, self.FILTERS, "2017-12-01", "2017-12-02") == [
+            ("2017-12-01 08:00", "2017-12-02 00:00")
+        ]
+
+        fact_cache.store(1, self.FILTERS, "2017-11-01", "2017-11-02", points)
+        assert fact_cache.missing(1, self.FILTERS, "2017-11-01", "2017-11-02") == [
+            ("2017-11-01 22:00", "2017-11-02 00:00")
+        ]
+
+        # Windows shorter than the lag are not covered at all.
+        fact_cache.store(
+            1, self.FILTERS, "2017-12-01 09:00", "2017-12-01 10:00", points
+        )
+        assert fact_cache.missing(
+            1, self.FILTERS, "2017-12-01 08:00", "2017-12-01 10:00"
+        ) == [("2017-12-01 08:00", "2017-12-01 10:00")]
+
+    def test_load_legacy_partition(self, fact_cache):
+        point = {"1": make_point(1, {"2017-12-01 00:00": 1})}
+        fact_cache.store(1, self.FILTERS, "2017-12-01", "2017-12-02", point)
+        partition = fact_cache._point_path(1, 1) + "/2017-12.npz"
+        with np.load(partition) as npz:
+            fact_times = npz["fact_time"]
+        np.savez(partition, fact_time=fact_times, fact_value=np.array([1.0]))
+
+        result = fact_cache.load(1, self.FILTERS, "2017-12-01", "2017-12-02")
+        assert result["1"]["data"] == {"2017-12-01 00:00": 1.0}
+
+    def test_invalidate_points(self, fact_cache):
+        points = {
+            "1": make_point(1, {"2017-12-01 00:00": 1}),
+            "2": make_point(2, {"2017-12-01 00:00": 2}),
+        }
+        fact_cache.store(1, self.FILTERS, "2017-12-01", "2017-12-01", points)
+        fact_cache.store(
+            1, {"eco_point_ids": [2]}, "2017-12-01", "2017-12-01", {"2": points["2"]}
+        )
+
+        fact_cache.invalidate(1, eco_point_ids=[1])
+        assert fact_cache.load(1, self.FILTERS, "2017-12-01", "2017-12-01") == {}
+        assert fact_cache.missing(1, self.FILTERS, "2017-12-01", "2017-12-01") != []
+        assert list(
+            fact_cache.load(1, {"eco_point_ids": [2]}, "2017-12-01", "2017-12-01")
+        ) == ["2"]
+
+    def test_invalidate_building_and_all(self, fact_cache):
+        point = {"1": make_point(1, {"2017-12-01 00:00": 1})}
+        fact_cache.store(1, self.FILTERS, "2017-12-01", "2017-12-01", point)
+        fact_cache.store(2, self.FILTERS, "2017-12-01", "2017-12-01", point)
+
+        fact_cache.invalidate(1)
+        assert fact_cache.load(1, self.FILTERS, "2017-12-01", "2017-12-01") == {}
+        assert fact_cache.load(2, self.FILTERS, "2017-12-01", "2017-12-01") != {}
+
+        fact_cache.invalidate()
+        assert fact_cache.load(2, self.FILTERS, "2017-12-01", "2017-12-01") == {}
+        assert fact_cache.size() == 0
+
+    def test_eviction(self, tmp_path):
+        fact_cache = FactCache(str(tmp_path), lag="0min")
+        point = {"1": make_point(1, {"2017-10-01 00:00": 1})}
+        fact_cache.store(1, self.FILTERS, "2017-10-01", "2017-10-01", point)
+        partition_size = fact_cache.size()
+
+        fact_cache.max_size = partition_size * 2
+        os.utime(os.path.join(str(tmp_path), "1", "points", "1", "2017-10.npz"), (0, 0))
+        fact_cache.store(
+            1,
+            self.FILTERS,
+            "2017-11-01",
+            "2017-12-01",
+            {"1": make_point(1, {"2017-11-01 00:00": 2, "2017-12-01 00:00": 3})},
+        )
+
+        assert fact_cache.size() <= fact_cache.max_size
+        result = fact_cache.load(1, self.FILTERS, "2017-10-01", "2017-12-01")
+        assert result["1"]["data"] == {"2017-11-01 00:00": 2.0, "2017-12-01 00:00": 3.0}
+        assert fact_cache.missing(1, self.FILTERS, "2017-10-01", "2017-12-01") == [
+            ("2017-10-01 00:00", "2017-11-01 00:00")
+        ]
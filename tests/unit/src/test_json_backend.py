@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from eco_connect.src.json_backend import JsonBackend
+
+
+class TestJsonBackend:
+    @pytest.fixture(params=JsonBackend.names)
+    def json_backend(self, request):
+        pytest.importorskip(request.param)
+        return JsonBackend(request.param)
+
+    def test_default(self, mocker):
+        mocker.patch.dict("sys.modules", {"orjson": None})
+        json_backend = JsonBackend()
+        assert json_backend.name in JsonBackend.names[1:]
+
+    def test_stdlib_fallback(self, mocker):
+        mocker.patch.dict(
+            "sys.modules", {"orjson": None, "ujson": None, "simdjson": None}
+        )
+        assert JsonBackend().name == "json"
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            JsonBackend("invalid")
+
+    def test_missing(self, mocker):
+        mocker.patch.dict("sys.modules", {"orjson": None})
+        with pytest.raises(ImportError):
+            JsonBackend("orjson")
+
+    def test_decode(self, mocker, json_backend):
+        response = mocker.Mock(content='{"data": {"native_name": "a/b-é"}}'.encode())
+        assert json_backend.decode(response) == {"data": {"native_name": "a/b-é"}}
+
+    def test_decode_invalid(self, mocker, json_backend):
+        response = mocker.Mock(content=b"<html>Bad Gateway</html>")
+        with pytest.raises(ValueError):
+            json_backend.decode(response)
+
+    def test_dumps(self, json_backend):
+        data = [{"native_name": "a/b-é", "fact_value": 1.5, "eco_point_id": 1}]
+        result = json_backend.dumps(data)
+        assert isinstance(result, bytes)
+        assert json.loads(result) == data
+
+    def test_dumps_items(self, json_backend):
+        values = [1.5, 0.1 + 0.2, None, True, 'a,\n  "b"', "a/b-\u00e9", 2]
+        result = json_backend.dumps_items(values)
+        assert all(isinstance(item, bytes) for item in result)
+        assert [json.loads(item) for item in result] == values
+        assert json_backend.dumps_items([]) == []
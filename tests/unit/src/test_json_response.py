@@ -0,0 +1,13 @@
+from eco_connect.src.json_response import JsonResponse
+
+
+class TestJsonResponse:
+    def test_json(self):
+        response = JsonResponse({"data": [1, 2]})
+        assert response.status_code == 200
+        assert response.json() == {"data": [1, 2]}
+
+    def test_text(self):
+        response = JsonResponse({"message": "error"}, status_code=400)
+        assert response.status_code == 400
+        assert response.text == '{"message": "error"}'
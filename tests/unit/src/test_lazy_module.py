@@ -0,0 +1,20 @@
+import sys
+
+from eco_connect.src.lazy_module import LazyModule
+
+
+class TestLazyModule:
+    def test_getattr(self, mocker):
+        mock_import = mocker.patch(
+            "eco_connect.src.lazy_module.importlib.import_module",
+            return_value=sys.modules["json"],
+        )
+        json = LazyModule("json")
+        mock_import.assert_not_called()
+
+        assert json.dumps([1]) == "[1]"
+        assert json.loads("[1]") == [1]
+        mock_import.assert_called_once_with("json")
+
+    def test_repr(self):
+        assert repr(LazyModule("pandas")) == "<lazy module 'pandas'>"
@@ -0,0 +1,105 @@
+import os
+import select
+import threading
+
+import pytest
+
+from eco_connect.src.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    MODULE_PATH = "eco_connect.src.rate_limiter"
+
+    @pytest.fixture
+    def clock(self, mocker):
+        now = [1000.0]
+        mocker.patch(self.MODULE_PATH + ".time.time", side_effect=lambda: now[0])
+        mocker.patch(self.MODULE_PATH + ".time.monotonic", side_effect=lambda: now[0])
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        return mocker.patch(self.MODULE_PATH + ".time.sleep", side_effect=sleep)
+
+    def test_disabled(self):
+        rate_limiter = RateLimiter()
+        assert not rate_limiter.enabled
+        slot = rate_limiter.acquire()
+        assert slot is None
+        rate_limiter.release(slot)
+
+    def test_rate(self, clock):
+        rate_limiter = RateLimiter(rate=10, burst=2)
+        assert rate_limiter.enabled
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+        clock.assert_not_called()
+        rate_limiter.acquire()
+        clock.assert_called_once_with(pytest.approx(0.1))
+
+    def test_rate_shared(self, clock, tmp_path):
+        path = str(tmp_path / "eco_connect-prod")
+        RateLimiter(rate=4, burst=1, path=path).acquire()
+        clock.assert_not_called()
+        RateLimiter(rate=4, burst=1, path=path).acquire()
+        clock.assert_called_once_with(pytest.approx(0.25))
+
+    @pytest.mark.parametrize("shared", [False, True])
+    def test_max_concurrency(self, tmp_path, shared):
+        # The directory of the lock files is created when missing.
+        path = str(tmp_path / "locks" / "eco_connect-prod") if shared else None
+        rate_limiter = RateLimiter(max_concurrency=1, path=path)
+        other_limiter = RateLimiter(max_concurrency=1, path=path)
+        if not shared:
+            other_limiter = rate_limiter
+
+        slot = rate_limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            other_limiter.release(other_limiter.acquire())
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        assert not acquired.wait(0.1)
+        rate_limiter.release(slot)
+        assert acquired.wait(5)
+        thread.join()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_rate_shared_after_fork(self, tmp_path):
+        rate_limiter = RateLimiter(
+            rate=1000, burst=1000, path=str(tmp_path / "eco_connect-prod")
+        )
+        start_read, start_write = os.pipe()
+        done_read, done_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.read(start_read, 1)
+            rate_limiter.acquire()
+            os.write(done_write, b"x")
+            os._exit(0)
+
+        # Hold the bucket lock in the parent while the child takes a token.
+        refill_and_take = rate_limiter._refill_and_take
+        in_bucket = threading.Event()
+        leave_bucket = threading.Event()
+
+        def slow_refill_and_take():
+            in_bucket.set()
+            leave_bucket.wait(5)
+            return refill_and_take()
+
+        rate_limiter._refill_and_take = slow_refill_and_take
+        thread = threading.Thread(target=rate_limiter.acquire)
+        thread.start()
+        try:
+            assert in_bucket.wait(5)
+            os.write(start_write, b"x")
+            assert not select.select([done_read], [], [], 0.2)[0]
+        finally:
+            leave_bucket.set()
+            thread.join()
+        assert select.select([done_read], [], [], 5)[0]
+        os.waitpid(pid, 0)
@@ -115,3 +115,67 @@ class TestResultParser:
 
         RequestParser.csv_parser(mock_response, data_key=mock_data_key)
         pandas_parser.assert_called_once_with(mock_response, data_key="data")
+
+    def test_arrow_parser(self, mocker):
+        pa = pytest.importorskip("pyarrow")
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": [
+                {
+                    "eco_point_id": 1,
+                    "point_class": "SpaceAirTemperature",
+                    "last_updated": "2017-11-17T17:44:04Z",
+                },
+                {
+                    "eco_point_id": 2,
+                    "point_class": "SpaceAirTemperature",
+                    "last_updated": None,
+                },
+            ]
+        }
+        result = RequestParser.arrow_parser(mock_response, data_key="data")
+        assert result.column_names == ["eco_point_id", "point_class", "last_updated"]
+        assert result.schema.field("eco_point_id").type == pa.int64()
+        assert pa.types.is_dictionary(result.schema.field("point_class").type)
+        assert len(result["point_class"].combine_chunks().dictionary) == 1
+        assert result.schema.field("last_updated").type == pa.timestamp("s", tz="UTC")
+        assert result.to_pylist()[1] == {
+            "eco_point_id": 2,
+            "point_class": "SpaceAirTemperature",
+            "last_updated": None,
+        }
+
+    def test_arrow_parser_missing_pyarrow(self, mocker):
+        mocker.patch.dict("sys.modules", {"pyarrow": None})
+        with pytest.raises(ImportError):
+            RequestParser.arrow_parser(mocker.Mock())
+
+    def test_polars_parser(self, mocker):
+        pl = pytest.importorskip("polars")
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": [
+                {
+                    "eco_point_id": 1,
+                    "point_class": "SpaceAirTemperature",
+                    "last_updated": "2017-11-17T17:44:04Z",
+                },
+                {
+                    "eco_point_id": 2,
+                    "point_class": "SpaceAirTemperature",
+                    "last_updated": None,
+                },
+            ]
+        }
+        result = RequestParser.polars_parser(mock_response, data_key="data")
+        assert dict(result.schema) == {
+            "eco_point_id": pl.Int64,
+            "point_class": pl.Categorical,
+            "last_updated": pl.Datetime("ms", "UTC"),
+        }
+        assert result.row(1) == (2, "SpaceAirTemperature", None)
+
+    def test_polars_parser_missing_polars(self, mocker):
+        mocker.patch.dict("sys.modules", {"polars": None})
+        with pytest.raises(ImportError):
+            RequestParser.polars_parser(mocker.Mock())
@@ -0,0 +1,51 @@
+import pytest
+
+from eco_connect.src.retry import RetryPolicy
+
+
+class TestRetryPolicy:
+    def test_is_retryable(self, mocker):
+        retry = RetryPolicy()
+        assert retry.is_retryable("get")
+        assert retry.is_retryable("GET", mocker.Mock(status_code=503))
+        assert not retry.is_retryable("GET", mocker.Mock(status_code=500))
+        assert not retry.is_retryable("POST")
+
+    def test_is_retryable_disabled(self):
+        assert not RetryPolicy(retries=0).is_retryable("GET")
+
+    @pytest.mark.parametrize("attempt, max_delay", [(0, 0.5), (1, 1), (3, 4), (9, 30)])
+    def test_get_delay_backoff(self, mocker, attempt, max_delay):
+        mock_uniform = mocker.patch(
+            "eco_connect.src.retry.random.uniform", return_value=0.25
+        )
+        retry = RetryPolicy(retries=10)
+        assert retry.get_delay(attempt, 0) == 0.25
+        mock_uniform.assert_called_once_with(0, max_delay)
+
+    def test_get_delay_exhausted(self):
+        retry = RetryPolicy(retries=2)
+        assert retry.get_delay(1, 0) is not None
+        assert retry.get_delay(2, 0) is None
+
+    def test_get_delay_retry_after(self, mocker):
+        retry = RetryPolicy()
+        response = mocker.Mock(headers={"Retry-After": "7"})
+        assert retry.get_delay(0, 0, response) == 7
+
+    def test_get_delay_retry_after_date(self, mocker):
+        mocker.patch("eco_connect.src.retry.time.time", return_value=1500000000)
+        retry = RetryPolicy()
+        response = mocker.Mock(headers={"Retry-After": "Fri, 14 Jul 2017 02:40:10 GMT"})
+        assert retry.get_delay(0, 0, response) == 10
+
+    def test_get_delay_retry_after_invalid(self, mocker):
+        mocker.patch("eco_connect.src.retry.random.uniform", return_value=0.25)
+        retry = RetryPolicy()
+        response = mocker.Mock(headers={"Retry-After": "soon"})
+        assert retry.get_delay(0, 0, response) == 0.25
+
+    def test_get_delay_budget(self, mocker):
+        retry = RetryPolicy(budget=10)
+        assert retry.get_delay(0, 0, mocker.Mock(headers={"Retry-After": "10"})) == 10
+        assert retry.get_delay(0, 5, mocker.Mock(headers={"Retry-After": "6"})) is None
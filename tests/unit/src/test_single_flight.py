@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from eco_connect.src.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_do(self):
+        single_flight = SingleFlight()
+        assert single_flight.do(("a",), lambda x: x * 2, 2) == 4
+        assert single_flight.do(("a",), lambda x: x * 3, 2) == 6
+        assert len(single_flight) == 0
+
+    def test_do_concurrent(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(single_flight.do, ("a",), func)
+            started.wait(5)
+            followers = [
+                executor.submit(single_flight.do, ("a",), func) for _ in range(3)
+            ]
+            other = executor.submit(single_flight.do, ("b",), lambda: "other")
+            assert other.result(5) == "other"
+            release.set()
+            results = [leader.result(5)] + [future.result(5) for future in followers]
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert len(single_flight) == 0
+
+    def test_do_exception(self):
+        single_flight = SingleFlight()
+
+        def func():
+            raise KeyError("a")
+
+        with pytest.raises(KeyError):
+            single_flight.do(("a",), func)
+        assert len(single_flight) == 0
+        assert single_flight.do(("a",), lambda: 1) == 1
@@ -0,0 +1,53 @@
+from eco_connect.src.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_set(self):
+        cache = TTLCache()
+        cache.set(("a", 1), "value", ttl=60)
+        assert cache.get(("a", 1)) == "value"
+        assert cache.get(("a", 2)) is None
+        assert cache.get(("a", 2), "default") == "default"
+
+    def test_expired(self, mocker):
+        mock_time = mocker.patch("eco_connect.src.ttl_cache.time.monotonic")
+        mock_time.return_value = 100
+        cache = TTLCache()
+        cache.set(("a",), "value", ttl=10)
+        mock_time.return_value = 109
+        assert cache.get(("a",)) == "value"
+        mock_time.return_value = 110
+        assert cache.get(("a",)) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set(("a",), 1, ttl=60)
+        cache.set(("b",), 2, ttl=60)
+        cache.get(("a",))
+        cache.set(("c",), 3, ttl=60)
+        assert cache.get(("a",)) == 1
+        assert cache.get(("b",)) is None
+        assert cache.get(("c",)) == 3
+
+    def test_disabled(self):
+        cache = TTLCache(maxsize=0)
+        cache.set(("a",), 1, ttl=60)
+        assert cache.get(("a",)) is None
+        cache = TTLCache()
+        cache.set(("a",), 1, ttl=0)
+        assert cache.get(("a",)) is None
+
+    def test_invalidate(self):
+        cache = TTLCache()
+        cache.set(("equipment", "1", "url"), 1, ttl=60)
+        cache.set(("equipment", "2", "url"), 2, ttl=60)
+        cache.set(("point_mapping", "1", "url"), 3, ttl=60)
+        cache.invalidate("equipment", "1")
+        assert cache.get(("equipment", "1", "url")) is None
+        assert cache.get(("equipment", "2", "url")) == 2
+        cache.invalidate("equipment")
+        assert cache.get(("equipment", "2", "url")) is None
+        assert cache.get(("point_mapping", "1", "url")) == 3
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,260 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+import pandas as pd
+import requests
+
+from eco_connect import AsyncFactsService, FactsService
+from eco_connect.src.retry import RetryPolicy
+
+FACTS_RESPONSE = {
+    "data": {
+        "2": {
+            "data": {"2017-08-01 00:00": 0, "2017-08-01 00:05": 100},
+            "meta": {
+                "display_name": "Cooling",
+                "eco_point_id": 2,
+                "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.CV",
+                "equipment": "VAV_301",
+                "equipment_type": "VAV",
+                "point_class": "CoolingCoilUnitFeedback",
+            },
+        },
+        "1": {
+            "data": {"2017-08-01 00:00": 67.5, "2017-08-01 00:05": 68.5},
+            "meta": {
+                "display_name": "SpaceTemp",
+                "eco_point_id": 1,
+                "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.ZN-T",
+                "equipment": "VAV-301",
+                "equipment_type": "VAV",
+                "point_class": "SpaceAirTemperature",
+            },
+        },
+    }
+}
+
+
+class TestAsyncFactsService:
+    MODULE_PATH = "eco_connect.async_facts_service"
+    CLASS_PATH = MODULE_PATH + ".AsyncFactsService"
+
+    @pytest.fixture
+    def requests_seen(self):
+        return []
+
+    @pytest.fixture
+    def facts_service(self, mocker, requests_seen):
+        def handler(request):
+            requests_seen.append(request)
+            if request.method == "POST" and request.url.path.endswith("facts"):
+                return httpx.Response(200, json=FACTS_RESPONSE)
+            elif request.method == "PUT" and request.url.path.endswith("/facts"):
+                return httpx.Response(201, json={"data": {"records_stored": 1}})
+            elif request.url.path.endswith("/point-mapping"):
+                return httpx.Response(
+                    200, json={"data": [{"eco_point_id": 1, "point_class": "Temp"}]}
+                )
+            return httpx.Response(400, json={"message": "bad request"})
+
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        facts_service = AsyncFactsService()
+        facts_service.credentials = ("user", "password")
+        facts_service.session = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        return facts_service
+
+    def test__init__(self, mocker):
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        facts_service = AsyncFactsService(environment_name="qa")
+        assert facts_service.hostname == "https://facts.qa.ecorithm.com/api/v1/"
+        assert isinstance(facts_service.session, httpx.AsyncClient)
+
+    def test_get_facts_pandas(self, mocker, facts_service, requests_seen):
+        sync_service = FactsService()
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = FACTS_RESPONSE
+        expected_result = sync_service._pandas_fact_parser(mock_response)
+
+        result = asyncio.run(
+            facts_service.get_facts(
+                1, "2017-08-01 00:00", "2017-08-01 00:05", eco_point_ids=[1, 2]
+            )
+        )
+
+        pd.testing.assert_frame_equal(result, expected_result)
+        request = requests_seen[0]
+        assert request.method == "POST"
+        assert str(request.url) == (
+            "https://facts.prod.ecorithm.com/api/v1/building/1/facts"
+        )
+        body = parse_qs(request.content.decode())
+        assert body["start_date"] == ["2017-08-01 00:00"]
+        assert body["eco_point_ids"] == ["1", "2"]
+        assert request.headers["Authorization"].startswith("Basic ")
+
+    def test_get_facts_chunked(self, facts_service, requests_seen):
+        result = asyncio.run(
+            facts_service.get_facts(
+                1, "2017-08-01 00:00", "2017-08-03 00:00", chunk_size="1D"
+            )
+        )
+        assert len(requests_seen) == 2
+        windows = sorted(
+            parse_qs(request.content.decode())["start_date"][0]
+            for request in requests_seen
+        )
+        assert windows == ["2017-08-01 00:00", "2017-08-02 00:00"]
+        assert result["fact_value"].tolist() == [67.5, 68.5, 0, 100]
+
+    def test_get_facts_many(self, facts_service, requests_seen):
+        result = asyncio.run(
+            facts_service.get_facts_many(
+                [26, 27, 26], "2017-08-01 00:00", "2017-08-01 00:05", concat=True
+            )
+        )
+        assert len(requests_seen) == 2
+        assert result["building_id"].tolist() == [26] * 4 + [27] * 4
+        assert result["eco_point_id"].tolist() == [1, 1, 2, 2] * 2
+        with pytest.raises(ValueError):
+            asyncio.run(
+                facts_service.get_facts_many(
+                    [26], "2017-08-01", "2017-08-02", result_format="json", concat=True
+                )
+            )
+
+    def test_sync_only_features(self, mocker, facts_service, tmp_path):
+        assert not hasattr(facts_service, "iter_facts")
+        assert not hasattr(facts_service, "export_facts")
+        assert not hasattr(facts_service, "fact_cache")
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+        for kwargs in (
+            {"cache_dir": str(tmp_path / "cache")},
+            {"metadata_cache_size": 16},
+            {"metadata_ttl": {"buildings": 60}},
+        ):
+            with pytest.raises(TypeError):
+                AsyncFactsService(**kwargs)
+        assert not (tmp_path / "cache").exists()
+        with pytest.raises(TypeError):
+            with facts_service:
+                pass
+
+    def test_get_facts_invalid_format(self, facts_service):
+        with pytest.raises(ValueError):
+            asyncio.run(
+                facts_service.get_facts(
+                    1, "2017-08-01 00:00", "2017-08-01 00:05", result_format="xml"
+                )
+            )
+
+    def test_get_avg_facts_tuple(self, facts_service, requests_seen):
+        result = asyncio.run(
+            facts_service.get_avg_facts(
+                1, "2017-08-01 00:00", "2017-08-01 00:05", result_format="tuple"
+            )
+        )
+        assert [row.eco_point_id for row in result] == [1, 1, 2, 2]
+        assert requests_seen[0].url.path.endswith("/avg-facts")
+
+    def test_get_point_mapping_concurrent(self, facts_service, requests_seen):
+        async def run():
+            return await asyncio.gather(
+                *[
+                    facts_service.get_point_mapping(building_id, result_format="tuple")
+                    for building_id in range(5)
+                ]
+            )
+
+        results = asyncio.run(run())
+        assert len(results) == 5
+        assert all(result[0].eco_point_id == 1 for result in results)
+        params = requests_seen[0].url.params
+        assert params["is_active"] == "True"
+        assert "eco_point_id" not in params
+
+    def test_params_encoded_like_requests(self, facts_service, requests_seen):
+        url = facts_service.hostname + "buildings"
+        params = {
+            "building_id": None,
+            "is_active": False,
+            "eco_point_ids": [1, None, True],
+            "period": 1.5,
+        }
+        asyncio.run(facts_service.get(url, data=dict(params)))
+        asyncio.run(facts_service.delete(url, data=dict(params)))
+
+        expected_get = requests.Request("GET", url, params=params).prepare()
+        expected_delete = requests.Request("DELETE", url, data=params).prepare()
+        assert str(requests_seen[0].url) == expected_get.url
+        assert requests_seen[0].url.params["is_active"] == "False"
+        assert requests_seen[1].content.decode() == expected_delete.body
+
+    def test_put_facts(self, facts_service, requests_seen):
+        data = pd.DataFrame(
+            data=[["2017-12-20 00:00", 1, "native-name-1"]],
+            columns=["fact_time", "fact_value", "native_name"],
+        )
+        result = asyncio.run(facts_service.put_facts(1, data))
+        assert result == {"data": {"records_stored": 1}}
+        assert json.loads(requests_seen[0].content) == [
+            {
+                "fact_time": "2017-12-20 00:00",
+                "fact_value": 1,
+                "native_name": "native-name-1",
+            }
+        ]
+
+    def test_put_facts_batched(self, facts_service):
+        def handler(request):
+            batch = json.loads(request.content)
+            if batch[0]["fact_value"] == 1:
+                raise httpx.ConnectError("Connection refused")
+            fact_time = batch[0]["fact_time"]
+            return httpx.Response(
+                201,
+                json={
+                    "data": {
+                        "records_stored": len(batch),
+                        "min_process_timestamp": fact_time,
+                        "max_process_timestamp": fact_time,
+                    }
+                },
+            )
+
+        facts_service.retry = RetryPolicy(retries=0)
+        facts_service.session = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        data = pd.DataFrame(
+            data=[[f"2017-12-2{i} 00:00", i, "native-name-1"] for i in range(3)],
+            columns=["fact_time", "fact_value", "native_name"],
+        )
+        result = asyncio.run(facts_service.put_facts(1, data, batch_size=1))
+        assert result == {
+            "data": {
+                "records_stored": 2,
+                "min_process_timestamp": "2017-12-20 00:00",
+                "max_process_timestamp": "2017-12-22 00:00",
+            },
+            "message": {
+                "failed_batches": [
+                    {
+                        "rows": [1, 2],
+                        "status_code": None,
+                        "error": "ConnectError: Connection refused",
+                    }
+                ]
+            },
+        }
+
+    def test_delete_equipment(self, facts_service, requests_seen):
+        asyncio.run(facts_service.delete_equipment(1, equipments=["VAV_01", "VAV_02"]))
+        request = requests_seen[0]
+        assert request.method == "DELETE"
+        body = parse_qs(request.content.decode())
+        assert body["equipment_name"] == ["VAV_01", "VAV_02"]
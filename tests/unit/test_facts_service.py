@@ -1,10 +1,19 @@
+import io
+import json
+import threading
+import time
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pytest
 import pandas as pd
+import requests
 
 from eco_connect import FactsService
-from eco_connect.src.errors import RequestParserError
+from eco_connect.src.errors import InvalidRequest, RequestParserError, RequestTimeout
+from eco_connect.src.request_parser import RequestParser
+from eco_connect.src.retry import RetryPolicy
 
 
 class TestFactsService:
@@ -49,6 +58,14 @@ class TestFactsService:
         _validate_env.assert_called_once_with(environment_name="dev")
         _get_credentials.assert_called_once()
 
+    def test__init__session(self, mocker):
+        mocker.patch(self.CLASS_PATH + "._set_credentials")
+
+        facts_service = FactsService(pool_maxsize=25, keep_alive=False)
+        adapter = facts_service.session.get_adapter(facts_service.hostname)
+        assert adapter._pool_maxsize == 25
+        assert facts_service.session.headers["Connection"] == "close"
+
     def test_get_facts_json(self, mocker, facts_service):
         building_id = 1
         start_date = "2017-12-01 00:00"
@@ -68,7 +85,9 @@ class TestFactsService:
         display_name_expression = ["AHU.* .*"]
         result_format = "json"
 
-        expected_parser = mocker.patch(self.MODULE_PATH + ".RequestParser.json_parser")
+        expected_parser = mocker.patch(
+            "eco_connect.src.request_parser.RequestParser.json_parser"
+        )
 
         mock_response = mocker.Mock()
         mock_post = mocker.patch.object(
@@ -349,8 +368,714 @@ class TestFactsService:
         end_date = "2017-12-10 00:00"
         with pytest.raises(ValueError):
             facts_service.get_facts(
-                building_id, start_date, end_date, result_format="arrow"
+                building_id, start_date, end_date, result_format="xml"
+            )
+
+    def test__split_date_range(self, facts_service):
+        result = facts_service._split_date_range(
+            "2017-12-01 00:00", "2017-12-03 12:00", "1D"
+        )
+        assert result == [
+            ("2017-12-01 00:00", "2017-12-02 00:00"),
+            ("2017-12-02 00:00", "2017-12-03 00:00"),
+            ("2017-12-03 00:00", "2017-12-03 12:00"),
+        ]
+
+    def test__split_date_range_single_window(self, facts_service):
+        result = facts_service._split_date_range(
+            "2017-12-01 00:00", "2017-12-01 00:00", "7D"
+        )
+        assert result == [("2017-12-01 00:00", "2017-12-01 00:00")]
+
+    def test__split_date_range_invalid(self, facts_service):
+        with pytest.raises(ValueError):
+            facts_service._split_date_range("2017-12-01", "2017-12-02", "0D")
+
+    def _mock_fact_response(self, mocker, points, status_code=200):
+        mock_response = mocker.Mock()
+        mock_response.status_code = status_code
+        mock_response.json.return_value = {
+            "data": {
+                str(point_id): {
+                    "data": dict(data),
+                    "meta": {"eco_point_id": point_id, "display_name": f"P{point_id}"},
+                }
+                for point_id, data in points.items()
+            }
+        }
+        return mock_response
+
+    def test_get_facts_chunked(self, mocker, facts_service):
+        full_data = {
+            2: {"2017-12-01 00:00": 1, "2017-12-01 12:00": 2, "2017-12-02 00:00": 3},
+            1: {"2017-12-01 00:00": 4, "2017-12-02 00:00": 5, "2017-12-02 12:00": 6},
+        }
+
+        def mock_post(url, data):
+            points = {}
+            for point_id, point_data in full_data.items():
+                window = {
+                    fact_time: value
+                    for fact_time, value in point_data.items()
+                    if data["start_date"] <= fact_time <= data["end_date"]
+                }
+                if window:
+                    points[point_id] = window
+            return self._mock_fact_response(mocker, points)
+
+        mock_post = mocker.patch.object(facts_service, "post", side_effect=mock_post)
+
+        expected_result = facts_service._pandas_fact_parser(
+            self._mock_fact_response(mocker, full_data)
+        )
+        result = facts_service.get_facts(
+            1, "2017-12-01 00:00", "2017-12-02 12:00", chunk_size="12h", max_workers=2
+        )
+
+        assert mock_post.call_count == 3
+        windows = sorted(
+            (call[1]["data"]["start_date"], call[1]["data"]["end_date"])
+            for call in mock_post.call_args_list
+        )
+        assert windows == [
+            ("2017-12-01 00:00", "2017-12-01 12:00"),
+            ("2017-12-01 12:00", "2017-12-02 00:00"),
+            ("2017-12-02 00:00", "2017-12-02 12:00"),
+        ]
+        pd.testing.assert_frame_equal(result, expected_result)
+
+    def _mock_windowed_post(self, mocker, full_data):
+        def mock_post(url, data, stream=False):
+            points = {}
+            for point_id, point_data in full_data.items():
+                window = {
+                    fact_time: value
+                    for fact_time, value in point_data.items()
+                    if data["start_date"] <= fact_time <= data["end_date"]
+                }
+                if window:
+                    points[point_id] = window
+            if not points:
+                no_data = mocker.Mock(status_code=400)
+                no_data.json.return_value = {"message": {"NoData": "No data found."}}
+                return no_data
+
+            mock_response = self._mock_fact_response(mocker, points)
+            if stream:
+                mock_response = self._mock_streamed_response(mocker, mock_response)
+                mock_response.status_code = 200
+            return mock_response
+
+        return mock_post
+
+    def test_get_facts_many(self, mocker, facts_service):
+        no_data = {"message": {"NoData": "No data found for the provided filters."}}
+        results = {
+            26: pd.DataFrame(
+                {
+                    "fact_time": ["2017-12-20 00:00"],
+                    "fact_value": [1.0],
+                    "point_class": pd.Categorical(["SpaceAirTemperature"]),
+                }
+            ),
+            27: pd.DataFrame(
+                {
+                    "fact_time": ["2017-12-20 00:00", "2017-12-20 00:05"],
+                    "fact_value": [2.0, 3.0],
+                    "point_class": pd.Categorical(["AirFlow", "AirFlow"]),
+                }
+            ),
+            28: no_data,
+        }
+        mock_get_facts = mocker.patch.object(
+            facts_service,
+            "get_facts",
+            side_effect=lambda building_id, *args, **kwargs: results[building_id],
+        )
+
+        result = facts_service.get_facts_many(
+            [26, 27, 28, 26], "2017-12-20 00:00", "2017-12-21 00:00", chunk_size="1D"
+        )
+        assert result == results
+        assert mock_get_facts.call_count == 3
+        assert mock_get_facts.call_args[1]["chunk_size"] == "1D"
+
+        result = facts_service.get_facts_many(
+            [26, 27, 28], "2017-12-20 00:00", "2017-12-21 00:00", concat=True
+        )
+        assert result["building_id"].tolist() == [26, 27, 27]
+        assert result["fact_value"].tolist() == [1.0, 2.0, 3.0]
+        assert list(result["point_class"].cat.categories) == [
+            "SpaceAirTemperature",
+            "AirFlow",
+        ]
+
+    def test_get_facts_many_concat_error(self, mocker, facts_service):
+        mocker.patch.object(
+            facts_service, "get_facts", return_value={"message": "Invalid building"}
+        )
+        with pytest.raises(InvalidRequest):
+            facts_service.get_facts_many([26], "2017-12-20", "2017-12-21", concat=True)
+        with pytest.raises(ValueError):
+            facts_service.get_facts_many(
+                [26], "2017-12-20", "2017-12-21", result_format="json", concat=True
+            )
+
+    def test_iter_facts_by_point(self, mocker, facts_service):
+        pytest.importorskip("ijson")
+        full_data = {
+            2: {"2017-12-01 00:00": 1, "2017-12-01 12:00": 2, "2017-12-02 00:00": 3},
+            1: {"2017-12-01 00:00": 4, "2017-12-02 00:00": 5, "2017-12-04 00:00": 6},
+        }
+        mock_post = mocker.patch.object(
+            facts_service,
+            "post",
+            side_effect=self._mock_windowed_post(mocker, full_data),
+        )
+
+        result = facts_service.iter_facts(
+            1, "2017-12-01 00:00", "2017-12-06 00:00", chunk_size="1D"
+        )
+        assert mock_post.call_count == 0
+        result = list(result)
+        assert mock_post.call_count == 5
+        assert len(result) == 3
+        assert all(call[1]["stream"] for call in mock_post.call_args_list)
+
+        for meta, facts in result:
+            assert meta["display_name"] == f"P{meta['eco_point_id']}"
+            assert facts.name == meta["eco_point_id"]
+            assert facts.index.name == "fact_time"
+        for point_id, point_data in full_data.items():
+            facts = pd.concat(
+                [facts for meta, facts in result if meta["eco_point_id"] == point_id]
+            )
+            expected_facts = pd.Series(
+                list(point_data.values()),
+                index=pd.to_datetime(list(point_data.keys())),
+                dtype="float64",
+                name=point_id,
+            )
+            expected_facts.index.name = "fact_time"
+            pd.testing.assert_series_equal(facts, expected_facts)
+
+    def test_iter_facts_by_window(self, mocker, facts_service):
+        full_data = {
+            2: {"2017-12-01 00:00": 1, "2017-12-01 12:00": 2, "2017-12-02 00:00": 3},
+            1: {"2017-12-01 00:00": 4, "2017-12-02 00:00": 5, "2017-12-02 12:00": 6},
+        }
+        mocker.patch.object(
+            facts_service,
+            "post",
+            side_effect=self._mock_windowed_post(mocker, full_data),
+        )
+
+        result = list(
+            facts_service.iter_facts(
+                1, "2017-12-01 00:00", "2017-12-02 12:00", chunk_size="12h", by="window"
+            )
+        )
+        assert len(result) == 3
+        expected_result = facts_service._pandas_fact_parser(
+            self._mock_fact_response(mocker, full_data)
+        )
+        pd.testing.assert_frame_equal(
+            pd.concat(result)
+            .sort_values(["eco_point_id", "fact_time"])
+            .reset_index(drop=True),
+            expected_result,
+        )
+
+    @pytest.mark.parametrize("by", ["point", "window"])
+    def test_iter_facts_boundary_with_seconds(self, mocker, facts_service, by):
+        if by == "point":
+            pytest.importorskip("ijson")
+        full_data = {
+            1: {
+                "2017-12-01 00:00:00": 1,
+                "2017-12-02 00:00:00": 2,
+                "2017-12-02 12:00:00": 3,
+                "2017-12-03 00:00:00": 4,
+            }
+        }
+
+        def mock_post(url, data, stream=False):
+            start_date = pd.Timestamp(data["start_date"])
+            end_date = pd.Timestamp(data["end_date"])
+            window = {
+                fact_time: value
+                for fact_time, value in full_data[1].items()
+                if start_date <= pd.Timestamp(fact_time) <= end_date
+            }
+            mock_response = self._mock_fact_response(mocker, {1: window})
+            if stream:
+                mock_response = self._mock_streamed_response(mocker, mock_response)
+                mock_response.status_code = 200
+            return mock_response
+
+        mocker.patch.object(facts_service, "post", side_effect=mock_post)
+
+        result = list(
+            facts_service.iter_facts(
+                1, "2017-12-01 00:00", "2017-12-03 00:00", chunk_size="1D", by=by
+            )
+        )
+        if by == "point":
+            fact_times = [fact_time for _, facts in result for fact_time in facts.index]
+        else:
+            fact_times = list(
+                pd.to_datetime(pd.concat(result)["fact_time"], format="mixed")
+            )
+        assert sorted(fact_times) == list(pd.to_datetime(list(full_data[1])))
+
+    def test_iter_facts_error(self, mocker, facts_service):
+        error = mocker.Mock(status_code=500)
+        error.json.return_value = {"message": "Internal Server Error"}
+        mocker.patch.object(facts_service, "post", return_value=error)
+
+        with pytest.raises(InvalidRequest):
+            list(facts_service.iter_facts(1, "2017-12-01", "2017-12-02"))
+        with pytest.raises(ValueError):
+            list(facts_service.iter_facts(1, "2017-12-01", "2017-12-02", by="invalid"))
+
+    def test_export_facts(self, mocker, tmp_path, facts_service):
+        pq = pytest.importorskip("pyarrow.parquet")
+        full_data = {
+            2: {"2017-12-01 00:00": 1, "2017-12-01 12:00": 2, "2017-12-02 00:00": 3},
+            1: {"2017-12-01 00:00": 4, "2017-12-02 00:00": 5, "2017-12-03 12:00": 6},
+        }
+        mocker.patch.object(
+            facts_service,
+            "post",
+            side_effect=self._mock_windowed_post(mocker, full_data),
+        )
+        path = str(tmp_path / "facts.parquet")
+
+        result = facts_service.export_facts(
+            1, "2017-12-01 00:00", "2017-12-04 00:00", path, chunk_size="12h"
+        )
+        assert result == 6
+        parquet_file = pq.ParquetFile(path)
+        # The windows of 2017-12-02 12:00 to 2017-12-03 12:00 have no data.
+        assert parquet_file.metadata.num_row_groups == 3
+        expected_df = facts_service._pandas_fact_parser(
+            self._mock_fact_response(mocker, full_data)
+        )
+        result_df = parquet_file.read().to_pandas()
+        pd.testing.assert_frame_equal(
+            result_df.assign(
+                fact_time=result_df["fact_time"].dt.strftime("%Y-%m-%d %H:%M")
+            )
+            .astype({"eco_point_id": "int64", "display_name": "str"})
+            .sort_values(["eco_point_id", "fact_time"])
+            .reset_index(drop=True),
+            expected_df.astype({"fact_value": "float64"})[result_df.columns],
+        )
+
+    def test_export_facts_no_data(self, mocker, tmp_path, facts_service):
+        pq = pytest.importorskip("pyarrow.parquet")
+        mocker.patch.object(
+            facts_service, "post", side_effect=self._mock_windowed_post(mocker, {})
+        )
+        path = str(tmp_path / "facts.parquet")
+
+        assert facts_service.export_facts(1, "2017-12-01", "2017-12-02", path) == 0
+        assert pq.read_table(path).column_names == [
+            "fact_time",
+            "fact_value",
+            "eco_point_id",
+        ]
+
+    def test_export_facts_error(self, mocker, tmp_path, facts_service):
+        pytest.importorskip("pyarrow")
+        mock_post = self._mock_windowed_post(
+            mocker, {1: {"2017-12-01 00:00": 4, "2017-12-02 00:00": 5}}
+        )
+        error = mocker.Mock(status_code=500)
+        error.json.return_value = {"message": "Internal Server Error"}
+        mocker.patch.object(
+            facts_service,
+            "post",
+            side_effect=lambda url, data, stream=False: (
+                error if data["start_date"] > "2017-12-01" else mock_post(url, data)
+            ),
+        )
+        path = tmp_path / "facts.parquet"
+
+        with pytest.raises(InvalidRequest):
+            facts_service.export_facts(
+                1, "2017-12-01", "2017-12-03", str(path), chunk_size="1D"
             )
+        assert not path.exists()
+
+    def test_get_facts_cached(self, mocker, tmp_path):
+        facts_service = FactsService(cache_dir=str(tmp_path))
+        full_data = {
+            1: {"2017-12-01 00:00": 4, "2017-12-02 00:00": 5, "2017-12-02 12:00": 6},
+            2: {"2017-12-01 00:00": 1, "2017-12-01 12:00": 2},
+        }
+
+        def mock_post(url, data):
+            points = {}
+            for point_id, point_data in full_data.items():
+                window = {
+                    fact_time: value
+                    for fact_time, value in point_data.items()
+                    if data["start_date"] <= fact_time <= data["end_date"]
+                }
+                if window:
+                    points[point_id] = window
+            return self._mock_fact_response(mocker, points)
+
+        mock_post = mocker.patch.object(facts_service, "post", side_effect=mock_post)
+
+        expected_result = facts_service._pandas_fact_parser(
+            self._mock_fact_response(mocker, full_data)
+        )
+        result = facts_service.get_facts(1, "2017-12-01 00:00", "2017-12-02 12:00")
+        pd.testing.assert_frame_equal(result, expected_result)
+        assert mock_post.call_count == 1
+
+        # The last hour is fetched again and picks up the late samples of
+        # point 2, point 2 having stopped early does not hold back the rest.
+        full_data[1]["2017-12-03 00:00"] = 7
+        full_data[2]["2017-12-02 11:30"] = 3
+        result = facts_service.get_facts(1, "2017-12-01 00:00", "2017-12-03 00:00")
+        assert mock_post.call_count == 2
+        assert mock_post.call_args[1]["data"]["start_date"] == "2017-12-02 11:00"
+        assert mock_post.call_args[1]["data"]["end_date"] == "2017-12-03 00:00"
+        assert result["fact_value"].tolist() == [4, 5, 6, 7, 1, 2, 3]
+        uncached_result = facts_service.get_facts(
+            1, "2017-12-01 00:00", "2017-12-03 00:00", use_cache=False
+        )
+        pd.testing.assert_frame_equal(result, uncached_result)
+
+        facts_service.get_facts(1, "2017-12-01 00:00", "2017-12-03 00:00")
+        assert mock_post.call_count == 4
+        assert mock_post.call_args[1]["data"]["start_date"] == "2017-12-02 23:00"
+
+        facts_service.get_facts(
+            1, "2017-12-01 00:00", "2017-12-02 00:00", end_hour="12:00"
+        )
+        assert mock_post.call_count == 5
+        assert mock_post.call_args[1]["data"]["start_date"] == "2017-12-01 00:00"
+
+    def test_get_facts_cached_error(self, mocker, tmp_path):
+        facts_service = FactsService(cache_dir=str(tmp_path))
+        mock_response = mocker.Mock(status_code=500)
+        mock_response.json.return_value = {"message": "error"}
+        mocker.patch.object(facts_service, "post", return_value=mock_response)
+
+        result = facts_service.get_facts(1, "2017-12-01", "2017-12-02")
+        assert result == {"message": "error"}
+
+    def test_put_facts_invalidates_cache(self, mocker, tmp_path):
+        facts_service = FactsService(cache_dir=str(tmp_path))
+        mock_invalidate = mocker.patch.object(facts_service.fact_cache, "invalidate")
+        mocker.patch.object(facts_service, "put")
+        mocker.patch.object(facts_service, "_format_response")
+
+        facts_service.put_facts(1, pd.DataFrame(columns=["a", "b", "c"]))
+        mock_invalidate.assert_called_once_with(1)
+
+    def _mock_put_fact_response(self, mocker, records, first, last, errors=[]):
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = {
+            "data": {
+                "building_id": 26,
+                "records_stored": records,
+                "min_process_timestamp": first,
+                "max_process_timestamp": last,
+            }
+        }
+        if errors:
+            response.json.return_value["message"] = {"field_errors": errors}
+        return response
+
+    def test_put_facts_batched(self, mocker, facts_service):
+        data = pd.DataFrame(
+            columns=["fact_time", "fact_value", "native_name"],
+            data=[
+                ["2017-12-20 00:00", 1, "native-name-1"],
+                ["2017-12-21 00:00", 2, "native-name-2"],
+                ["2017-12-22 00:00", 3, "native-name-3"],
+            ],
+        )
+        responses = {
+            "2017-12-20 00:00": self._mock_put_fact_response(
+                mocker, 1, "2017-12-20 00:00", "2017-12-21 00:00", ["native-name-2"]
+            ),
+            "2017-12-22 00:00": self._mock_put_fact_response(
+                mocker, 1, "2017-12-22 00:00", "2017-12-22 00:00"
+            ),
+        }
+        mock_put = mocker.patch.object(
+            facts_service,
+            "put",
+            side_effect=lambda url, data, encode_type: responses[
+                json.loads(data)[0]["fact_time"]
+            ],
+        )
+
+        result = facts_service.put_facts(26, data, batch_size=2)
+        assert mock_put.call_count == 2
+        batch_sizes = [
+            len(json.loads(call[1]["data"])) for call in mock_put.call_args_list
+        ]
+        assert sorted(batch_sizes) == [1, 2]
+        assert result == {
+            "data": {
+                "building_id": 26,
+                "records_stored": 2,
+                "min_process_timestamp": "2017-12-20 00:00",
+                "max_process_timestamp": "2017-12-22 00:00",
+            },
+            "message": {"field_errors": ["native-name-2"]},
+        }
+
+    def test_put_facts_batched_partial_failure(self, mocker, facts_service):
+        data = pd.DataFrame(
+            columns=["fact_time", "fact_value", "native_name"],
+            data=[[f"2017-12-2{i} 00:00", i, "native-name-1"] for i in range(5)],
+        )
+        error = mocker.Mock(status_code=503)
+        error.json.return_value = {"message": "Service Unavailable"}
+        responses = {
+            "2017-12-20 00:00": self._mock_put_fact_response(
+                mocker, 2, "2017-12-20 00:00", "2017-12-21 00:00", ["native-name-2"]
+            ),
+            "2017-12-22 00:00": error,
+            "2017-12-24 00:00": self._mock_put_fact_response(
+                mocker, 1, "2017-12-24 00:00", "2017-12-24 00:00"
+            ),
+        }
+        mocker.patch.object(
+            facts_service,
+            "put",
+            side_effect=lambda url, data, encode_type: responses[
+                json.loads(data)[0]["fact_time"]
+            ],
+        )
+
+        result = facts_service.put_facts(26, data, batch_size=2)
+        assert result == {
+            "data": {
+                "building_id": 26,
+                "records_stored": 3,
+                "min_process_timestamp": "2017-12-20 00:00",
+                "max_process_timestamp": "2017-12-24 00:00",
+            },
+            "message": {
+                "field_errors": ["native-name-2"],
+                "failed_batches": [
+                    {
+                        "rows": [2, 4],
+                        "status_code": 503,
+                        "error": {"message": "Service Unavailable"},
+                    }
+                ],
+            },
+        }
+        failed_rows = slice(*result["message"]["failed_batches"][0]["rows"])
+        assert data.iloc[failed_rows]["fact_value"].tolist() == [2, 3]
+
+    def test_put_facts_batched_exceptions(self, mocker, facts_service):
+        data = pd.DataFrame(
+            columns=["fact_time", "fact_value", "native_name"],
+            data=[[f"2017-12-2{i} 00:00", i, "native-name-1"] for i in range(4)],
+        )
+        responses = {
+            "2017-12-20 00:00": self._mock_put_fact_response(
+                mocker, 1, "2017-12-20 00:00", "2017-12-20 00:00"
+            ),
+            "2017-12-21 00:00": requests.ConnectionError("Connection refused"),
+            "2017-12-22 00:00": self._mock_put_fact_response(
+                mocker, 1, "2017-12-22 00:00", "2017-12-22 00:00"
+            ),
+            "2017-12-23 00:00": RequestTimeout("Deadline exceeded"),
+        }
+
+        def put(url, data, encode_type):
+            response = responses[json.loads(data)[0]["fact_time"]]
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        mock_put = mocker.patch.object(facts_service, "put", side_effect=put)
+
+        result = facts_service.put_facts(26, data, batch_size=1)
+        assert mock_put.call_count == 4
+        assert result == {
+            "data": {
+                "building_id": 26,
+                "records_stored": 2,
+                "min_process_timestamp": "2017-12-20 00:00",
+                "max_process_timestamp": "2017-12-22 00:00",
+            },
+            "message": {
+                "failed_batches": [
+                    {
+                        "rows": [1, 2],
+                        "status_code": None,
+                        "error": "ConnectionError: Connection refused",
+                    },
+                    {
+                        "rows": [3, 4],
+                        "status_code": None,
+                        "error": "RequestTimeout: Deadline exceeded",
+                    },
+                ]
+            },
+        }
+
+    def test_put_facts_batched_deadline(self, mocker, facts_service):
+        facts_service.deadline = 60
+        time_limits = []
+
+        def put(url, data, encode_type):
+            time_limits.append(facts_service._time_limits.get())
+            return self._mock_put_fact_response(mocker, 1, None, None)
+
+        mocker.patch.object(facts_service, "put", side_effect=put)
+        data = pd.DataFrame(
+            columns=["fact_time", "fact_value", "native_name"],
+            data=[["2017-12-20 00:00", i, "native-name-1"] for i in range(4)],
+        )
+
+        facts_service.put_facts(26, data, batch_size=1)
+        # Every batch runs against the deadline of the whole upload.
+        assert len(time_limits) == 4
+        assert len(set(time_limits)) == 1
+        expires_at, timeout = time_limits[0]
+        assert expires_at is not None
+        assert timeout == (10, 300)
+
+    def test_put_facts_batched_invalid(self, facts_service):
+        with pytest.raises(ValueError):
+            facts_service.put_facts(26, pd.DataFrame(), batch_size=0)
+
+    def test__serialize_facts(self, facts_service):
+        data = pd.DataFrame(
+            {
+                "fact_time": pd.to_datetime(["2017-12-20 00:00", "2017-12-20 00:05"]),
+                "fact_value": [67.5, float("nan")],
+                "native_name": ['native "name",\n  %s', "native-name-\u00e9"],
+                "ignored": [1, 2],
+            }
+        )
+        result = facts_service._serialize_facts(data)
+        assert isinstance(result, bytes)
+        assert json.loads(result) == [
+            {
+                "fact_time": "2017-12-20 00:00",
+                "fact_value": 67.5,
+                "native_name": 'native "name",\n  %s',
+            },
+            {
+                "fact_time": "2017-12-20 00:05",
+                "fact_value": None,
+                "native_name": "native-name-\u00e9",
+            },
+        ]
+
+    @pytest.mark.parametrize("json_backend", ["orjson", "ujson", "json"])
+    def test__serialize_facts_exact(self, json_backend):
+        if json_backend != "json":
+            pytest.importorskip(json_backend)
+        facts_service = FactsService(json_backend=json_backend)
+        values = [0.1 + 0.2, 1.23456789e-12, 4e-17, 123456789.123456789]
+        data = pd.DataFrame(
+            {
+                "fact_time": ["2017-12-20 00:00"] * len(values),
+                "fact_value": values,
+                "native_name": ["native-name"] * len(values),
+            }
+        )
+        result = json.loads(facts_service._serialize_facts(data))
+        assert [record["fact_value"] for record in result] == values
+
+    def test__serialize_facts_seconds(self, facts_service):
+        data = pd.DataFrame(
+            {
+                "fact_time": pd.to_datetime(
+                    ["2017-12-20 00:00:00", "2017-12-20 00:05:30"]
+                ),
+                "fact_value": [1.0, 2.0],
+                "native_name": ["native-name"] * 2,
+            }
+        )
+        with pytest.raises(ValueError):
+            facts_service._serialize_facts(data)
+
+    def test__serialize_facts_empty(self, facts_service):
+        data = pd.DataFrame(columns=["fact_time", "fact_value", "native_name"])
+        assert facts_service._serialize_facts(data) == b"[]"
+
+    def test__merge_put_fact_responses(self, mocker, facts_service):
+        responses = [
+            self._mock_put_fact_response(mocker, 0, None, None, ["a", "b"]),
+            self._mock_put_fact_response(
+                mocker, 5, "2017-12-20 00:00", "2017-12-21 00:00", ["b"]
+            ),
+        ]
+        result = facts_service._merge_put_fact_responses(responses, [(0, 1), (1, 6)])
+        assert result.status_code == 200
+        assert result.json() == {
+            "data": {
+                "building_id": 26,
+                "records_stored": 5,
+                "min_process_timestamp": "2017-12-20 00:00",
+                "max_process_timestamp": "2017-12-21 00:00",
+            },
+            "message": {"field_errors": ["a", "b"]},
+        }
+
+    def test__merge_put_fact_responses_error(self, mocker, facts_service):
+        error = mocker.Mock(status_code=500, text="Internal Server Error")
+        error.json.side_effect = ValueError
+        responses = [error, error]
+        result = facts_service._merge_put_fact_responses(responses, [(0, 2), (2, 3)])
+        assert result.status_code == 500
+        assert result.json() == {
+            "data": {
+                "records_stored": 0,
+                "min_process_timestamp": None,
+                "max_process_timestamp": None,
+            },
+            "message": {
+                "failed_batches": [
+                    {
+                        "rows": [0, 2],
+                        "status_code": 500,
+                        "error": "Internal Server Error",
+                    },
+                    {
+                        "rows": [2, 3],
+                        "status_code": 500,
+                        "error": "Internal Server Error",
+                    },
+                ]
+            },
+        }
+
+    def test__merge_fact_responses_no_data(self, mocker, facts_service):
+        no_data = mocker.Mock(status_code=400)
+        no_data.json.return_value = {"message": {"NoData": "No data found."}}
+        data = self._mock_fact_response(mocker, {1: {"2017-12-01 00:00": 1}})
+
+        result = facts_service._merge_fact_responses([no_data, data])
+        assert result.json() == data.json()
+
+        result = facts_service._merge_fact_responses([no_data, no_data])
+        assert result is no_data
+
+    def test__merge_fact_responses_error(self, mocker, facts_service):
+        error = mocker.Mock(status_code=500)
+        error.json.side_effect = ValueError
+        data = self._mock_fact_response(mocker, {1: {"2017-12-01 00:00": 1}})
+
+        result = facts_service._merge_fact_responses([data, error])
+        assert result is error
 
     def test__tuple_fact_parser(self, mocker, facts_service):
         mock_response = mocker.Mock()
@@ -404,7 +1129,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "SpaceAirTemperature",
                 },
-                **{"fact_time": "2017-08-01 00:00", "fact_value": 67.5}
+                **{"fact_time": "2017-08-01 00:00", "fact_value": 67.5},
             ),
             expected_named_tuple(
                 **{
@@ -415,7 +1140,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "SpaceAirTemperature",
                 },
-                **{"fact_time": "2017-08-01 00:05", "fact_value": 68.5}
+                **{"fact_time": "2017-08-01 00:05", "fact_value": 68.5},
             ),
             expected_named_tuple(
                 **{
@@ -426,7 +1151,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "CoolingCoilUnitFeedback",
                 },
-                **{"fact_time": "2017-08-01 00:00", "fact_value": 0}
+                **{"fact_time": "2017-08-01 00:00", "fact_value": 0},
             ),
             expected_named_tuple(
                 **{
@@ -437,7 +1162,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "CoolingCoilUnitFeedback",
                 },
-                **{"fact_time": "2017-08-01 00:05", "fact_value": 100}
+                **{"fact_time": "2017-08-01 00:05", "fact_value": 100},
             ),
         ]
         result = facts_service._tuple_fact_parser(mock_response)
@@ -451,9 +1176,6 @@ class TestFactsService:
             facts_service._tuple_fact_parser(mock_response)
 
     def test__pandas_fact_parser(self, mocker, facts_service):
-        mock__tuples_fact_parser = mocker.patch.object(
-            facts_service, "_tuple_fact_parser"
-        )
         tuple_names = [
             "fact_time",
             "fact_value",
@@ -464,56 +1186,33 @@ class TestFactsService:
             "equipment_type",
             "point_class",
         ]
-        expected_named_tuple = namedtuple("response_tuple", tuple_names)
-
-        expected_result = [
-            expected_named_tuple(
-                **{
-                    "display_name": "SpaceTemp",
-                    "eco_point_id": 1,
-                    "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.ZN-T",
-                    "equipment": "VAV-301",
-                    "equipment_type": "VAV",
-                    "point_class": "SpaceAirTemperature",
-                },
-                **{"fact_time": "2017-08-01 00:00", "fact_value": 67.5}
-            ),
-            expected_named_tuple(
-                **{
-                    "display_name": "SpaceTemp",
-                    "eco_point_id": 1,
-                    "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.ZN-T",
-                    "equipment": "VAV-301",
-                    "equipment_type": "VAV",
-                    "point_class": "SpaceAirTemperature",
-                },
-                **{"fact_time": "2017-08-01 00:05", "fact_value": 68.5}
-            ),
-            expected_named_tuple(
-                **{
-                    "display_name": "Cooling",
-                    "eco_point_id": 2,
-                    "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.CV",
-                    "equipment": "VAV_301",
-                    "equipment_type": "VAV",
-                    "point_class": "CoolingCoilUnitFeedback",
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {
+                "2": {
+                    "data": {"2017-08-01 00:00": 0, "2017-08-01 00:05": 100},
+                    "meta": {
+                        "display_name": "Cooling",
+                        "eco_point_id": 2,
+                        "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.CV",
+                        "equipment": "VAV_301",
+                        "equipment_type": "VAV",
+                        "point_class": "CoolingCoilUnitFeedback",
+                    },
                 },
-                **{"fact_time": "2017-08-01 00:00", "fact_value": 0}
-            ),
-            expected_named_tuple(
-                **{
-                    "display_name": "Cooling",
-                    "eco_point_id": 2,
-                    "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.CV",
-                    "equipment": "VAV_301",
-                    "equipment_type": "VAV",
-                    "point_class": "CoolingCoilUnitFeedback",
+                "1": {
+                    "data": {"2017-08-01 00:00": 67.5, "2017-08-01 00:05": 68.5},
+                    "meta": {
+                        "display_name": "SpaceTemp",
+                        "eco_point_id": 1,
+                        "native_name": "UCSB/275/VAV_301/NAE11/N2-2.275-VAV-301.ZN-T",
+                        "equipment": "VAV-301",
+                        "equipment_type": "VAV",
+                        "point_class": "SpaceAirTemperature",
+                    },
                 },
-                **{"fact_time": "2017-08-01 00:05", "fact_value": 100}
-            ),
-        ]
-        mock__tuples_fact_parser.return_value = expected_result
-        mock_response = mocker.Mock()
+            }
+        }
         result = facts_service._pandas_fact_parser(mock_response)
         expected_df = pd.DataFrame(
             columns=tuple_names,
@@ -563,6 +1262,395 @@ class TestFactsService:
 
         pd.testing.assert_frame_equal(result, expected_df)
 
+    def test__pandas_fact_parser_matches_tuple_parser(self, mocker, facts_service):
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {
+                "3": {
+                    "data": {"2017-08-01 00:00": None, "2017-08-01 00:05": 1},
+                    "meta": {"eco_point_id": 3, "point_class": "Damper"},
+                },
+                "1": {
+                    "data": {"2017-08-01 00:05": 2.5, "2017-08-01 00:00": 3},
+                    "meta": {"point_class": "Temp", "eco_point_id": 1},
+                },
+                "2": {"data": {}, "meta": {"eco_point_id": 2, "point_class": "Flow"}},
+            }
+        }
+        expected_df = pd.DataFrame(facts_service._tuple_fact_parser(mock_response))
+        result = facts_service._pandas_fact_parser(mock_response)
+        pd.testing.assert_frame_equal(result, expected_df)
+
+    def test__numpy_fact_parser(self, mocker, facts_service):
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {
+                "3": {
+                    "data": {"2017-08-01 00:00": None, "2017-08-01 00:05": 1},
+                    "meta": {"eco_point_id": 3, "point_class": "Damper"},
+                },
+                "1": {
+                    "data": {"2017-08-01 00:05": 2.5, "2017-08-01 00:00": 3},
+                    "meta": {"point_class": "Temp", "eco_point_id": 1},
+                },
+                "2": {"data": {}, "meta": {"eco_point_id": 2, "point_class": "Flow"}},
+            }
+        }
+        expected_df = facts_service._pandas_fact_parser(mock_response)
+
+        facts, meta = facts_service._numpy_fact_parser(mock_response)
+        assert facts.dtype == np.dtype(
+            [
+                ("fact_time", "datetime64[s]"),
+                ("fact_value", "float64"),
+                ("eco_point_id", "int32"),
+            ]
+        )
+        assert (facts["fact_time"] == pd.to_datetime(expected_df["fact_time"])).all()
+        np.testing.assert_array_equal(
+            facts["fact_value"], expected_df["fact_value"].to_numpy()
+        )
+        assert facts["eco_point_id"].tolist() == expected_df["eco_point_id"].tolist()
+        assert meta.dtype.names == ("eco_point_id", "point_class")
+        assert meta.tolist() == [(1, "Temp"), (2, "Flow"), (3, "Damper")]
+
+    def test__numpy_dqi_parser(self, mocker, facts_service):
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {
+                "VAV_2": {"2017-08-01": 0.5},
+                "VAV_1": {"2017-08-01": 1, "2017-08-02": None},
+            }
+        }
+        expected = facts_service._tuple_dqi_parser(mock_response)
+
+        dqi, aggregates = facts_service._numpy_dqi_parser(mock_response)
+        assert aggregates.tolist() == ["VAV_1", "VAV_2"]
+        assert aggregates[dqi["aggregate"]].tolist() == [
+            row.aggregate for row in expected
+        ]
+        assert dqi["timestamp"].astype(str).tolist() == [
+            "2017-08-01T00:00:00",
+            "2017-08-02T00:00:00",
+            "2017-08-01T00:00:00",
+        ]
+        np.testing.assert_array_equal(dqi["dqi"], [1, np.nan, 0.5])
+
+        parser = facts_service._get_dqi_parser("numpy")
+        assert parser["parser"] == facts_service._numpy_dqi_parser
+        parser = facts_service._get_fact_parser("numpy")
+        assert parser["parser"] == facts_service._numpy_fact_parser
+
+    def test__arrow_fact_parser(self, mocker, facts_service):
+        pa = pytest.importorskip("pyarrow")
+        mock_response = self._mock_categorical_response(mocker)
+        expected_df = facts_service._pandas_fact_parser(
+            mock_response, categorical=False
+        )
+
+        result = facts_service._arrow_fact_parser(mock_response)
+        assert result.column_names == [
+            "fact_time",
+            "fact_value",
+            "eco_point_id",
+            "display_name",
+            "point_class",
+            "equipment_name",
+        ]
+        assert result.schema.field("fact_time").type == pa.timestamp("s")
+        assert result.schema.field("eco_point_id").type == pa.int32()
+        display_names = result["display_name"].combine_chunks()
+        assert display_names.dictionary.to_pylist() == ["Name-1", "Name-0"]
+        assert result["point_class"].null_count == 2
+        pd.testing.assert_frame_equal(
+            result.to_pandas().astype(
+                {
+                    "display_name": "str",
+                    "equipment_name": "str",
+                    "eco_point_id": "int64",
+                }
+            ),
+            expected_df.assign(
+                fact_time=pd.to_datetime(expected_df["fact_time"]).astype(
+                    "datetime64[s]"
+                ),
+                point_class=expected_df["point_class"].astype("category"),
+            )[result.column_names],
+        )
+
+    def test__arrow_dqi_parser(self, mocker, facts_service):
+        pa = pytest.importorskip("pyarrow")
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {"VAV_2": {"2017-08-01": 0.5}, "VAV_1": {"2017-08-01": 1}}
+        }
+
+        result = facts_service._arrow_dqi_parser(mock_response)
+        assert result.column_names == ["aggregate", "timestamp", "dqi"]
+        assert pa.types.is_dictionary(result.schema.field("aggregate").type)
+        assert result.to_pydict()["aggregate"] == ["VAV_1", "VAV_2"]
+        assert result.to_pydict()["dqi"] == [1.0, 0.5]
+        parser = facts_service._get_dqi_parser("arrow")
+        assert parser["parser"] == facts_service._arrow_dqi_parser
+
+    def test__polars_fact_parser(self, mocker, facts_service):
+        pl = pytest.importorskip("polars")
+        mock_response = self._mock_categorical_response(mocker)
+        expected_df = facts_service._pandas_fact_parser(
+            mock_response, categorical=False
+        )
+
+        result = facts_service._polars_fact_parser(mock_response)
+        assert dict(result.schema) == {
+            "fact_time": pl.Datetime("ms"),
+            "fact_value": pl.Float64,
+            "eco_point_id": pl.Int32,
+            "display_name": pl.Categorical,
+            "point_class": pl.Categorical,
+            "equipment_name": pl.Categorical,
+        }
+        assert result["point_class"].null_count() == 2
+        assert result["fact_time"].dt.strftime("%Y-%m-%d %H:%M").to_list() == (
+            expected_df["fact_time"].tolist()
+        )
+        for name in ("fact_value", "eco_point_id", "display_name", "equipment_name"):
+            assert result[name].to_list() == expected_df[name].tolist()
+
+    def test__polars_dqi_parser(self, mocker, facts_service):
+        pl = pytest.importorskip("polars")
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {"VAV_2": {"2017-08-01": 0.5}, "VAV_1": {"2017-08-01": 1}}
+        }
+
+        result = facts_service._polars_dqi_parser(mock_response)
+        assert dict(result.schema) == {
+            "aggregate": pl.Categorical,
+            "timestamp": pl.Datetime("ms"),
+            "dqi": pl.Float64,
+        }
+        assert result["aggregate"].to_list() == ["VAV_1", "VAV_2"]
+        assert result["dqi"].to_list() == [1.0, 0.5]
+        parser = facts_service._get_fact_parser("polars")
+        assert parser["parser"] == facts_service._polars_fact_parser
+        parser = facts_service._get_dqi_parser("polars")
+        assert parser["parser"] == facts_service._polars_dqi_parser
+
+    def _mock_categorical_response(self, mocker):
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {
+                str(point_id): {
+                    "data": {"2017-08-01 00:00": point_id, "2017-08-01 00:05": 1.5},
+                    "meta": {
+                        "eco_point_id": point_id,
+                        "display_name": f"Name-{point_id % 2}",
+                        "point_class": "Temp" if point_id < 3 else None,
+                        "equipment_name": f"VAV_{point_id}",
+                    },
+                }
+                for point_id in (3, 1, 2)
+            }
+        }
+        return mock_response
+
+    def test__pandas_fact_parser_categorical(self, mocker, facts_service):
+        mock_response = self._mock_categorical_response(mocker)
+        expected_df = facts_service._pandas_fact_parser(
+            mock_response, categorical=False
+        ).astype(
+            {
+                "display_name": "category",
+                "point_class": "category",
+                "equipment_name": "category",
+            }
+        )
+
+        result = facts_service._pandas_fact_parser(mock_response, categorical=True)
+
+        pd.testing.assert_frame_equal(result, expected_df)
+        assert result["eco_point_id"].tolist() == [1, 1, 2, 2, 3, 3]
+        assert result["point_class"].isna().tolist() == [False] * 4 + [True] * 2
+
+    def test__pandas_fact_parser_categorical_threshold(self, mocker, facts_service):
+        mock_response = self._mock_categorical_response(mocker)
+
+        facts_service.categorical_threshold = 7
+        result = facts_service._pandas_fact_parser(mock_response)
+        assert not isinstance(result["display_name"].dtype, pd.CategoricalDtype)
+
+        facts_service.categorical_threshold = 6
+        result = facts_service._pandas_fact_parser(mock_response)
+        assert isinstance(result["display_name"].dtype, pd.CategoricalDtype)
+
+    def test__get_fact_parser_categorical(self, facts_service):
+        parser = facts_service._get_fact_parser("pandas", categorical=True)
+        assert parser["parser"] == facts_service._pandas_fact_parser
+        assert parser["parser_args"] == {"data_key": "data", "categorical": True}
+
+        parser = facts_service._get_fact_parser("tuple", categorical=True)
+        assert parser["parser_args"] == {"data_key": "data"}
+
+    def test__get_fact_parser_wide(self, facts_service):
+        parser = facts_service._get_fact_parser("wide", meta_columns=["point_class"])
+        assert parser["parser"] == facts_service._wide_fact_parser
+        assert parser["parser_args"] == {
+            "data_key": "data",
+            "meta_columns": ["point_class"],
+        }
+
+    def test__wide_fact_parser(self, mocker, facts_service):
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {
+                "2": {
+                    "data": {"2017-08-01 00:05": 100, "2017-08-01 00:00": 0},
+                    "meta": {"eco_point_id": 2, "point_class": "Cooling"},
+                },
+                "1": {
+                    "data": {"2017-08-01 00:00": 67.5, "2017-08-01 00:10": None},
+                    "meta": {"eco_point_id": 1, "point_class": "SpaceTemp"},
+                },
+            }
+        }
+        expected_df = pd.DataFrame(
+            data=[[67.5, 0.0], [None, 100.0], [None, None]],
+            index=pd.DatetimeIndex(
+                ["2017-08-01 00:00", "2017-08-01 00:05", "2017-08-01 00:10"],
+                name="fact_time",
+            ),
+            columns=pd.Index([1, 2], name="eco_point_id"),
+        )
+
+        result = facts_service._wide_fact_parser(mock_response)
+        pd.testing.assert_frame_equal(result, expected_df)
+
+        long_df = facts_service._pandas_fact_parser(mock_response)
+        pivoted = long_df.pivot(
+            index="fact_time", columns="eco_point_id", values="fact_value"
+        )
+        pivoted.index = pd.to_datetime(pivoted.index)
+        pd.testing.assert_frame_equal(result, pivoted.astype("float64"))
+
+    def test__wide_fact_parser_meta_columns(self, mocker, facts_service):
+        mock_response = self._mock_categorical_response(mocker)
+        result = facts_service._wide_fact_parser(
+            mock_response, meta_columns=["equipment_name", "display_name"]
+        )
+        assert result.columns.names == [
+            "eco_point_id",
+            "equipment_name",
+            "display_name",
+        ]
+        assert result.columns.tolist() == [
+            (1, "VAV_1", "Name-1"),
+            (2, "VAV_2", "Name-0"),
+            (3, "VAV_3", "Name-1"),
+        ]
+        assert result[(3, "VAV_3", "Name-1")].tolist() == [3.0, 1.5]
+
+    def test__wide_fact_parser_bad_json(self, mocker, facts_service):
+        mock_response = mocker.Mock()
+        mock_response.json.side_effect = ValueError
+        with pytest.raises(RequestParserError):
+            facts_service._wide_fact_parser(mock_response)
+
+    def test__columnar_fact_parser_bad_json(self, mocker, facts_service):
+        mock_response = mocker.Mock()
+        mock_response.json.side_effect = ValueError
+        with pytest.raises(RequestParserError):
+            facts_service._columnar_fact_parser(mock_response)
+
+    def _mock_streamed_response(self, mocker, mock_response):
+        body = json.dumps(mock_response.json.return_value).encode()
+        return mocker.Mock(raw=io.BytesIO(body))
+
+    @pytest.mark.parametrize("categorical", [None, False, True])
+    def test__streaming_fact_parser(self, mocker, facts_service, categorical):
+        pytest.importorskip("ijson")
+        mock_response = self._mock_categorical_response(mocker)
+        expected_df = facts_service._pandas_fact_parser(
+            mock_response, categorical=categorical
+        )
+
+        streamed_response = self._mock_streamed_response(mocker, mock_response)
+        result = facts_service._streaming_fact_parser(
+            streamed_response, categorical=categorical
+        )
+        pd.testing.assert_frame_equal(result, expected_df)
+        streamed_response.close.assert_called_once_with()
+
+    @pytest.mark.parametrize(
+        "point_data, other_data",
+        [
+            (
+                {"2017-08-01 00:00": None, "2017-08-01 00:05": 1},
+                {"2017-08-01 00:05": 2, "2017-08-01 00:00": 3},
+            ),
+            (
+                {"2017-08-01 00:00": 1, "2017-08-01 00:05": 2},
+                {"2017-08-01 00:05": 2, "2017-08-01 00:00": 3},
+            ),
+            ({}, {"2017-08-01 00:05": 2, "2017-08-01 00:00": 3}),
+            (
+                {"2017-08-01 00:00": None, "2017-08-01 00:05": None},
+                {"2017-08-01 00:05": 2, "2017-08-01 00:00": 3},
+            ),
+            (
+                {"2017-08-01 00:00": None, "2017-08-01 00:05": None},
+                {"2017-08-01 00:00": None},
+            ),
+        ],
+    )
+    def test__streaming_fact_parser_values(
+        self, mocker, facts_service, point_data, other_data
+    ):
+        pytest.importorskip("ijson")
+        mock_response = mocker.Mock()
+        mock_response.json.return_value = {
+            "data": {
+                "3": {
+                    "data": point_data,
+                    "meta": {"eco_point_id": 3, "point_class": "Damper"},
+                },
+                "1": {
+                    "data": other_data,
+                    "meta": {"point_class": "Temp", "eco_point_id": 1},
+                },
+            }
+        }
+        expected_df = facts_service._pandas_fact_parser(mock_response)
+
+        streamed_response = self._mock_streamed_response(mocker, mock_response)
+        result = facts_service._streaming_fact_parser(streamed_response)
+        pd.testing.assert_frame_equal(result, expected_df)
+
+    def test__streaming_fact_parser_bad_json(self, mocker, facts_service):
+        pytest.importorskip("ijson")
+        mock_response = mocker.Mock(raw=io.BytesIO(b'{"data": {"1": {"data": '))
+        with pytest.raises(RequestParserError):
+            facts_service._streaming_fact_parser(mock_response)
+        mock_response.close.assert_called_once_with()
+
+    def test_get_facts_stream(self, mocker, facts_service):
+        mock_post = mocker.patch.object(facts_service, "post")
+        mock__format_response = mocker.patch.object(facts_service, "_format_response")
+
+        facts_service.get_facts(1, "2017-12-01", "2017-12-02", stream=True)
+        assert mock_post.call_args[1]["stream"] is True
+        assert mock__format_response.call_args[0][1] == (
+            facts_service._streaming_fact_parser
+        )
+
+        with pytest.raises(ValueError):
+            facts_service.get_facts(
+                1, "2017-12-01", "2017-12-02", stream=True, chunk_size="1D"
+            )
+        with pytest.raises(ValueError):
+            facts_service.get_facts(
+                1, "2017-12-01", "2017-12-02", stream=True, result_format="json"
+            )
+
     def test__csv_fact_parser(self, mocker, facts_service):
         mock_response = mocker.Mock()
 
@@ -588,7 +1676,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "SpaceAirTemperature",
                 },
-                **{"fact_time": "2017-08-01 00:00", "fact_value": 67.5}
+                **{"fact_time": "2017-08-01 00:00", "fact_value": 67.5},
             ),
             expected_named_tuple(
                 **{
@@ -599,7 +1687,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "SpaceAirTemperature",
                 },
-                **{"fact_time": "2017-08-01 00:05", "fact_value": 68.5}
+                **{"fact_time": "2017-08-01 00:05", "fact_value": 68.5},
             ),
             expected_named_tuple(
                 **{
@@ -610,7 +1698,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "CoolingCoilUnitFeedback",
                 },
-                **{"fact_time": "2017-08-01 00:00", "fact_value": 0}
+                **{"fact_time": "2017-08-01 00:00", "fact_value": 0},
             ),
             expected_named_tuple(
                 **{
@@ -621,7 +1709,7 @@ class TestFactsService:
                     "equipment_type": "VAV",
                     "point_class": "CoolingCoilUnitFeedback",
                 },
-                **{"fact_time": "2017-08-01 00:05", "fact_value": 100}
+                **{"fact_time": "2017-08-01 00:05", "fact_value": 100},
             ),
         ]
 
@@ -632,7 +1720,9 @@ class TestFactsService:
 
     def test_get_avg_facts_json(self, mocker, facts_service):
         mock_response = mocker.Mock()
-        mock_json_parser = mocker.patch(self.MODULE_PATH + ".RequestParser.json_parser")
+        mock_json_parser = mocker.patch(
+            "eco_connect.src.request_parser.RequestParser.json_parser"
+        )
         mock_get = mocker.patch.object(facts_service, "post")
         mock_get.return_value = mock_response
         mock_format_response = mocker.patch.object(facts_service, "_format_response")
@@ -835,20 +1925,21 @@ class TestFactsService:
         result = facts_service.put_facts(26, mock_put_facts)
         mock_put.assert_called_once_with(
             "https://facts.prod.ecorithm.com/api/v1/building/26/facts",
-            data=[
-                {
-                    "native_name": "native_name-1",
-                    "fact_value": 1,
-                    "fact_time": "2017-12-20 00:00",
-                },
-                {
-                    "native_name": "native_name-2",
-                    "fact_value": 2,
-                    "fact_time": "2017-12-21 00:00",
-                },
-            ],
+            data=mocker.ANY,
             encode_type="json",
         )
+        assert json.loads(mock_put.call_args[1]["data"]) == [
+            {
+                "native_name": "native_name-1",
+                "fact_value": 1,
+                "fact_time": "2017-12-20 00:00",
+            },
+            {
+                "native_name": "native_name-2",
+                "fact_value": 2,
+                "fact_time": "2017-12-21 00:00",
+            },
+        ]
         assert result == mock_response
         mock__get_parser.assert_called()
         mock_parse_result.assert_called()
@@ -858,9 +1949,8 @@ class TestFactsService:
         is_active = True
         result_format = "pandas"
         expected_url = "https://facts.prod.ecorithm.com/api/v1/buildings"
-        mock_get = mocker.patch.object(
-            facts_service, "get", return_value="mock-response"
-        )
+        mock_response = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(facts_service, "get", return_value=mock_response)
         params = {"building_id": building_id, "is_active": is_active}
         mock__get_parser = mocker.patch.object(
             facts_service,
@@ -871,10 +1961,10 @@ class TestFactsService:
             facts_service, "_format_response", return_value=("formated-result")
         )
         result = facts_service.get_buildings(building_id, is_active, result_format)
-        mock_get.assert_called_once_with(expected_url, data=params)
+        mock_get.assert_called_once_with(expected_url, data=params, revalidate=True)
         mock__get_parser.assert_called_once_with("pandas", data_key="data")
         mock__format_response.assert_called_once_with(
-            "mock-response", parser="mock-parser", parser_args={"arg": 1}
+            mock_response, parser="mock-parser", parser_args={"arg": 1}
         )
         assert result == "formated-result"
 
@@ -928,9 +2018,8 @@ class TestFactsService:
         is_active = True
         result_format = "pandas"
         expected_url = "https://facts.prod.ecorithm.com/api/v1/point-classes"
-        mock_get = mocker.patch.object(
-            facts_service, "get", return_value="mock-response"
-        )
+        mock_response = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(facts_service, "get", return_value=mock_response)
         params = {"point_class": point_class, "is_active": is_active}
         mock__get_parser = mocker.patch.object(
             facts_service,
@@ -941,10 +2030,10 @@ class TestFactsService:
             facts_service, "_format_response", return_value=("formated-result")
         )
         result = facts_service.get_point_classes(point_class, is_active, result_format)
-        mock_get.assert_called_once_with(expected_url, data=params)
+        mock_get.assert_called_once_with(expected_url, data=params, revalidate=True)
         mock__get_parser.assert_called_once_with("pandas", data_key="data")
         mock__format_response.assert_called_once_with(
-            "mock-response", parser="mock-parser", parser_args={"arg": 1}
+            mock_response, parser="mock-parser", parser_args={"arg": 1}
         )
         assert result == "formated-result"
 
@@ -1006,9 +2095,8 @@ class TestFactsService:
         is_active = True
         result_format = "pandas"
         expected_url = "https://facts.prod.ecorithm.com/api/v1/building/1/point-mapping"
-        mock_get = mocker.patch.object(
-            facts_service, "get", return_value="mock-response"
-        )
+        mock_response = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(facts_service, "get", return_value=mock_response)
         data = {
             "is_active": is_active,
             "eco_point_id": "1,2,3",
@@ -1043,10 +2131,10 @@ class TestFactsService:
             is_active=is_active,
             result_format=result_format,
         )
-        mock_get.assert_called_once_with(expected_url, data=data)
+        mock_get.assert_called_once_with(expected_url, data=data, revalidate=True)
         mock__get_parser.assert_called_once_with("pandas", data_key="data")
         mock__format_response.assert_called_once_with(
-            "mock-response", parser="mock-parser", parser_args={"arg": 1}
+            mock_response, parser="mock-parser", parser_args={"arg": 1}
         )
         assert result == "formated-result"
 
@@ -1078,6 +2166,16 @@ class TestFactsService:
         )
         assert result == "formated-result"
 
+    def test_put_metadata_without_data(self, mocker, facts_service):
+        mock_put = mocker.patch.object(facts_service, "put")
+        mocker.patch.object(facts_service, "_format_response")
+
+        facts_service.put_point_mapping(26)
+        facts_service.put_equipment(26)
+        facts_service.put_native_names(26)
+        for call in mock_put.call_args_list:
+            assert call[1]["data"] == []
+
     def test_put_point_mapping(self, mocker, facts_service):
         mock_data = [
             [
@@ -1157,9 +2255,8 @@ class TestFactsService:
         is_active = True
         result_format = "pandas"
         expected_url = "https://facts.prod.ecorithm.com/api/v1/equipment-types"
-        mock_get = mocker.patch.object(
-            facts_service, "get", return_value="mock-response"
-        )
+        mock_response = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(facts_service, "get", return_value=mock_response)
         params = {"equipment_type": equipment_type, "is_active": is_active}
         mock__get_parser = mocker.patch.object(
             facts_service,
@@ -1172,10 +2269,10 @@ class TestFactsService:
         result = facts_service.get_equipment_types(
             equipment_type, is_active, result_format
         )
-        mock_get.assert_called_once_with(expected_url, data=params)
+        mock_get.assert_called_once_with(expected_url, data=params, revalidate=True)
         mock__get_parser.assert_called_once_with("pandas", data_key="data")
         mock__format_response.assert_called_once_with(
-            "mock-response", parser="mock-parser", parser_args={"arg": 1}
+            mock_response, parser="mock-parser", parser_args={"arg": 1}
         )
         assert result == "formated-result"
 
@@ -1236,9 +2333,8 @@ class TestFactsService:
         is_active = True
         result_format = "pandas"
         expected_url = "https://facts.prod.ecorithm.com/api/v1/building/1/equipment"
-        mock_get = mocker.patch.object(
-            facts_service, "get", return_value="mock-response"
-        )
+        mock_response = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(facts_service, "get", return_value=mock_response)
         params = {
             "equipment_name": equipment_name,
             "equipment_type": equipment_type,
@@ -1259,10 +2355,10 @@ class TestFactsService:
             is_active=is_active,
             result_format=result_format,
         )
-        mock_get.assert_called_once_with(expected_url, data=params)
+        mock_get.assert_called_once_with(expected_url, data=params, revalidate=False)
         mock__get_parser.assert_called_once_with("pandas", data_key="data")
         mock__format_response.assert_called_once_with(
-            "mock-response", parser="mock-parser", parser_args={"arg": 1}
+            mock_response, parser="mock-parser", parser_args={"arg": 1}
         )
         assert result == "formated-result"
 
@@ -1327,9 +2423,8 @@ class TestFactsService:
         is_active = True
         result_format = "pandas"
         expected_url = "https://facts.prod.ecorithm.com/api/v1/building/1/native-names"
-        mock_get = mocker.patch.object(
-            facts_service, "get", return_value="mock-response"
-        )
+        mock_response = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(facts_service, "get", return_value=mock_response)
         params = {"native_name": native_name, "is_active": is_active}
         mock__get_parser = mocker.patch.object(
             facts_service,
@@ -1342,13 +2437,177 @@ class TestFactsService:
         result = facts_service.get_native_names(
             building_id, native_name, is_active, result_format
         )
-        mock_get.assert_called_once_with(expected_url, data=params)
+        mock_get.assert_called_once_with(expected_url, data=params, revalidate=False)
         mock__get_parser.assert_called_once_with("pandas", data_key="data")
         mock__format_response.assert_called_once_with(
-            "mock-response", parser="mock-parser", parser_args={"arg": 1}
+            mock_response, parser="mock-parser", parser_args={"arg": 1}
         )
         assert result == "formated-result"
 
+    def test__init__retry(self):
+        facts_service = FactsService()
+        assert facts_service.retry.is_retryable("POST")
+        retry = RetryPolicy(retries=0)
+        assert FactsService(retry=retry).retry is retry
+
+    def test__init__rate_limits(self, mocker, tmp_path):
+        mocker.patch.dict(
+            FactsService.rate_limits, {"qa": {"rate": 5, "max_concurrency": 2}}
+        )
+        path = str(tmp_path / "eco_connect-qa")
+        facts_service = FactsService(
+            environment_name="qa",
+            rate_limits={"qa": {"rate": 10, "path": path}, "prod": {"rate": 1}},
+        )
+        assert facts_service.rate_limiter.rate == 10
+        assert facts_service.rate_limiter.max_concurrency == 2
+        assert facts_service.rate_limiter.path == path
+        assert not FactsService().rate_limiter.enabled
+
+    def test__init__metadata_ttl(self):
+        facts_service = FactsService(metadata_ttl={"buildings": 0})
+        assert facts_service.metadata_ttl["buildings"] == 0
+        assert facts_service.metadata_ttl["point_mapping"] == 300
+        assert FactsService.metadata_ttl["buildings"] == 3600
+
+    def test_get_metadata_cached(self, mocker, facts_service):
+        mock_response = mocker.Mock(status_code=200)
+        mock_get = mocker.patch.object(facts_service, "get", return_value=mock_response)
+        mock__format_response = mocker.patch.object(facts_service, "_format_response")
+
+        facts_service.get_equipment(1, result_format="json")
+        facts_service.get_equipment(1, result_format="pandas")
+        assert mock_get.call_count == 1
+        assert mock__format_response.call_count == 2
+
+        facts_service.get_equipment(1, equipment_type="AHU")
+        facts_service.get_equipment(2)
+        assert mock_get.call_count == 3
+
+    def test_get_metadata_error_not_cached(self, mocker, facts_service):
+        mock_get = mocker.patch.object(
+            facts_service, "get", return_value=mocker.Mock(status_code=500)
+        )
+        mocker.patch.object(facts_service, "_format_response")
+
+        facts_service.get_buildings()
+        facts_service.get_buildings()
+        assert mock_get.call_count == 2
+
+    def test_get_metadata_cache_disabled(self, mocker):
+        facts_service = FactsService(metadata_cache_size=0)
+        mock_get = mocker.patch.object(
+            facts_service, "get", return_value=mocker.Mock(status_code=200)
+        )
+        mocker.patch.object(facts_service, "_format_response")
+
+        facts_service.get_point_classes()
+        facts_service.get_point_classes()
+        assert mock_get.call_count == 2
+
+    def test_get_metadata_single_flight(self, mocker):
+        facts_service = FactsService(metadata_cache_size=0)
+        started = threading.Event()
+        release = threading.Event()
+        mock_response = mocker.Mock(status_code=200)
+
+        def get(url, data, revalidate):
+            started.set()
+            release.wait(5)
+            return mock_response
+
+        mock_get = mocker.patch.object(facts_service, "get", side_effect=get)
+        mock__format_response = mocker.patch.object(
+            facts_service,
+            "_format_response",
+            side_effect=lambda response, **_: response,
+        )
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(facts_service.get_point_mapping, 26)
+            started.wait(5)
+            followers = [
+                executor.submit(facts_service.get_point_mapping, 26) for _ in range(2)
+            ]
+            # Give the followers time to join the call in flight.
+            time.sleep(0.2)
+            release.set()
+            results = [leader.result(5)] + [future.result(5) for future in followers]
+
+        assert mock_get.call_count == 1
+        assert mock__format_response.call_count == 3
+        assert results == [mock_response] * 3
+
+    def test_get_metadata_revalidated(self, mocker, facts_server):
+        facts_service = FactsService(metadata_ttl={"buildings": 0})
+        facts_service.hostname = facts_server.hostname
+        facts_service.credentials = ("user", "password")
+        buildings = {"data": [{"building_id": 26, "building_name": "HQ"}]}
+        facts_server.set_payload("buildings", buildings)
+        pandas_parser = mocker.spy(RequestParser, "pandas_parser")
+
+        first = facts_service.get_buildings()
+        first["building_name"] = "changed"
+        second = facts_service.get_buildings()
+        assert second.to_dict("records") == buildings["data"]
+        assert facts_service.get_buildings(result_format="json") == buildings
+        assert [status for _, _, status in facts_server.requests] == [200, 304, 304]
+        assert facts_server.requests[1][1]["If-None-Match"]
+        assert facts_server.requests[1][1]["If-Modified-Since"]
+        # The 304s reuse the DataFrame parsed from the first response.
+        assert pandas_parser.call_count == 1
+
+        buildings["data"].append({"building_id": 27, "building_name": "Lab"})
+        facts_server.set_payload("buildings", buildings, last_modified=60)
+        assert len(facts_service.get_buildings()) == 2
+        assert facts_server.requests[-1][2] == 200
+        assert pandas_parser.call_count == 2
+
+    def test_get_metadata_not_revalidated(self, mocker, facts_server):
+        facts_service = FactsService(metadata_ttl={"equipment": 0})
+        facts_service.hostname = facts_server.hostname
+        facts_service.credentials = ("user", "password")
+        facts_server.set_payload("building/26/equipment", {"data": []})
+
+        facts_service.get_equipment(26, result_format="json")
+        facts_service.get_equipment(26, result_format="json")
+        assert [status for _, _, status in facts_server.requests] == [200, 200]
+        assert "If-None-Match" not in facts_server.requests[1][1]
+
+    def test_put_equipment_invalidates_metadata_cache(self, mocker, facts_service):
+        mock_get = mocker.patch.object(
+            facts_service, "get", return_value=mocker.Mock(status_code=200)
+        )
+        mocker.patch.object(facts_service, "put")
+        mocker.patch.object(facts_service, "_format_response")
+
+        for building_id in (1, 2):
+            facts_service.get_equipment(building_id)
+            facts_service.get_point_mapping(building_id)
+        facts_service.get_equipment_types()
+        assert mock_get.call_count == 5
+
+        facts_service.put_equipment(1, pd.DataFrame(columns=["a", "b"]))
+        facts_service.get_equipment(1)
+        facts_service.get_point_mapping(1)
+        assert mock_get.call_count == 7
+        facts_service.get_equipment(2)
+        facts_service.get_point_mapping(2)
+        facts_service.get_equipment_types()
+        assert mock_get.call_count == 7
+
+    def test_put_equipment_type_invalidates_metadata_cache(self, mocker, facts_service):
+        mock_get = mocker.patch.object(
+            facts_service, "get", return_value=mocker.Mock(status_code=200)
+        )
+        mocker.patch.object(facts_service, "put")
+        mocker.patch.object(facts_service, "_format_response")
+
+        facts_service.get_equipment_types()
+        facts_service.put_equipment_type("AHU")
+        facts_service.get_equipment_types()
+        assert mock_get.call_count == 2
+
     def test_put_native_names(self, mocker, facts_service):
         mock_data = [
             ["VAV_01", True, "Client", 3, "COV", "5 minutes"],
@@ -1551,7 +2810,9 @@ class TestFactsService:
 
     def test_get_building_dqi_json(self, mocker, facts_service):
         mock_response = mocker.Mock()
-        mock_json_parser = mocker.patch(self.MODULE_PATH + ".RequestParser.json_parser")
+        mock_json_parser = mocker.patch(
+            "eco_connect.src.request_parser.RequestParser.json_parser"
+        )
         mock_get = mocker.patch.object(facts_service, "get")
         mock_get.return_value = mock_response
         mock_format_response = mocker.patch.object(facts_service, "_format_response")
@@ -1,4 +1,8 @@
+import subprocess
+import sys
 from importlib.machinery import SourceFileLoader
+
+import pytest
 import requests
 
 
@@ -13,3 +17,24 @@ def mock_get(*args, **kwargs):
 def test_validate_credentials(monkeypatch):
     monkeypatch.setattr(requests, "get", mock_get)
     SourceFileLoader("__main__", "eco_connect/__init__.py").load_module()
+
+
+def test_import_is_lazy():
+    # Heavy dependencies are only imported once they are used.
+    script = (
+        "import sys, eco_connect; "
+        "print(sorted({'pandas', 'numpy', 'requests', 'asyncio'} & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_async_facts_service_lazy_attribute():
+    import eco_connect
+    from eco_connect.async_facts_service import AsyncFactsService
+
+    assert eco_connect.AsyncFactsService is AsyncFactsService
+    with pytest.raises(AttributeError):
+        eco_connect.missing